@@ -0,0 +1,65 @@
+"""
+Ambiente do Alembic: aplica as migrações no banco de DATABASE_URL.
+
+Quem chama pode passar uma conexão pronta em `config.attributes["connection"]`
+(usado pelos testes) em vez de abrir uma a partir da URL.
+"""
+from logging.config import fileConfig
+
+from alembic import context
+
+from app.db.base import Base, build_engine
+from app.db.migrations import database_url
+from app.db import models  # noqa: F401  (registra os modelos no metadata)
+
+config = context.config
+
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+target_metadata = Base.metadata
+
+
+def run_migrations_offline() -> None:
+    """Gera o SQL das migrações sem conectar (alembic upgrade head --sql)"""
+    context.configure(
+        url=database_url(config),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_with(connection) -> None:
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        # SQLite não suporta a maioria dos ALTER TABLE: recria a tabela
+        render_as_batch=connection.dialect.name == "sqlite",
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        run_migrations_with(connection)
+        return
+
+    engine = build_engine(database_url(config))
+    try:
+        with engine.connect() as connection:
+            run_migrations_with(connection)
+    finally:
+        engine.dispose()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,53 @@
+"""initial schema
+
+Tabelas users, owners e assets exatamente como o create_all das versões
+anteriores às migrações as criava. Bancos já existentes são marcados nesta
+revisão (`alembic stamp 0001`) e seguem pelas demais.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "users",
+        sa.Column("id", sa.String(length=36), nullable=False),
+        sa.Column("username", sa.String(length=140), nullable=False),
+        sa.Column("hashed_password", sa.String(length=255), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("username"),
+    )
+    op.create_table(
+        "owners",
+        sa.Column("id", sa.String(length=36), nullable=False),
+        sa.Column("name", sa.String(length=140), nullable=False),
+        sa.Column("email", sa.String(length=140), nullable=False),
+        sa.Column("phone", sa.String(length=20), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("email"),
+    )
+    op.create_table(
+        "assets",
+        sa.Column("id", sa.String(length=36), nullable=False),
+        sa.Column("name", sa.String(length=140), nullable=False),
+        sa.Column("category", sa.String(length=60), nullable=False),
+        sa.Column("owner", sa.String(length=36), nullable=False),
+        sa.ForeignKeyConstraint(["owner"], ["owners.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("assets")
+    op.drop_table("owners")
+    op.drop_table("users")
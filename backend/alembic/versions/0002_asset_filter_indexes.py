@@ -0,0 +1,37 @@
+"""asset filter indexes
+
+Índices da listagem de ativos filtrada e paginada por keyset: (owner, id) e
+(category, id) para os filtros por responsável e categoria, e name para a
+busca por prefixo. No PostgreSQL são criados com CREATE INDEX CONCURRENTLY,
+sem bloquear escritas na tabela durante o deploy.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+INDEXES = (
+    ("ix_assets_owner_id", ["owner", "id"]),
+    ("ix_assets_category_id", ["category", "id"]),
+    ("ix_assets_name", ["name"]),
+)
+
+
+def upgrade() -> None:
+    # CONCURRENTLY não pode rodar dentro de uma transação
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES:
+            op.create_index(name, "assets", columns, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _ in INDEXES:
+            op.drop_index(name, table_name="assets", postgresql_concurrently=True)
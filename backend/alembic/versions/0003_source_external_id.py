@@ -0,0 +1,48 @@
+"""source and external_id
+
+Colunas source/external_id em owners e assets e as chaves únicas
+(source, external_id) usadas pelo upsert em lote. As colunas aceitam NULL,
+então as linhas existentes não são alteradas. No SQLite as chaves são
+criadas recriando a tabela (batch), que não suporta ADD CONSTRAINT; as
+chaves estrangeiras ficam desligadas durante a cópia, senão o DROP TABLE de
+owners apagaria os ativos em cascata.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def _sqlite_foreign_keys(enabled: bool) -> None:
+    # O PRAGMA não tem efeito dentro de uma transação
+    if op.get_bind().dialect.name == "sqlite":
+        with op.get_context().autocommit_block():
+            op.execute(f"PRAGMA foreign_keys={'ON' if enabled else 'OFF'}")
+
+
+def upgrade() -> None:
+    _sqlite_foreign_keys(False)
+    for table in ("owners", "assets"):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.add_column(sa.Column("source", sa.String(length=60), nullable=True))
+            batch_op.add_column(sa.Column("external_id", sa.String(length=140), nullable=True))
+            batch_op.create_unique_constraint(f"uq_{table}_source_external_id", ["source", "external_id"])
+    _sqlite_foreign_keys(True)
+
+
+def downgrade() -> None:
+    _sqlite_foreign_keys(False)
+    for table in ("assets", "owners"):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_constraint(f"uq_{table}_source_external_id", type_="unique")
+            batch_op.drop_column("external_id")
+            batch_op.drop_column("source")
+    _sqlite_foreign_keys(True)
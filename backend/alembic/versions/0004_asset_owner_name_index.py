@@ -0,0 +1,37 @@
+"""asset owner name index
+
+Índice composto (owner, name) para listar/buscar os ativos de um responsável
+por nome. No PostgreSQL o índice é criado com CREATE INDEX CONCURRENTLY, sem
+bloquear escritas na tabela durante o deploy.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY não pode rodar dentro de uma transação
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_assets_owner_name",
+            "assets",
+            ["owner", "name"],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_assets_owner_name",
+            table_name="assets",
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,40 @@
+"""row and table versions
+
+Coluna `version` em owners e assets (ETag de cada registro) e a tabela
+table_versions, com o contador de alterações de cada tabela (ETag das
+listagens). As linhas existentes começam na versão 1; os contadores são
+criados na primeira escrita.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # ADD COLUMN com DEFAULT constante: sem reescrever a tabela (PostgreSQL 11+
+    # e SQLite)
+    op.add_column("owners", sa.Column("version", sa.Integer(), nullable=False, server_default="1"))
+    op.add_column("assets", sa.Column("version", sa.Integer(), nullable=False, server_default="1"))
+    op.create_table(
+        "table_versions",
+        sa.Column("name", sa.String(length=60), nullable=False),
+        sa.Column("version", sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint("name"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("table_versions")
+    with op.batch_alter_table("assets") as batch_op:
+        batch_op.drop_column("version")
+    with op.batch_alter_table("owners") as batch_op:
+        batch_op.drop_column("version")
@@ -0,0 +1,50 @@
+"""change log
+
+Tabela change_log (sincronização incremental por `GET /changes?since=`).
+Os registros existentes entram como criações - responsáveis antes dos
+ativos, cada grupo em ordem de id - e o contador `change_log` de
+table_versions passa a apontar para o último `seq`.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "change_log",
+        sa.Column("seq", sa.BigInteger(), autoincrement=False, nullable=False),
+        sa.Column("entity", sa.String(length=10), nullable=False),
+        sa.Column("entity_id", sa.String(length=36), nullable=False),
+        sa.Column("operation", sa.String(length=10), nullable=False),
+        sa.Column("changed_at", sa.DateTime(), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=False),
+        sa.PrimaryKeyConstraint("seq"),
+    )
+
+    op.execute(
+        "INSERT INTO change_log (seq, entity, entity_id, operation) "
+        "SELECT ROW_NUMBER() OVER (ORDER BY id), 'owner', id, 'create' FROM owners"
+    )
+    op.execute(
+        "INSERT INTO change_log (seq, entity, entity_id, operation) "
+        "SELECT (SELECT COUNT(*) FROM owners) + ROW_NUMBER() OVER (ORDER BY id), 'asset', id, 'create' "
+        "FROM assets"
+    )
+    op.execute(
+        "INSERT INTO table_versions (name, version) "
+        "SELECT 'change_log', COALESCE(MAX(seq), 0) FROM change_log"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DELETE FROM table_versions WHERE name = 'change_log'")
+    op.drop_table("change_log")
@@ -1,19 +1,27 @@
 """
 API v1 routes
+
+As rotas que acessam o banco usam a Session síncrona do SQLAlchemy e por isso
+são declaradas com `def` (e não `async def`): o FastAPI as executa no
+threadpool, sem bloquear o event loop enquanto a query roda.
 """
 from fastapi import APIRouter
 from .assets import router as assets_router
 from .owners import router as owners_router
 from .auth import router as auth_router
 from .users import router as users_router
+from .admin import router as admin_router
+from .changes import router as changes_router
 
 api_router = APIRouter(prefix="/integrations")
 
-# Incluir rotas de autenticação, users, assets e owners
+# Incluir rotas de autenticação, users, assets, owners, changes e admin
 api_router.include_router(auth_router)
 api_router.include_router(users_router)
 api_router.include_router(assets_router)
 api_router.include_router(owners_router)
+api_router.include_router(changes_router)
+api_router.include_router(admin_router)
 
 __all__ = ["api_router"]
 
@@ -0,0 +1,43 @@
+"""
+Rotas administrativas (diagnóstico da aplicação)
+"""
+from typing import List
+
+from fastapi import APIRouter, Depends, Query, status
+
+from app.schemas.admin import SlowQueryResponse
+from app.db.slow_queries import slow_query_log
+from app.core.config import settings
+from app.core.security import get_current_user
+from app.core.timing import TimedRoute
+
+router = APIRouter(prefix="/admin", tags=["Admin"], route_class=TimedRoute)
+
+
+@router.get(
+    "/slow-queries",
+    response_model=List[SlowQueryResponse],
+    summary="Listar queries lentas",
+    description="Consultas que passaram de SLOW_QUERY_MS neste processo, da mais lenta para a mais rápida."
+)
+def list_slow_queries(
+    limit: int = Query(20, ge=1, le=settings.SLOW_QUERY_CAPACITY, description="Número de consultas"),
+    current_user: dict = Depends(get_current_user)
+) -> List[SlowQueryResponse]:
+    """
+    Lista as consultas mais lentas, agregadas por SQL normalizado, com o
+    formato dos parâmetros, a rota que as disparou e o plano de execução.
+    
+    O registro é mantido em memória por processo (cada worker tem o seu).
+    """
+    return [SlowQueryResponse.model_validate(query) for query in slow_query_log.top(limit)]
+
+
+@router.delete(
+    "/slow-queries",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Limpar o log de queries lentas"
+)
+def clear_slow_queries(current_user: dict = Depends(get_current_user)) -> None:
+    """Descarta as consultas registradas (ex.: depois de criar um índice)"""
+    slow_query_log.clear()
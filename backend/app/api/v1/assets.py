@@ -1,13 +1,36 @@
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, status, Depends, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
+from functools import partial
+from typing import List, Optional
 
-from app.schemas.asset import AssetCreate, AssetUpdate, AssetResponse
+from app.schemas.asset import AssetCreate, AssetBulkCreate, AssetUpsert, AssetUpdate, AssetResponse, AssetBatchGetResponse
+from app.schemas.bulk import BatchGetRequest, BulkResult, ImportResult, UpsertResult
 from app.services.asset_service import AssetService
 from app.db.sessions import get_db
+from app.core.conditional import (
+    CACHE_ENTITY,
+    CACHE_LIST,
+    CACHE_NO_STORE,
+    etag_matches,
+    make_etag,
+    not_modified,
+    set_validators,
+)
+from app.core.config import settings
+from app.core.pagination import decode_cursor, paginate
+from app.core.streams import (
+    EXPORT_MEDIA_TYPES,
+    IMPORT_REQUEST_BODY,
+    NDJSON_REQUEST_BODY,
+    encode_rows,
+    stream_import,
+    stream_upsert,
+)
 from app.core.security import get_current_user
+from app.core.timing import TimedRoute, span
 
-router = APIRouter(tags=["Assets"])
+router = APIRouter(tags=["Assets"], route_class=TimedRoute)
 
 
 @router.post(
@@ -17,7 +40,7 @@ router = APIRouter(tags=["Assets"])
     summary="Criar um novo ativo",
     description="Cria um novo ativo no banco de dados. O ID é gerado automaticamente."
 )
-async def create_asset(
+def create_asset(
     asset: AssetCreate,
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
@@ -50,29 +73,203 @@ async def create_asset(
         )
 
 
+@router.post(
+    "/assets/bulk",
+    response_model=BulkResult,
+    summary="Criar ativos em lote",
+    description="Cria até BULK_MAX_ITEMS ativos em uma única transação, com resultado por linha."
+)
+def create_assets_bulk(
+    payload: AssetBulkCreate,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+) -> BulkResult:
+    """
+    Cria vários ativos de uma vez.
+    
+    Os responsáveis referenciados são validados com uma única consulta e todas as
+    linhas válidas são inseridas na mesma transação. Linhas cujo responsável não
+    existe são rejeitadas individualmente; o campo `results` traz, para cada
+    posição do payload, o ID criado ou o erro.
+    """
+    return AssetService.create_assets_bulk(db, payload.items)
+
+
+@router.post(
+    "/assets/upsert",
+    response_model=UpsertResult,
+    summary="Sincronizar ativos por external_id",
+    description="Insere ou atualiza ativos a partir de um corpo NDJSON em streaming, identificados por (source, external_id).",
+    openapi_extra=NDJSON_REQUEST_BODY
+)
+async def upsert_assets(
+    request: Request,
+    source: str = Query(..., min_length=1, max_length=60, description="Sistema de origem dos external_id"),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+) -> UpsertResult:
+    """
+    Sincronização idempotente com um sistema externo.
+    
+    O corpo é lido em streaming (`application/x-ndjson`, um objeto por linha) e
+    aplicado em blocos de STREAM_CHUNK_SIZE linhas, cada bloco com um único
+    `INSERT ... ON CONFLICT DO UPDATE`. Registros sem alteração não são
+    regravados, então reenviar a mesma carga não escreve nada.
+    
+    Cada linha tem `external_id`, `name`, `category` e o responsável, informado
+    por `owner` (ID) ou por `owner_external_id` (external_id na mesma origem).
+    
+    Linhas inválidas são rejeitadas individualmente e listadas em `errors`.
+    """
+    try:
+        return await stream_upsert(request, AssetUpsert, partial(AssetService.upsert_assets, db, source))
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
+@router.post(
+    "/assets/import",
+    response_model=ImportResult,
+    summary="Importar ativos de NDJSON ou CSV",
+    description="Importa ativos de um corpo NDJSON ou CSV (opcionalmente gzip) lido em streaming, com commit a cada bloco.",
+    openapi_extra=IMPORT_REQUEST_BODY
+)
+async def import_assets(
+    request: Request,
+    chunk_size: int = Query(
+        settings.STREAM_CHUNK_SIZE, ge=1, le=settings.BULK_MAX_ITEMS, description="Linhas por transação"
+    ),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+) -> ImportResult:
+    """
+    Importa uma planilha ou arquivo de ativos.
+    
+    O formato é escolhido pelo `Content-Type`: `text/csv` (com cabeçalho contendo
+    `name`, `category` e `owner`) ou `application/x-ndjson`. Com `Content-Encoding: gzip`
+    o corpo é descomprimido em streaming.
+    
+    Cada bloco de `chunk_size` linhas é validado e gravado em sua própria transação,
+    de modo que a memória não cresce com o tamanho do arquivo. Blocos já gravados
+    permanecem em caso de falha posterior. Linhas rejeitadas são listadas em `errors`
+    com o número da linha do arquivo.
+    """
+    try:
+        return await stream_import(request, AssetCreate, partial(AssetService.create_assets_bulk, db), chunk_size)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
+@router.get(
+    "/assets/export",
+    response_class=StreamingResponse,
+    summary="Exportar todos os ativos",
+    description="Exporta todos os ativos em NDJSON ou CSV, em streaming."
+)
+def export_assets(
+    fmt: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$", description="ndjson ou csv"),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+) -> StreamingResponse:
+    """
+    Exporta o inventário completo de ativos.
+    
+    As linhas são lidas do banco em blocos por um cursor no servidor e enviadas
+    conforme são serializadas, com memória constante independentemente do tamanho
+    da tabela. A exportação é uma única consulta em uma transação de leitura, ou
+    seja, um snapshot consistente.
+    
+    - **format**: `ndjson` (padrão, um objeto por linha) ou `csv` (com cabeçalho)
+    """
+    rows = AssetService.iter_assets_for_export(db, batch_size=settings.STREAM_CHUNK_SIZE)
+    return StreamingResponse(
+        encode_rows(rows, AssetService.EXPORT_COLUMNS, fmt, settings.STREAM_CHUNK_SIZE),
+        media_type=EXPORT_MEDIA_TYPES[fmt],
+        headers={
+            "Content-Disposition": f'attachment; filename="assets.{fmt}"',
+            "Cache-Control": CACHE_NO_STORE,
+        }
+    )
+
+
+@router.post(
+    "/assets/batch-get",
+    response_model=AssetBatchGetResponse,
+    response_model_exclude_unset=True,
+    summary="Buscar ativos por IDs",
+    description="Busca até BATCH_GET_MAX_IDS ativos por ID em uma única requisição."
+)
+def batch_get_assets(
+    payload: BatchGetRequest,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+) -> AssetBatchGetResponse:
+    """
+    Busca vários ativos de uma vez, com uma consulta IN (...) por bloco de IDs
+    em vez de uma requisição por ID.
+    
+    - **items**: registros encontrados, na ordem dos IDs enviados (sem repetições)
+    - **found** / **missing**: IDs encontrados e não encontrados
+    
+    Com **exists_only** apenas a existência é verificada e **items** é omitido.
+    """
+    ids = list(dict.fromkeys(payload.ids))
+    if payload.exists_only:
+        existing = AssetService.get_existing_ids(db, ids)
+        return AssetBatchGetResponse(
+            found=[i for i in ids if i in existing],
+            missing=[i for i in ids if i not in existing]
+        )
+
+    by_id = {row.id: row for row in AssetService.get_assets_by_ids(db, ids)}
+    with span("serialize"):
+        return AssetBatchGetResponse(
+            items=[AssetResponse.model_validate(by_id[i]) for i in ids if i in by_id],
+            found=[i for i in ids if i in by_id],
+            missing=[i for i in ids if i not in by_id]
+        )
+
+
 @router.get(
     "/asset/{asset_id}",
     response_model=AssetResponse,
     summary="Buscar ativo por ID",
     description="Retorna os dados de um ativo específico pelo ID."
 )
-async def get_asset(
+def get_asset(
     asset_id: str,
+    request: Request,
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
-) -> AssetResponse:
+) -> Response:
     """
     Busca um ativo pelo ID.
     
-    Retorna 404 se o ativo não for encontrado.
+    O JSON vem do cache de entidades quando disponível (sem consulta nem
+    serialização). Com `If-None-Match` igual à ETag atual (versão do
+    registro), responde 304 sem corpo. Retorna 404 se o ativo não for
+    encontrado.
     """
-    db_asset = AssetService.get_asset(db, asset_id)
-    if not db_asset:
+    if request.headers.get("if-none-match"):
+        version = AssetService.get_asset_version(db, asset_id)
+        if version is not None and etag_matches(request, make_etag(version)):
+            return not_modified(make_etag(version), CACHE_ENTITY)
+
+    cached = AssetService.get_asset_json(db, asset_id)
+    if cached is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Asset com ID {asset_id} não encontrado"
         )
-    return AssetResponse.model_validate(db_asset)
+    response = Response(content=cached.body, media_type="application/json")
+    set_validators(response, make_etag(cached.version), CACHE_ENTITY)
+    return response
 
 
 @router.get(
@@ -81,20 +278,51 @@ async def get_asset(
     summary="Listar todos os ativos",
     description="Retorna uma lista de todos os ativos cadastrados."
 )
-async def list_assets(
-    skip: int = 0,
-    limit: int = 100,
+def list_assets(
+    request: Request,
+    response: Response,
+    after: Optional[str] = Query(None, description="Cursor da próxima página (header X-Next-Cursor)"),
+    skip: int = Query(0, ge=0, description="Registros a pular (prefira `after`)"),
+    limit: int = Query(settings.DEFAULT_PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE),
+    owner: Optional[str] = Query(None, description="Filtra pelo ID do responsável"),
+    category: Optional[str] = Query(None, max_length=60, description="Filtra pela categoria (exata)"),
+    name: Optional[str] = Query(None, max_length=140, description="Filtra pelo prefixo do nome"),
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ) -> List[AssetResponse]:
     """
-    Lista todos os ativos com paginação.
+    Lista os ativos ordenados por ID, com paginação por cursor e filtros.
     
-    - **skip**: Número de registros a pular (padrão: 0)
-    - **limit**: Número máximo de registros a retornar (padrão: 100)
+    - **owner**: Apenas ativos do responsável informado
+    - **category**: Apenas ativos da categoria informada
+    - **name**: Apenas ativos cujo nome começa com o valor informado
+    - **after**: Cursor opaco da próxima página, retornado nos headers
+      `X-Next-Cursor` e `Link` (rel="next") quando há mais registros
+    - **skip**: Número de registros a pular (padrão: 0, ignorado com `after`)
+    - **limit**: Número máximo de registros a retornar (padrão: 100, máximo: 500)
+    
+    A ETag é o contador de alterações da tabela: com `If-None-Match` igual a
+    ela, responde 304 sem executar a listagem.
     """
-    assets = AssetService.get_assets(db, skip=skip, limit=limit)
-    return [AssetResponse.model_validate(asset) for asset in assets]
+    # Lido antes da listagem: uma escrita entre as duas consultas deixa a ETag
+    # mais antiga que os dados, nunca o contrário
+    etag = make_etag("assets", AssetService.get_list_version(db))
+    if etag_matches(request, etag):
+        return not_modified(etag, CACHE_LIST)
+    set_validators(response, etag, CACHE_LIST)
+
+    assets = AssetService.get_assets(
+        db,
+        skip=skip,
+        limit=limit + 1,
+        after=decode_cursor(after),
+        owner=owner,
+        category=category,
+        name=name
+    )
+    assets = paginate(request, response, assets, limit)
+    with span("serialize"):
+        return [AssetResponse.model_validate(asset) for asset in assets]
 
 
 @router.put(
@@ -103,7 +331,7 @@ async def list_assets(
     summary="Atualizar ativo",
     description="Atualiza os dados de um ativo existente."
 )
-async def update_asset(
+def update_asset(
     asset_id: str,
     asset: AssetUpdate,
     db: Session = Depends(get_db),
@@ -146,7 +374,7 @@ async def update_asset(
     summary="Deletar ativo",
     description="Remove um ativo do banco de dados."
 )
-async def delete_asset(
+def delete_asset(
     asset_id: str,
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
@@ -2,18 +2,20 @@
 Rotas de autenticação
 """
 from datetime import timedelta
-from fastapi import APIRouter, HTTPException, status, Form, Depends
+from fastapi import APIRouter, HTTPException, status, Form, Depends, Response
 from sqlalchemy.orm import Session
 
 from app.schemas.auth import TokenResponse
 from app.schemas.user import UserCreate, UserResponse
+from app.core.conditional import CACHE_NO_STORE
 from app.core.config import settings
 from app.core.security import create_access_token
+from app.core.timing import TimedRoute
 from app.services.user_service import UserService
 from app.db.sessions import get_db
 
 
-router = APIRouter(tags=["Authentication"])
+router = APIRouter(tags=["Authentication"], route_class=TimedRoute)
 
 
 @router.post(
@@ -54,6 +56,7 @@ def register(
     description="Autentica um usuário e retorna um token JWT."
 )
 def login(
+    response: Response,
     username: str = Form(..., description="Nome de usuário"),
     password: str = Form(..., description="Senha do usuário"),
     db: Session = Depends(get_db)
@@ -76,6 +79,9 @@ def login(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    # O token nunca deve ficar em caches (RFC 6749, seção 5.1)
+    response.headers["Cache-Control"] = CACHE_NO_STORE
+    
     # Criar token JWT
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
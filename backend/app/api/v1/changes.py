@@ -0,0 +1,99 @@
+"""
+Sincronização incremental: alterações de ativos e responsáveis desde um `seq`,
+em lotes (`GET /changes`) ou em tempo real (`GET /changes/stream`)
+"""
+import time
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from app.schemas.change import ChangeBatch
+from app.services.change_log_service import ChangeLogService
+from app.db.sessions import get_db
+from app.core.change_feed import change_feed
+from app.core.conditional import CACHE_NO_STORE
+from app.core.config import settings
+from app.core.security import get_current_user, get_stream_user
+from app.core.timing import TimedRoute
+
+router = APIRouter(tags=["Changes"], route_class=TimedRoute)
+
+
+@router.get(
+    "/changes",
+    response_model=ChangeBatch,
+    response_model_exclude_none=True,
+    summary="Listar alterações desde um seq",
+    description="Criações, alterações e remoções de ativos e responsáveis, em ordem de commit."
+)
+def list_changes(
+    since: int = Query(0, ge=0, description="Último seq já aplicado (0: desde o início)"),
+    limit: int = Query(
+        settings.CHANGES_PAGE_SIZE,
+        ge=1,
+        le=settings.CHANGES_MAX_PAGE_SIZE,
+        description="Entradas do change_log lidas por lote"
+    ),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+) -> ChangeBatch:
+    """
+    Retorna as alterações posteriores a **since**, uma entrada por registro
+    (a mais recente do lote), com o estado atual em **data**:
+
+    - **operation**: create, update ou delete; remoções (inclusive dos ativos
+      removidos junto com o responsável) vêm sem **data**
+    - **next_since**: valor de **since** para o próximo lote
+    - **has_more**: há mais alterações; repetir com **next_since** até false
+
+    O custo é proporcional ao número de alterações, não ao tamanho das tabelas.
+    """
+    return ChangeLogService.get_changes(db, since, limit)
+
+
+@router.get(
+    "/changes/stream",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"text/event-stream": {}}, "description": "Eventos SSE"}},
+    summary="Acompanhar alterações em tempo real",
+    description="Server-Sent Events com as criações, alterações e remoções de ativos e responsáveis."
+)
+async def stream_changes(
+    since: Optional[int] = Query(None, ge=0, description="Último seq já aplicado (padrão: só as novas)"),
+    entity: Optional[str] = Query(None, pattern="^(asset|owner)$", description="Só ativos ou só responsáveis"),
+    last_event_id: Optional[str] = Header(None, description="Enviado pelo EventSource ao reconectar"),
+    current_user: dict = Depends(get_stream_user)
+) -> StreamingResponse:
+    """
+    Mantém a conexão aberta e envia cada alteração como um evento SSE:
+
+    - **id**: seq da alteração (o EventSource o reenvia em `Last-Event-ID` ao
+      reconectar, e a transmissão continua de onde parou)
+    - **event**: `asset` ou `owner`
+    - **data**: a mesma entrada de `GET /changes` (estado atual em **data**;
+      remoções sem ele)
+
+    O token pode ser enviado no header Authorization ou em **access_token**.
+    A conexão é encerrada depois de CHANGE_FEED_MAX_AGE segundos ou quando o
+    token expira; o cliente reconecta com Last-Event-ID sem perder eventos.
+    """
+    if last_event_id is not None:
+        if not last_event_id.isdigit():
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Last-Event-ID inválido")
+        since = int(last_event_id)
+
+    max_age = settings.CHANGE_FEED_MAX_AGE
+    if current_user.get("exp"):
+        max_age = min(max_age, current_user["exp"] - time.time())
+
+    return StreamingResponse(
+        change_feed.stream(since, entity, time.monotonic() + max_age),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": CACHE_NO_STORE,
+            # Proxies (nginx) não devem bufferizar os eventos
+            "X-Accel-Buffering": "no",
+        }
+    )
@@ -1,13 +1,38 @@
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, status, Depends, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
+from functools import partial
+from typing import List, Optional
 
-from app.schemas.owner import OwnerCreate, OwnerUpdate, OwnerResponse
+from app.schemas.owner import OwnerCreate, OwnerBulkCreate, OwnerUpsert, OwnerUpdate, OwnerResponse, OwnerBatchGetResponse
+from app.schemas.asset import AssetResponse
+from app.schemas.bulk import BatchGetRequest, BulkResult, ImportResult, UpsertResult
+from app.services.asset_service import AssetService
 from app.services.owner_service import OwnerService
 from app.db.sessions import get_db
+from app.core.conditional import (
+    CACHE_ENTITY,
+    CACHE_LIST,
+    CACHE_NO_STORE,
+    etag_matches,
+    make_etag,
+    not_modified,
+    set_validators,
+)
+from app.core.config import settings
+from app.core.pagination import decode_cursor, paginate
+from app.core.streams import (
+    EXPORT_MEDIA_TYPES,
+    IMPORT_REQUEST_BODY,
+    NDJSON_REQUEST_BODY,
+    encode_rows,
+    stream_import,
+    stream_upsert,
+)
 from app.core.security import get_current_user
+from app.core.timing import TimedRoute, span
 
-router = APIRouter(tags=["Owners"])
+router = APIRouter(tags=["Owners"], route_class=TimedRoute)
 
 
 @router.post(
@@ -17,7 +42,7 @@ router = APIRouter(tags=["Owners"])
     summary="Criar um novo responsável",
     description="Cria um novo responsável no banco de dados. O ID é gerado automaticamente."
 )
-async def create_owner(
+def create_owner(
     owner: OwnerCreate,
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
@@ -41,29 +66,249 @@ async def create_owner(
         )
 
 
+@router.post(
+    "/owners/bulk",
+    response_model=BulkResult,
+    summary="Criar responsáveis em lote",
+    description="Cria até BULK_MAX_ITEMS responsáveis em uma única transação, com resultado por linha."
+)
+def create_owners_bulk(
+    payload: OwnerBulkCreate,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+) -> BulkResult:
+    """
+    Cria vários responsáveis de uma vez (ex.: importação do diretório da empresa).
+    
+    Os emails são verificados contra os já cadastrados em uma única consulta e
+    contra as demais linhas do próprio payload. Linhas em conflito são rejeitadas
+    individualmente; o campo `results` traz, para cada posição, o ID criado ou o erro.
+    """
+    try:
+        return OwnerService.create_owners_bulk(db, payload.items)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
+@router.post(
+    "/owners/upsert",
+    response_model=UpsertResult,
+    summary="Sincronizar responsáveis por external_id",
+    description="Insere ou atualiza responsáveis a partir de um corpo NDJSON em streaming, identificados por (source, external_id).",
+    openapi_extra=NDJSON_REQUEST_BODY
+)
+async def upsert_owners(
+    request: Request,
+    source: str = Query(..., min_length=1, max_length=60, description="Sistema de origem dos external_id"),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+) -> UpsertResult:
+    """
+    Sincronização idempotente com um sistema externo.
+    
+    O corpo é lido em streaming (`application/x-ndjson`, um objeto por linha com
+    `external_id`, `name`, `email` e `phone`) e aplicado em blocos de
+    STREAM_CHUNK_SIZE linhas, cada bloco com um único
+    `INSERT ... ON CONFLICT DO UPDATE`. Registros sem alteração não são
+    regravados, então reenviar a mesma carga não escreve nada.
+    
+    Linhas inválidas são rejeitadas individualmente e listadas em `errors`.
+    """
+    try:
+        return await stream_upsert(request, OwnerUpsert, partial(OwnerService.upsert_owners, db, source))
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
+@router.post(
+    "/owners/import",
+    response_model=ImportResult,
+    summary="Importar responsáveis de NDJSON ou CSV",
+    description="Importa responsáveis de um corpo NDJSON ou CSV (opcionalmente gzip) lido em streaming, com commit a cada bloco.",
+    openapi_extra=IMPORT_REQUEST_BODY
+)
+async def import_owners(
+    request: Request,
+    chunk_size: int = Query(
+        settings.STREAM_CHUNK_SIZE, ge=1, le=settings.BULK_MAX_ITEMS, description="Linhas por transação"
+    ),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+) -> ImportResult:
+    """
+    Importa uma planilha ou arquivo de responsáveis.
+    
+    O formato é escolhido pelo `Content-Type`: `text/csv` (com cabeçalho contendo
+    `name`, `email` e `phone`) ou `application/x-ndjson`. Com `Content-Encoding: gzip`
+    o corpo é descomprimido em streaming.
+    
+    Cada bloco de `chunk_size` linhas é validado e gravado em sua própria transação,
+    de modo que a memória não cresce com o tamanho do arquivo. Blocos já gravados
+    permanecem em caso de falha posterior. Linhas rejeitadas são listadas em `errors`
+    com o número da linha do arquivo.
+    """
+    try:
+        return await stream_import(request, OwnerCreate, partial(OwnerService.create_owners_bulk, db), chunk_size)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
+@router.get(
+    "/owners/export",
+    response_class=StreamingResponse,
+    summary="Exportar todos os responsáveis",
+    description="Exporta todos os responsáveis em NDJSON ou CSV, em streaming."
+)
+def export_owners(
+    fmt: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$", description="ndjson ou csv"),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+) -> StreamingResponse:
+    """
+    Exporta o inventário completo de responsáveis.
+    
+    As linhas são lidas do banco em blocos por um cursor no servidor e enviadas
+    conforme são serializadas, com memória constante independentemente do tamanho
+    da tabela. A exportação é uma única consulta em uma transação de leitura, ou
+    seja, um snapshot consistente.
+    
+    - **format**: `ndjson` (padrão, um objeto por linha) ou `csv` (com cabeçalho)
+    """
+    rows = OwnerService.iter_owners_for_export(db, batch_size=settings.STREAM_CHUNK_SIZE)
+    return StreamingResponse(
+        encode_rows(rows, OwnerService.EXPORT_COLUMNS, fmt, settings.STREAM_CHUNK_SIZE),
+        media_type=EXPORT_MEDIA_TYPES[fmt],
+        headers={
+            "Content-Disposition": f'attachment; filename="owners.{fmt}"',
+            "Cache-Control": CACHE_NO_STORE,
+        }
+    )
+
+
+@router.post(
+    "/owners/batch-get",
+    response_model=OwnerBatchGetResponse,
+    response_model_exclude_unset=True,
+    summary="Buscar responsáveis por IDs",
+    description="Busca até BATCH_GET_MAX_IDS responsáveis por ID em uma única requisição."
+)
+def batch_get_owners(
+    payload: BatchGetRequest,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+) -> OwnerBatchGetResponse:
+    """
+    Busca vários responsáveis de uma vez, com uma consulta IN (...) por bloco de IDs
+    em vez de uma requisição por ID.
+    
+    - **items**: registros encontrados, na ordem dos IDs enviados (sem repetições)
+    - **found** / **missing**: IDs encontrados e não encontrados
+    
+    Com **exists_only** apenas a existência é verificada e **items** é omitido.
+    """
+    ids = list(dict.fromkeys(payload.ids))
+    if payload.exists_only:
+        existing = OwnerService.get_existing_ids(db, ids)
+        return OwnerBatchGetResponse(
+            found=[i for i in ids if i in existing],
+            missing=[i for i in ids if i not in existing]
+        )
+
+    by_id = {row.id: row for row in OwnerService.get_owners_by_ids(db, ids)}
+    with span("serialize"):
+        return OwnerBatchGetResponse(
+            items=[OwnerResponse.model_validate(by_id[i]) for i in ids if i in by_id],
+            found=[i for i in ids if i in by_id],
+            missing=[i for i in ids if i not in by_id]
+        )
+
+
 @router.get(
     "/owner/{owner_id}",
     response_model=OwnerResponse,
     summary="Buscar responsável por ID",
     description="Retorna os dados de um responsável específico pelo ID."
 )
-async def get_owner(
+def get_owner(
     owner_id: str,
+    request: Request,
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
-) -> OwnerResponse:
+) -> Response:
     """
     Busca um responsável pelo ID.
     
+    O JSON vem do cache de entidades quando disponível (sem consulta nem
+    serialização). Com `If-None-Match` igual à ETag atual (versão do
+    registro), responde 304 sem corpo. Retorna 404 se o responsável não for
+    encontrado.
+    """
+    if request.headers.get("if-none-match"):
+        version = OwnerService.get_owner_version(db, owner_id)
+        if version is not None and etag_matches(request, make_etag(version)):
+            return not_modified(make_etag(version), CACHE_ENTITY)
+
+    cached = OwnerService.get_owner_json(db, owner_id)
+    if cached is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Owner com ID {owner_id} não encontrado"
+        )
+    response = Response(content=cached.body, media_type="application/json")
+    set_validators(response, make_etag(cached.version), CACHE_ENTITY)
+    return response
+
+
+@router.get(
+    "/owner/{owner_id}/assets",
+    response_model=List[AssetResponse],
+    summary="Listar ativos de um responsável",
+    description="Retorna os ativos de um responsável específico, com paginação por cursor."
+)
+def list_owner_assets(
+    owner_id: str,
+    request: Request,
+    response: Response,
+    after: Optional[str] = Query(None, description="Cursor da próxima página (header X-Next-Cursor)"),
+    limit: int = Query(settings.DEFAULT_PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE),
+    include_count: bool = Query(False, description="Retorna o total no header X-Total-Count"),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+) -> List[AssetResponse]:
+    """
+    Lista os ativos de um responsável ordenados por ID.
+    
+    A consulta percorre apenas o índice `(owner, id)`, então o custo é
+    proporcional aos ativos do responsável, não ao total de ativos.
+    
+    - **after**: Cursor opaco da próxima página (headers `X-Next-Cursor` e `Link`)
+    - **limit**: Número máximo de registros a retornar (padrão: 100, máximo: 500)
+    - **include_count**: Quando `true`, o total de ativos do responsável é
+      retornado no header `X-Total-Count`
+    
     Retorna 404 se o responsável não for encontrado.
     """
-    db_owner = OwnerService.get_owner(db, owner_id)
-    if not db_owner:
+    if not OwnerService.get_owner(db, owner_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Owner com ID {owner_id} não encontrado"
         )
-    return OwnerResponse.model_validate(db_owner)
+    
+    assets = AssetService.get_assets(db, limit=limit + 1, after=decode_cursor(after), owner=owner_id)
+    assets = paginate(request, response, assets, limit)
+    if include_count:
+        response.headers["X-Total-Count"] = str(AssetService.count_assets(db, owner=owner_id))
+    with span("serialize"):
+        return [AssetResponse.model_validate(asset) for asset in assets]
 
 
 @router.get(
@@ -72,20 +317,37 @@ async def get_owner(
     summary="Listar todos os responsáveis",
     description="Retorna uma lista de todos os responsáveis cadastrados."
 )
-async def list_owners(
-    skip: int = 0,
-    limit: int = 100,
+def list_owners(
+    request: Request,
+    response: Response,
+    after: Optional[str] = Query(None, description="Cursor da próxima página (header X-Next-Cursor)"),
+    skip: int = Query(0, ge=0, description="Registros a pular (prefira `after`)"),
+    limit: int = Query(settings.DEFAULT_PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE),
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ) -> List[OwnerResponse]:
     """
-    Lista todos os responsáveis com paginação.
+    Lista os responsáveis ordenados por ID, com paginação por cursor.
     
-    - **skip**: Número de registros a pular (padrão: 0)
-    - **limit**: Número máximo de registros a retornar (padrão: 100)
+    - **after**: Cursor opaco da próxima página, retornado nos headers
+      `X-Next-Cursor` e `Link` (rel="next") quando há mais registros
+    - **skip**: Número de registros a pular (padrão: 0, ignorado com `after`)
+    - **limit**: Número máximo de registros a retornar (padrão: 100, máximo: 500)
+    
+    A ETag é o contador de alterações da tabela: com `If-None-Match` igual a
+    ela, responde 304 sem executar a listagem.
     """
-    owners = OwnerService.get_owners(db, skip=skip, limit=limit)
-    return [OwnerResponse.model_validate(owner) for owner in owners]
+    # Lido antes da listagem: uma escrita entre as duas consultas deixa a ETag
+    # mais antiga que os dados, nunca o contrário
+    etag = make_etag("owners", OwnerService.get_list_version(db))
+    if etag_matches(request, etag):
+        return not_modified(etag, CACHE_LIST)
+    set_validators(response, etag, CACHE_LIST)
+
+    owners = OwnerService.get_owners(db, skip=skip, limit=limit + 1, after=decode_cursor(after))
+    owners = paginate(request, response, owners, limit)
+    with span("serialize"):
+        return [OwnerResponse.model_validate(owner) for owner in owners]
 
 
 @router.put(
@@ -94,7 +356,7 @@ async def list_owners(
     summary="Atualizar responsável",
     description="Atualiza os dados de um responsável existente."
 )
-async def update_owner(
+def update_owner(
     owner_id: str,
     owner: OwnerUpdate,
     db: Session = Depends(get_db),
@@ -127,7 +389,7 @@ async def update_owner(
     summary="Deletar responsável",
     description="Remove um responsável e todos os seus ativos relacionados do banco de dados (cascade delete)."
 )
-async def delete_owner(
+def delete_owner(
     owner_id: str,
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
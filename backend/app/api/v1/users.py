@@ -8,8 +8,9 @@ from app.schemas.user import UserUpdate, UserResponse
 from app.services.user_service import UserService
 from app.db.sessions import get_db
 from app.core.security import get_current_user
+from app.core.timing import TimedRoute
 
-router = APIRouter(tags=["Users"])
+router = APIRouter(tags=["Users"], route_class=TimedRoute)
 
 
 @router.put(
@@ -18,7 +19,7 @@ router = APIRouter(tags=["Users"])
     summary="Atualizar próprio usuário",
     description="Atualiza os dados do usuário autenticado."
 )
-async def update_own_user(
+def update_own_user(
     user: UserUpdate,
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
@@ -53,7 +54,7 @@ async def update_own_user(
     summary="Deletar próprio usuário",
     description="Remove a conta do usuário autenticado do banco de dados."
 )
-async def delete_own_user(
+def delete_own_user(
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
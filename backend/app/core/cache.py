@@ -0,0 +1,414 @@
+"""
+Cache das respostas de `GET /asset/{id}` e `GET /owner/{id}`.
+
+Guarda o JSON já serializado de cada entidade, junto da versão da linha
+(ETag), sem nova consulta nem validação do Pydantic a cada leitura, válido
+por `ENTITY_CACHE_TTL` segundos. IDs inexistentes também são guardados
+(cache negativo), por `ENTITY_CACHE_NEGATIVE_TTL` segundos.
+
+Onde as entradas ficam depende de `ENTITY_CACHE_BACKEND`:
+
+- `memory`: LRU em processo, limitado a `ENTITY_CACHE_SIZE` entradas; cada
+  worker tem o seu
+- `redis`: um único cache no Redis de `REDIS_URL`, compartilhado por todos os
+  workers e hosts
+
+Os serviços invalidam as chaves depois de cada commit que altera a entidade.
+Com `REDIS_URL` definido, a invalidação também é publicada em um canal
+pub/sub, e os outros workers descartam as cópias locais ao recebê-la.
+
+Uma leitura que começou antes de uma invalidação não grava o resultado, que
+pode ser anterior ao commit. No LRU, o worker compara o seu contador de
+invalidações (locais e recebidas) antes e depois da leitura. No Redis, que
+outros workers invalidam diretamente, a leitura reserva a chave antes de ir ao
+banco e só grava se a reserva ainda estiver lá (WATCH/MULTI): a invalidação a
+apaga.
+"""
+import json
+import logging
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Callable, List, NamedTuple, Optional, Tuple
+
+from app.core.config import settings
+from app.core.metrics import CACHE_ERRORS, CACHE_EVICTIONS, CACHE_INVALIDATIONS, CACHE_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBackend(ABC):
+    """
+    Armazenamento das entradas do cache. Um valor None é um "não existe"
+    guardado, com a validade negativa. Um backend sem algum dos métodos
+    abstratos falha já ao ser instanciado.
+    """
+
+    # Entradas visíveis para todos os workers (dispensa a invalidação local
+    # ao receber mensagens de outro worker)
+    shared = False
+
+    @abstractmethod
+    def get(self, key: str) -> Tuple[bool, Optional[bytes]]:
+        """(encontrado, valor)"""
+
+    def lease(self, key: str) -> Optional[bytes]:
+        """
+        Reserva `key` para a leitura que vai carregar o valor. `set` com a
+        reserva só grava se nenhum `delete` aconteceu desde então. None: a
+        chave já está reservada por outra leitura, e o valor não é gravado.
+        """
+        return b""
+
+    @abstractmethod
+    def set(self, key: str, value: Optional[bytes], lease: Optional[bytes] = None) -> None:
+        """Grava `value`; com `lease`, só se a reserva ainda for válida"""
+
+    @abstractmethod
+    def delete(self, *keys: str) -> None:
+        """Remove as chaves (e as reservas sobre elas)"""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove todas as entradas"""
+
+
+class LRUCache(CacheBackend):
+    """LRU com validade por entrada, seguro entre as threads do threadpool"""
+
+    def __init__(self, capacity: int, ttl: float, negative_ttl: float):
+        self.capacity = capacity
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._entries: "OrderedDict[str, Tuple[float, Optional[bytes]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Tuple[bool, Optional[bytes]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return False, None
+            self._entries.move_to_end(key)
+            return True, value
+
+    def set(self, key: str, value: Optional[bytes], lease: Optional[bytes] = None) -> None:
+        # Sem reserva: as invalidações do worker são conferidas pelo EntityCache
+        ttl = self.ttl if value is not None else self.negative_ttl
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.capacity:
+                evicted, _ = self._entries.popitem(last=False)
+                CACHE_EVICTIONS.labels(evicted.partition(":")[0]).inc()
+
+    def delete(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RedisCache(CacheBackend):
+    """
+    Entradas no Redis (ou qualquer servidor do mesmo protocolo), com a
+    validade aplicada pelo próprio servidor (SET ... PX).
+
+    Falhas de conexão não derrubam a requisição: a leitura vira um miss (vai ao
+    banco) e a falha é contada em `cache_errors_total`.
+    """
+
+    shared = True
+
+    # Marcador de "não existe" (nenhum JSON de entidade é vazio)
+    MISSING = b""
+    # Prefixo das reservas (uma entrada codificada começa pela versão)
+    LEASE = b"lease:"
+
+    def __init__(self, client, ttl: float, negative_ttl: float, prefix: str, lease_ttl: float = 5.0):
+        from redis import RedisError, WatchError
+
+        self.client = client
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.prefix = prefix
+        self.lease_ttl = lease_ttl
+        self._errors = RedisError
+        self._conflict = WatchError
+
+    def get(self, key: str) -> Tuple[bool, Optional[bytes]]:
+        try:
+            value = self.client.get(self.prefix + key)
+        except self._errors:
+            self._failed("get")
+            return False, None
+        if value is None or value.startswith(self.LEASE):
+            return False, None
+        return True, value if value != self.MISSING else None
+
+    def lease(self, key: str) -> Optional[bytes]:
+        token = self.LEASE + uuid.uuid4().hex.encode()
+        try:
+            if self.client.set(self.prefix + key, token, px=int(self.lease_ttl * 1000), nx=True):
+                return token
+        except self._errors:
+            self._failed("lease")
+        return None
+
+    def set(self, key: str, value: Optional[bytes], lease: Optional[bytes] = None) -> None:
+        ttl = self.ttl if value is not None else self.negative_ttl
+        name, value = self.prefix + key, value if value is not None else self.MISSING
+        try:
+            if lease is None:
+                self.client.set(name, value, px=int(ttl * 1000))
+                return
+            with self.client.pipeline() as pipe:
+                # Grava só se a reserva continua na chave (sem invalidação no meio)
+                pipe.watch(name)
+                if pipe.get(name) != lease:
+                    return
+                pipe.multi()
+                pipe.set(name, value, px=int(ttl * 1000))
+                pipe.execute()
+        except self._conflict:
+            # A chave mudou entre o GET e o EXEC: a invalidação prevalece
+            pass
+        except self._errors:
+            self._failed("set")
+
+    def delete(self, *keys: str) -> None:
+        if not keys:
+            return
+        try:
+            self.client.delete(*(self.prefix + key for key in keys))
+        except self._errors:
+            # A entrada antiga continua válida até o fim do TTL
+            self._failed("delete")
+
+    def clear(self) -> None:
+        try:
+            batch = []
+            for key in self.client.scan_iter(match=self.prefix + "*", count=1000):
+                batch.append(key)
+                if len(batch) == 1000:
+                    self.client.delete(*batch)
+                    batch = []
+            if batch:
+                self.client.delete(*batch)
+        except self._errors:
+            self._failed("clear")
+
+    @staticmethod
+    def _failed(operation: str) -> None:
+        CACHE_ERRORS.labels(operation).inc()
+        logger.warning("Falha no cache Redis (%s)", operation, exc_info=True)
+
+
+class RedisInvalidationBus:
+    """
+    Distribui as invalidações entre os workers por pub/sub. Cada worker escuta
+    o canal em uma thread; se a conexão cair, as mensagens perdidas não são
+    recuperáveis, então o cache local é esvaziado ao reconectar.
+    """
+
+    def __init__(self, client, channel: str):
+        from redis import RedisError
+
+        self.client = client
+        self.channel = channel
+        self._errors = RedisError
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def publish(self, origin: str, keys: List[str]) -> None:
+        try:
+            self.client.publish(self.channel, json.dumps({"origin": origin, "keys": keys}))
+        except self._errors:
+            CACHE_ERRORS.labels("publish").inc()
+            logger.warning("Falha ao publicar invalidação do cache", exc_info=True)
+
+    def start(self, on_message: Callable[[str, List[str]], None], on_reset: Callable[[], None]) -> None:
+        """Começa a escutar o canal em uma thread daemon"""
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._listen, args=(on_message, on_reset), name="cache-invalidation", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _listen(self, on_message, on_reset) -> None:
+        reconnecting = False
+        while not self._stopped.is_set():
+            pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+            try:
+                pubsub.subscribe(self.channel)
+                if reconnecting:
+                    on_reset()
+                    reconnecting = False
+                while not self._stopped.is_set():
+                    message = pubsub.get_message(timeout=0.5)
+                    if message is not None:
+                        data = json.loads(message["data"])
+                        on_message(data["origin"], data["keys"])
+            except self._errors:
+                CACHE_ERRORS.labels("subscribe").inc()
+                logger.warning("Conexão do canal de invalidação perdida; reconectando", exc_info=True)
+                reconnecting = True
+                self._stopped.wait(1.0)
+            finally:
+                pubsub.close()
+
+
+class CachedEntity(NamedTuple):
+    """Entidade serializada: versão da linha e JSON da resposta"""
+    version: int
+    body: bytes
+
+    def encode(self) -> bytes:
+        # O JSON compacto do Pydantic nunca contém uma quebra de linha literal
+        return b"%d\n%s" % (self.version, self.body)
+
+    @classmethod
+    def decode(cls, value: bytes) -> "CachedEntity":
+        version, _, body = value.partition(b"\n")
+        return cls(int(version), body)
+
+
+class EntityCache:
+    """Cache read-through de entidades serializadas, por tipo e ID"""
+
+    def __init__(self, store: CacheBackend, bus: Optional[RedisInvalidationBus] = None):
+        self.store = store
+        self.bus = bus
+        # Identifica as mensagens deste processo no canal de invalidação
+        self.origin = uuid.uuid4().hex
+        # Incrementado a cada invalidação; ver get_or_load
+        self._invalidations = 0
+
+    @staticmethod
+    def key(entity: str, entity_id: str) -> str:
+        return f"{entity}:{entity_id}"
+
+    def get_or_load(
+        self, entity: str, entity_id: str, loader: Callable[[], Optional[CachedEntity]]
+    ) -> Optional[CachedEntity]:
+        """
+        Entidade serializada, do cache ou de `loader` (que retorna None se ela
+        não existir). Com o cache desligado (`ENTITY_CACHE_ENABLED`), só
+        `loader`.
+        """
+        if not settings.ENTITY_CACHE_ENABLED:
+            return loader()
+
+        key = self.key(entity, entity_id)
+        found, value = self.store.get(key)
+        if found:
+            if value is None:
+                CACHE_REQUESTS.labels(entity, "negative_hit").inc()
+                return None
+            CACHE_REQUESTS.labels(entity, "hit").inc()
+            return CachedEntity.decode(value)
+
+        CACHE_REQUESTS.labels(entity, "miss").inc()
+        invalidations = self._invalidations
+        lease = self.store.lease(key)
+        loaded = loader()
+        if lease is not None and invalidations == self._invalidations:
+            self.store.set(key, loaded.encode() if loaded is not None else None, lease)
+        return loaded
+
+    def peek(self, entity: str, entity_id: str) -> Tuple[bool, Optional[CachedEntity]]:
+        """(encontrado, entidade) sem carregar em caso de miss"""
+        if not settings.ENTITY_CACHE_ENABLED:
+            return False, None
+        found, value = self.store.get(self.key(entity, entity_id))
+        return found, CachedEntity.decode(value) if value is not None else None
+
+    def invalidate(self, entity: str, *entity_ids: str) -> None:
+        """Descarta as entradas em todos os workers (chamar depois do commit)"""
+        if not entity_ids:
+            return
+        keys = [self.key(entity, entity_id) for entity_id in entity_ids]
+        self._invalidations += 1
+        self.store.delete(*keys)
+        if self.bus is not None:
+            self.bus.publish(self.origin, keys)
+        CACHE_INVALIDATIONS.labels(entity).inc(len(keys))
+
+    def clear(self) -> None:
+        self._invalidations += 1
+        self.store.clear()
+
+    def start(self) -> None:
+        """Passa a receber as invalidações dos outros workers (startup)"""
+        if self.bus is not None:
+            self.bus.start(self._on_invalidation, self._on_reset)
+
+    def stop(self) -> None:
+        if self.bus is not None:
+            self.bus.stop()
+
+    def _on_invalidation(self, origin: str, keys: List[str]) -> None:
+        if origin == self.origin:
+            return
+        self._invalidations += 1
+        if not self.store.shared:
+            self.store.delete(*keys)
+
+    def _on_reset(self) -> None:
+        self._invalidations += 1
+        if not self.store.shared:
+            self.store.clear()
+
+
+def build_entity_cache() -> EntityCache:
+    """Cria o cache conforme ENTITY_CACHE_BACKEND e REDIS_URL"""
+    backend = settings.ENTITY_CACHE_BACKEND
+    if backend not in ("memory", "redis"):
+        raise ValueError(f"ENTITY_CACHE_BACKEND inválido: {backend!r} (use memory ou redis)")
+    if backend == "redis" and not settings.REDIS_URL:
+        raise ValueError("ENTITY_CACHE_BACKEND=redis exige REDIS_URL")
+
+    client = None
+    if settings.REDIS_URL:
+        import redis
+
+        client = redis.Redis.from_url(settings.REDIS_URL, socket_timeout=settings.REDIS_SOCKET_TIMEOUT)
+
+    if backend == "redis":
+        store = RedisCache(
+            client,
+            ttl=settings.ENTITY_CACHE_TTL,
+            negative_ttl=settings.ENTITY_CACHE_NEGATIVE_TTL,
+            prefix=settings.ENTITY_CACHE_PREFIX,
+        )
+    else:
+        store = LRUCache(
+            capacity=settings.ENTITY_CACHE_SIZE,
+            ttl=settings.ENTITY_CACHE_TTL,
+            negative_ttl=settings.ENTITY_CACHE_NEGATIVE_TTL,
+        )
+
+    bus = None
+    if client is not None:
+        bus = RedisInvalidationBus(client, settings.ENTITY_CACHE_PREFIX + "invalidate")
+    return EntityCache(store, bus)
+
+
+entity_cache = build_entity_cache()
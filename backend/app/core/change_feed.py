@@ -0,0 +1,255 @@
+"""
+Feed de alterações em tempo real (`GET /changes/stream`, Server-Sent Events).
+
+Uma única tarefa por worker acompanha o change_log (`seq` maior que a última
+posição lida) e entrega cada alteração, serializada uma vez, às conexões
+abertas. Os serviços chamam `change_feed.notify()` depois do commit, o que
+antecipa a leitura; as escritas de outros workers e processos são lidas a
+cada `CHANGE_FEED_POLL_INTERVAL` segundos. O custo no banco não depende do
+número de conexões, e uma conexão ociosa é só uma fila e uma corrotina
+esperando no event loop (sem thread nem conexão com o banco).
+
+Cada conexão tem uma fila limitada (`CHANGE_FEED_QUEUE_SIZE`). Um cliente
+lento que a enche não atrasa os outros nem acumula memória: a fila é
+descartada e a conexão volta a ler do change_log a partir do último evento
+enviado, como faria ao reconectar com Last-Event-ID.
+"""
+import asyncio
+import logging
+import time
+from typing import AsyncIterator, List, NamedTuple, Optional, Set, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.metrics import CHANGE_FEED_CONNECTION_DURATION, CHANGE_FEED_CONNECTIONS, CHANGE_FEED_LAGGED
+from app.db.base import SessionLocal
+from app.db.change_log import CHANGE_LOG_COUNTER
+from app.db.versions import get_table_version
+from app.schemas.change import ChangeEntry
+
+logger = logging.getLogger(__name__)
+
+# Marcadores na fila de uma conexão
+_LAGGED = object()  # a fila encheu: reler do change_log
+_CLOSED = object()  # encerramento do worker
+
+
+class FeedEvent(NamedTuple):
+    """Alteração já no formato do protocolo SSE"""
+    seq: int
+    entity: str
+    frame: bytes
+
+
+def encode_event(entry: ChangeEntry) -> FeedEvent:
+    """Evento SSE `id: <seq>`, `event: <entidade>`, `data: <ChangeEntry>`"""
+    data = entry.model_dump_json(exclude_none=True).encode()
+    return FeedEvent(entry.seq, entry.entity, b"id: %d\nevent: %s\ndata: %s\n\n" % (
+        entry.seq, entry.entity.encode(), data
+    ))
+
+
+class Subscriber:
+    """Fila de eventos de uma conexão"""
+
+    def __init__(self, entity: Optional[str], maxsize: int):
+        self.entity = entity
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self.lagged = False
+        self.closed = False
+
+    def offer(self, event: FeedEvent) -> None:
+        if self.lagged or (self.entity is not None and event.entity != self.entity):
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Descarta os pendentes: a conexão relê do change_log
+            CHANGE_FEED_LAGGED.inc()
+            self.lagged = True
+            self._replace(_LAGGED)
+
+    def resume(self) -> None:
+        """Volta a receber eventos (antes de reler do change_log)"""
+        if self.closed:
+            return
+        self.lagged = False
+        self._replace()
+
+    def close(self) -> None:
+        self.closed = self.lagged = True
+        self._replace(_CLOSED)
+
+    def _replace(self, *items) -> None:
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        for item in items:
+            self.queue.put_nowait(item)
+
+
+class ChangeFeed:
+    """Distribui as alterações do change_log para as conexões SSE do worker"""
+
+    def __init__(self, session_factory=SessionLocal):
+        self.session_factory = session_factory
+        self._subscribers: Set[Subscriber] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        # Última posição do change_log entregue às filas (None: sem conexões)
+        self._position: Optional[int] = None
+
+    @property
+    def connections(self) -> int:
+        return len(self._subscribers)
+
+    def start(self) -> None:
+        """Inicia a leitura do change_log no event loop atual (startup)"""
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._active = asyncio.Event()
+        self._ready = asyncio.Event()
+        self._position = None
+        self._task = self._loop.create_task(self._run(), name="change-feed")
+
+    async def stop(self) -> None:
+        """Encerra as conexões abertas e a leitura (shutdown)"""
+        for subscriber in list(self._subscribers):
+            subscriber.close()
+        if self._task is not None:
+            # Libera as conexões que ainda esperam a posição inicial
+            self._ready.set()
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._loop = None
+
+    def notify(self) -> None:
+        """
+        Antecipa a leitura do change_log. Chamar depois do commit; pode ser
+        chamado de qualquer thread e não faz nada fora de um worker.
+        """
+        loop = self._loop
+        if loop is None:
+            return
+        try:
+            loop.call_soon_threadsafe(self._wake.set)
+        except RuntimeError:
+            # Event loop já encerrado
+            pass
+
+    async def stream(self, since: Optional[int], entity: Optional[str], deadline: float) -> AsyncIterator[bytes]:
+        """
+        Eventos SSE com `seq` maior que `since` (None: só os novos) até o
+        instante `deadline` (time.monotonic), com um comentário de keep-alive
+        a cada CHANGE_FEED_HEARTBEAT segundos sem eventos.
+        """
+        if self._task is None:
+            raise RuntimeError("ChangeFeed.start() não foi chamado")
+
+        subscriber = Subscriber(entity, settings.CHANGE_FEED_QUEUE_SIZE)
+        self._subscribers.add(subscriber)
+        self._active.set()
+        CHANGE_FEED_CONNECTIONS.inc()
+        opened_at = time.monotonic()
+        try:
+            yield b"retry: %d\n\n" % settings.CHANGE_FEED_RETRY_MS
+            # A partir daqui, tudo depois da posição da tarefa chega na fila;
+            # o que vier antes é relido do change_log
+            await self._ready.wait()
+            if subscriber.closed:
+                return
+            if since is None:
+                since = await run_in_threadpool(self._read_position)
+            replay = True
+
+            while True:
+                if replay:
+                    subscriber.resume()
+                    has_more = True
+                    while has_more:
+                        events, since, has_more = await run_in_threadpool(self._read_changes, since)
+                        for event in events:
+                            if entity is None or event.entity == entity:
+                                yield event.frame
+                    replay = False
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return
+                try:
+                    event = await asyncio.wait_for(
+                        subscriber.queue.get(), min(settings.CHANGE_FEED_HEARTBEAT, remaining)
+                    )
+                except asyncio.TimeoutError:
+                    yield b": ping\n\n"
+                    continue
+
+                if event is _CLOSED:
+                    return
+                if event is _LAGGED:
+                    replay = True
+                elif event.seq > since:
+                    yield event.frame
+                    since = event.seq
+        finally:
+            self._subscribers.discard(subscriber)
+            CHANGE_FEED_CONNECTIONS.dec()
+            CHANGE_FEED_CONNECTION_DURATION.observe(time.monotonic() - opened_at)
+
+    async def _run(self) -> None:
+        while True:
+            if not self._subscribers:
+                # Sem conexões, o change_log não é lido
+                self._position = None
+                self._ready.clear()
+                self._active.clear()
+                await self._active.wait()
+
+            try:
+                if self._position is None:
+                    self._position = await run_in_threadpool(self._read_position)
+                    self._ready.set()
+                else:
+                    self._wake.clear()
+                    await self._publish()
+            except Exception:
+                logger.exception("Falha ao ler o change_log para o feed de alterações")
+
+            try:
+                await asyncio.wait_for(self._wake.wait(), settings.CHANGE_FEED_POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _publish(self) -> None:
+        """Entrega às filas tudo o que foi gravado depois da posição atual"""
+        has_more = True
+        while has_more and self._subscribers:
+            events, self._position, has_more = await run_in_threadpool(self._read_changes, self._position)
+            for event in events:
+                for subscriber in list(self._subscribers):
+                    subscriber.offer(event)
+
+    def _read_position(self) -> int:
+        db = self.session_factory()
+        try:
+            return get_table_version(db, CHANGE_LOG_COUNTER)
+        finally:
+            db.close()
+
+    def _read_changes(self, since: int) -> Tuple[List[FeedEvent], int, bool]:
+        # Import tardio: os serviços importam este módulo (notify)
+        from app.services.change_log_service import ChangeLogService
+
+        db = self.session_factory()
+        try:
+            batch = ChangeLogService.get_changes(db, since, settings.CHANGES_PAGE_SIZE)
+        finally:
+            db.close()
+        return [encode_event(entry) for entry in batch.changes], batch.next_since, batch.has_more
+
+
+change_feed = ChangeFeed()
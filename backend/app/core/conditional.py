@@ -0,0 +1,58 @@
+"""
+GETs condicionais (ETag / If-None-Match) e políticas de Cache-Control.
+
+As ETags são fortes e derivadas de contadores gravados na mesma transação
+das escritas: a versão da linha (`version`) para um registro e o contador da
+tabela (`table_versions`) para as listagens. Conferir uma ETag custa, no
+máximo, uma consulta por chave primária, sem a query da rota nem
+serialização.
+"""
+from typing import Optional
+
+from fastapi import Request, Response, status
+
+# Políticas por tipo de rota. Registros e listagens podem ficar no cache do
+# cliente, mas são revalidados a cada uso (If-None-Match -> 304); tokens e
+# exportações nunca são guardados.
+CACHE_ENTITY = "private, no-cache"
+CACHE_LIST = "private, no-cache"
+CACHE_NO_STORE = "no-store"
+
+
+def make_etag(*parts: object) -> str:
+    """ETag forte a partir de contadores (ex.: `make_etag(version)` -> `"3"`)"""
+    return '"' + ".".join(str(part) for part in parts) + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Indica se `If-None-Match` contém `etag` (ou `*`). A comparação é fraca,
+    como manda a RFC 9110 para If-None-Match: um `W/` do cliente é ignorado.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def not_modified(etag: str, cache_control: str) -> Response:
+    """Resposta 304, sem corpo, com os headers de validação"""
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": cache_control},
+    )
+
+
+def set_validators(response: Response, etag: Optional[str], cache_control: str) -> None:
+    """Define ETag e Cache-Control na resposta (200) da rota"""
+    if etag is not None:
+        response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
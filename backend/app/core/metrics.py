@@ -0,0 +1,204 @@
+"""
+Métricas no formato do Prometheus, expostas em `GET /metrics`.
+
+Cada observação custa alguns incrementos protegidos por lock, o suficiente
+para ficar ligado em produção. As rotas são rotuladas pelo template
+(`/integrations/asset/{asset_id}`), nunca pelo path com IDs, para manter a
+cardinalidade baixa.
+
+Com vários workers do uvicorn, defina `PROMETHEUS_MULTIPROC_DIR` (um diretório
+vazio a cada deploy) para que qualquer worker responda pelo agregado de todos.
+"""
+import os
+import time
+
+from fastapi import Response
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client import multiprocess
+
+from app.core.request_context import current_request
+
+# Rótulo das requisições que não casaram com nenhuma rota (404, scanners)
+UNMATCHED_ROUTE = "unmatched"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# HTTP
+HTTP_REQUESTS = Counter(
+    "http_requests_total",
+    "Requisições HTTP por rota e status",
+    ["method", "route", "status"],
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Latência das requisições HTTP (até o fim do corpo da resposta)",
+    ["method", "route"],
+    buckets=LATENCY_BUCKETS,
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "Requisições HTTP em andamento",
+    multiprocess_mode="livesum",
+)
+
+# Banco de dados
+HTTP_REQUEST_DB_QUERIES = Histogram(
+    "http_request_db_queries",
+    "Queries executadas por requisição",
+    ["route"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, 250),
+)
+HTTP_REQUEST_DB_DURATION = Histogram(
+    "http_request_db_duration_seconds",
+    "Tempo total no banco por requisição",
+    ["route"],
+    buckets=LATENCY_BUCKETS,
+)
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds",
+    "Duração de cada query",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0),
+)
+DB_POOL_CHECKOUTS = Counter(
+    "db_pool_checkouts_total",
+    "Conexões retiradas do pool",
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out",
+    "Conexões do pool em uso",
+    multiprocess_mode="livesum",
+)
+DB_POOL_CONNECTIONS = Gauge(
+    "db_pool_connections",
+    "Conexões abertas com o banco",
+    multiprocess_mode="livesum",
+)
+DB_POOL_WAIT = Histogram(
+    "db_pool_wait_seconds",
+    "Espera para obter uma conexão do pool no início da requisição",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+
+# Cache de entidades (app.core.cache)
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "Leituras do cache de entidades (hit, negative_hit ou miss)",
+    ["entity", "result"],
+)
+CACHE_INVALIDATIONS = Counter(
+    "cache_invalidations_total",
+    "Entradas invalidadas por escritas",
+    ["entity"],
+)
+CACHE_EVICTIONS = Counter(
+    "cache_evictions_total",
+    "Entradas descartadas pelo limite de tamanho",
+    ["entity"],
+)
+CACHE_ERRORS = Counter(
+    "cache_errors_total",
+    "Falhas de comunicação com o Redis do cache, por operação",
+    ["operation"],
+)
+
+# Feed de alterações (app.core.change_feed)
+CHANGE_FEED_CONNECTIONS = Gauge(
+    "change_feed_connections",
+    "Conexões abertas em GET /changes/stream",
+    multiprocess_mode="livesum",
+)
+CHANGE_FEED_CONNECTION_DURATION = Histogram(
+    "change_feed_connection_duration_seconds",
+    "Duração das conexões de GET /changes/stream",
+    buckets=(1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600),
+)
+CHANGE_FEED_LAGGED = Counter(
+    "change_feed_lagged_total",
+    "Vezes em que uma conexão encheu a fila e voltou a ler do change_log",
+)
+
+# Segurança
+PASSWORD_HASH_DURATION = Histogram(
+    "password_hash_duration_seconds",
+    "Tempo do bcrypt (hash no cadastro, verify no login)",
+    ["operation"],
+    buckets=(0.01, 0.05, 0.1, 0.2, 0.3, 0.5, 1.0, 2.0),
+)
+
+
+def metrics_response() -> Response:
+    """Resposta de `GET /metrics` no formato texto do Prometheus"""
+    registry = REGISTRY
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
+
+
+def _is_event_stream(headers) -> bool:
+    return any(
+        name == b"content-type" and value.startswith(b"text/event-stream")
+        for name, value in headers
+    )
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI puro que mede cada requisição HTTP até o último byte da
+    resposta (inclusive nas rotas de streaming). Deve ficar dentro do
+    `RequestContextMiddleware`, de onde lê as estatísticas de banco.
+
+    Respostas SSE (`text/event-stream`) ficam abertas por minutos: só entram
+    em `http_requests_total`, e saem de `http_requests_in_progress` assim que
+    começam. A duração e o número delas têm métricas próprias
+    (`change_feed_connection_duration_seconds`, `change_feed_connections`).
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        streaming = False
+
+        async def send_wrapper(message):
+            nonlocal status_code, streaming
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if _is_event_stream(message.get("headers", ())):
+                    streaming = True
+                    HTTP_REQUESTS_IN_PROGRESS.dec()
+            await send(message)
+
+        HTTP_REQUESTS_IN_PROGRESS.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration = time.perf_counter() - start
+            if not streaming:
+                HTTP_REQUESTS_IN_PROGRESS.dec()
+
+            route = scope.get("route")
+            route = getattr(route, "path", UNMATCHED_ROUTE)
+            method = scope["method"]
+            HTTP_REQUESTS.labels(method, route, str(status_code)).inc()
+            if not streaming:
+                HTTP_REQUEST_DURATION.labels(method, route).observe(duration)
+
+            request = current_request()
+            if request is not None and not streaming:
+                HTTP_REQUEST_DB_QUERIES.labels(route).observe(request.db_queries)
+                HTTP_REQUEST_DB_DURATION.labels(route).observe(request.db_time)
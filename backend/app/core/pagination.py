@@ -0,0 +1,76 @@
+"""
+Paginação por cursor (keyset) para as rotas de listagem
+"""
+import base64
+import binascii
+from typing import Optional, Sequence
+
+from fastapi import HTTPException, Request, Response, status
+
+
+def encode_cursor(last_id: str) -> str:
+    """
+    Gera um cursor opaco a partir do ID do último registro da página.
+    
+    Args:
+        last_id: ID do último registro retornado
+    
+    Returns:
+        Cursor codificado em base64 url-safe (sem padding)
+    """
+    return base64.urlsafe_b64encode(last_id.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[str]:
+    """
+    Decodifica um cursor recebido em `?after=`.
+    
+    Args:
+        cursor: Cursor opaco gerado por `encode_cursor` (ou None)
+    
+    Returns:
+        ID do último registro da página anterior, ou None se não houver cursor
+    
+    Raises:
+        HTTPException: Se o cursor for inválido
+    """
+    if cursor is None:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return base64.b64decode(padded.encode(), altchars=b"-_", validate=True).decode()
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor de paginação inválido"
+        )
+
+
+def paginate(request: Request, response: Response, rows: Sequence, limit: int) -> Sequence:
+    """
+    Recorta a página e publica o cursor da próxima nos headers da resposta.
+    
+    A rota deve buscar `limit + 1` registros: o excedente indica que existe
+    uma próxima página sem precisar de um COUNT. Nesse caso são definidos os
+    headers `X-Next-Cursor` e `Link: <...>; rel="next"`.
+    
+    Args:
+        request: Requisição atual (base para a URL da próxima página)
+        response: Resposta onde os headers serão definidos
+        rows: Registros retornados pelo serviço (até `limit + 1`)
+        limit: Tamanho da página solicitado
+    
+    Returns:
+        Os registros da página (no máximo `limit`)
+    """
+    if len(rows) <= limit:
+        return rows
+
+    rows = rows[:limit]
+    cursor = encode_cursor(rows[-1].id)
+    next_url = request.url.remove_query_params("skip").include_query_params(
+        after=cursor, limit=limit
+    )
+    response.headers["X-Next-Cursor"] = cursor
+    response.headers["Link"] = f'<{next_url}>; rel="next"'
+    return rows
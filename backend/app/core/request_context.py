@@ -0,0 +1,98 @@
+"""
+Contexto da requisição HTTP em andamento, acessível de qualquer ponto do
+código que roda por causa dela (dependências, serviços, eventos do
+SQLAlchemy), inclusive nas threads do threadpool: o FastAPI copia os
+contextvars para a thread que executa as rotas síncronas.
+
+Ao fim de cada requisição, rotas que executaram mais de `QUERY_BUDGET`
+queries geram um aviso no log (sinal típico de N+1).
+"""
+import logging
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Set
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RequestContext:
+    """Estado de uma requisição, compartilhado entre event loop e threadpool"""
+    method: str
+    path: str
+    scope: dict = field(repr=False)
+    # Queries executadas pela requisição e tempo total no banco (segundos)
+    db_queries: int = 0
+    db_time: float = 0.0
+    # Fases da requisição (app.core.timing), em segundos
+    timings: Dict[str, float] = field(default_factory=dict)
+    active_spans: Set[str] = field(default_factory=set)
+    endpoint_done: Optional[float] = None
+
+    def add_query(self, duration: float) -> None:
+        self.db_queries += 1
+        self.db_time += duration
+
+    def add_timing(self, phase: str, duration: float) -> None:
+        self.timings[phase] = self.timings.get(phase, 0.0) + duration
+
+    @property
+    def route(self) -> str:
+        """
+        Template da rota (`/integrations/asset/{asset_id}`), disponível depois
+        do roteamento; antes disso, ou se nenhuma rota casar, o path bruto.
+        """
+        route = self.scope.get("route")
+        return getattr(route, "path", self.path)
+
+
+_current_request: ContextVar[Optional[RequestContext]] = ContextVar(
+    "current_request", default=None
+)
+
+
+def current_request() -> Optional[RequestContext]:
+    """Contexto da requisição atual (None fora de uma requisição)"""
+    return _current_request.get()
+
+
+class RequestContextMiddleware:
+    """
+    Middleware ASGI puro (não bufferiza o corpo, então funciona com as rotas
+    de streaming) que publica o `RequestContext` de cada requisição HTTP e
+    confere o orçamento de queries ao final.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request = RequestContext(method=scope["method"], path=scope["path"], scope=scope)
+        token = _current_request.set(request)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _current_request.reset(token)
+            check_query_budget(request)
+
+
+def check_query_budget(request: RequestContext, budget: Optional[int] = None) -> bool:
+    """
+    Loga um aviso se a requisição executou mais queries que `budget` (padrão
+    `QUERY_BUDGET`; 0 desliga). Retorna se o orçamento foi estourado.
+    """
+    budget = settings.QUERY_BUDGET if budget is None else budget
+    if not budget or request.db_queries <= budget:
+        return False
+    logger.warning(
+        "Orçamento de queries excedido: %s %s executou %d queries (limite %d)",
+        request.method, request.route, request.db_queries, budget,
+        extra={"route": request.route, "db_queries": request.db_queries},
+    )
+    return True
@@ -1,14 +1,18 @@
 """
 Utilitários de segurança e autenticação JWT
 """
+import logging
+import re
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
 from app.core.config import settings
+from app.core.metrics import PASSWORD_HASH_DURATION
+from app.core.timing import span
 
 
 # Contexto para hash de senhas com bcrypt
@@ -17,6 +21,9 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 # Security scheme para Swagger
 security = HTTPBearer()
 
+# Sem erro automático: nas rotas de streaming o token pode vir na query string
+optional_security = HTTPBearer(auto_error=False)
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
@@ -29,7 +36,8 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     Returns:
         True se a senha está correta, False caso contrário
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    with PASSWORD_HASH_DURATION.labels("verify").time():
+        return pwd_context.verify(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
@@ -42,7 +50,8 @@ def get_password_hash(password: str) -> str:
     Returns:
         Hash bcrypt da senha
     """
-    return pwd_context.hash(password)
+    with PASSWORD_HASH_DURATION.labels("hash").time():
+        return pwd_context.hash(password)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -106,8 +115,46 @@ def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(securit
     Raises:
         HTTPException: Se o token for inválido ou expirado
     """
-    token = credentials.credentials
-    payload = verify_token(token)
+    return _authenticate(credentials.credentials)
+
+
+def get_stream_user(
+    access_token: Optional[str] = Query(None, description="Token JWT (para clientes que não enviam headers, como EventSource)"),
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security)
+) -> dict:
+    """
+    Como `get_current_user`, mas aceita o token também no parâmetro
+    `access_token`: o EventSource do navegador não envia o header
+    Authorization. O header tem precedência.
+    """
+    if credentials is not None:
+        return _authenticate(credentials.credentials)
+    if access_token:
+        return _authenticate(access_token)
+    raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authenticated")
+
+
+class RedactAccessTokenFilter(logging.Filter):
+    """
+    Mascara o parâmetro `access_token` nas linhas de log (o log de acesso do
+    uvicorn inclui a query string de `GET /changes/stream`).
+    """
+
+    PATTERN = re.compile(r"(access_token=)[^&\s\"]+")
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if isinstance(record.msg, str):
+            record.msg = self.PATTERN.sub(r"\1***", record.msg)
+        if isinstance(record.args, tuple):
+            record.args = tuple(
+                self.PATTERN.sub(r"\1***", arg) if isinstance(arg, str) else arg for arg in record.args
+            )
+        return True
+
+
+def _authenticate(token: str) -> dict:
+    with span("auth"):
+        payload = verify_token(token)
     
     # Validar que o token tem o campo 'sub' (subject)
     if payload.get("sub") is None:
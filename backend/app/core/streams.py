@@ -0,0 +1,307 @@
+"""
+Streaming de corpos de requisição (NDJSON/CSV, opcionalmente gzip) processados
+em blocos e de respostas de exportação (NDJSON/CSV)
+"""
+import csv
+import io
+import json
+import zlib
+from typing import AsyncIterator, Callable, Iterable, Iterator, List, Sequence, Tuple, Type
+
+from fastapi import HTTPException, Request, status
+from pydantic import BaseModel, ValidationError
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.schemas.bulk import BulkResult, ImportResult, UpsertResult
+
+# Tamanho máximo de cada pedaço descomprimido: limita a memória mesmo com
+# entradas de alta taxa de compressão
+_INFLATE_CHUNK_BYTES = 64 * 1024
+
+
+async def iter_body(request: Request) -> AsyncIterator[bytes]:
+    """
+    Itera sobre o corpo da requisição conforme ele chega, descomprimindo-o
+    quando enviado com `Content-Encoding: gzip`.
+    
+    Raises:
+        HTTPException: Se a codificação não for suportada ou o gzip for inválido
+    """
+    encoding = request.headers.get("content-encoding", "identity").lower()
+    if encoding == "identity":
+        async for chunk in request.stream():
+            yield chunk
+        return
+    if encoding != "gzip":
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Content-Encoding não suportado: {encoding}"
+        )
+
+    inflater = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    try:
+        async for chunk in request.stream():
+            while chunk:
+                yield inflater.decompress(chunk, _INFLATE_CHUNK_BYTES)
+                chunk = inflater.unconsumed_tail
+        yield inflater.flush()
+    except zlib.error:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Corpo gzip inválido"
+        )
+
+
+async def iter_lines(request: Request) -> AsyncIterator[Tuple[int, bytes]]:
+    """
+    Itera sobre as linhas do corpo da requisição conforme ele chega, sem
+    carregá-lo inteiro em memória.
+    
+    Yields:
+        Tuplas (número da linha a partir de 1, conteúdo sem o '\\n')
+    
+    Raises:
+        HTTPException: Se uma linha exceder STREAM_MAX_LINE_BYTES
+    """
+    buffer = b""
+    line_number = 0
+    async for chunk in iter_body(request):
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_number += 1
+            yield line_number, line
+        if len(buffer) > settings.STREAM_MAX_LINE_BYTES:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Linha {line_number + 1} excede {settings.STREAM_MAX_LINE_BYTES} bytes"
+            )
+    if buffer:
+        yield line_number + 1, buffer
+
+
+async def iter_ndjson(request: Request) -> AsyncIterator[Tuple[int, object]]:
+    """
+    Itera sobre os objetos de um corpo NDJSON (um JSON por linha).
+    Linhas em branco são ignoradas; linhas com JSON inválido produzem a
+    exceção correspondente no lugar do objeto, para serem rejeitadas
+    individualmente.
+    """
+    async for line_number, line in iter_lines(request):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except ValueError as e:
+            yield line_number, e
+
+
+async def iter_csv(request: Request) -> AsyncIterator[Tuple[int, object]]:
+    """
+    Itera sobre as linhas de um corpo CSV (UTF-8, com cabeçalho) como dicts.
+    Campos entre aspas podem conter quebras de linha; o número informado é o
+    da linha onde o registro começa. Registros que não podem ser lidos
+    produzem uma exceção no lugar do dict, para serem rejeitados individualmente.
+    """
+    header = None
+    pending: List[str] = []
+    start = 0
+    async for line_number, raw in iter_lines(request):
+        try:
+            text = raw.decode("utf-8-sig" if line_number == 1 else "utf-8").rstrip("\r")
+        except UnicodeDecodeError as e:
+            pending = []
+            yield line_number, e
+            continue
+        if not pending:
+            start = line_number
+        pending.append(text)
+        # Aspas em número ímpar: o campo continua na próxima linha
+        if sum(part.count('"') for part in pending) % 2:
+            if sum(len(part) for part in pending) > settings.STREAM_MAX_LINE_BYTES:
+                raise HTTPException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail=f"Registro da linha {start} excede {settings.STREAM_MAX_LINE_BYTES} bytes"
+                )
+            continue
+
+        record = "\n".join(pending)
+        pending = []
+        if not record.strip():
+            continue
+        try:
+            values = next(csv.reader([record]))
+        except csv.Error as e:
+            yield start, e
+            continue
+        if header is None:
+            header = [column.strip() for column in values]
+        elif len(values) != len(header):
+            yield start, ValueError(f"esperadas {len(header)} colunas, recebidas {len(values)}")
+        else:
+            yield start, dict(zip(header, values))
+
+    if pending:
+        yield start, ValueError("aspas não fechadas")
+
+
+def iter_records(request: Request) -> AsyncIterator[Tuple[int, object]]:
+    """Escolhe o leitor (CSV ou NDJSON) pelo Content-Type da requisição"""
+    content_type = request.headers.get("content-type", "")
+    if content_type.startswith("text/csv"):
+        return iter_csv(request)
+    return iter_ndjson(request)
+
+
+async def iter_validated_chunks(
+    records: AsyncIterator[Tuple[int, object]],
+    schema: Type[BaseModel],
+    chunk_size: int
+) -> AsyncIterator[Tuple[List[Tuple[int, BaseModel]], List[Tuple[int, str]]]]:
+    """
+    Valida os registros com `schema` e os agrupa em blocos de até `chunk_size`.
+    
+    Yields:
+        Tuplas (linhas válidas como (linha, modelo), linhas rejeitadas como (linha, erro))
+    """
+    valid: List[Tuple[int, BaseModel]] = []
+    rejected: List[Tuple[int, str]] = []
+    async for line_number, record in records:
+        if isinstance(record, json.JSONDecodeError):
+            rejected.append((line_number, "JSON inválido"))
+        elif isinstance(record, Exception):
+            rejected.append((line_number, f"Linha inválida: {record}"))
+        else:
+            try:
+                valid.append((line_number, schema.model_validate(record)))
+            except ValidationError as e:
+                rejected.append((line_number, _format_validation_error(e)))
+        if len(valid) + len(rejected) >= chunk_size:
+            yield valid, rejected
+            valid, rejected = [], []
+    if valid or rejected:
+        yield valid, rejected
+
+
+async def stream_upsert(
+    request: Request,
+    schema: Type[BaseModel],
+    upsert: Callable[[List[Tuple[int, BaseModel]]], UpsertResult]
+) -> UpsertResult:
+    """
+    Aplica `upsert` a um corpo NDJSON bloco a bloco (STREAM_CHUNK_SIZE linhas
+    por transação). O acesso ao banco roda no threadpool, fora do event loop.
+    """
+    result = UpsertResult()
+    async for rows, rejected in iter_validated_chunks(
+        iter_ndjson(request), schema, settings.STREAM_CHUNK_SIZE
+    ):
+        result.received += len(rejected)
+        for line_number, error in rejected:
+            result.add_error(line_number, error)
+        if rows:
+            result.merge(await run_in_threadpool(upsert, rows))
+    return result
+
+
+async def stream_import(
+    request: Request,
+    schema: Type[BaseModel],
+    create_bulk: Callable[[List[BaseModel]], BulkResult],
+    chunk_size: int
+) -> ImportResult:
+    """
+    Importa um corpo NDJSON ou CSV (opcionalmente gzip) bloco a bloco: cada
+    bloco de `chunk_size` linhas é validado com `schema` e gravado por
+    `create_bulk` em uma transação própria, no threadpool. Apenas um bloco é
+    mantido em memória por vez.
+    """
+    result = ImportResult()
+    async for rows, rejected in iter_validated_chunks(iter_records(request), schema, chunk_size):
+        result.received += len(rows) + len(rejected)
+        if rows:
+            bulk = await run_in_threadpool(create_bulk, [item for _, item in rows])
+            result.created += bulk.created
+            rejected.extend(
+                (rows[item.index][0], item.error)
+                for item in bulk.results
+                if item.error is not None
+            )
+        for line_number, error in sorted(rejected):
+            result.add_error(line_number, error)
+        result.chunks += 1
+    return result
+
+
+def _format_validation_error(error: ValidationError) -> str:
+    """Resume um ValidationError em uma mensagem curta por campo"""
+    return "; ".join(
+        f"{'.'.join(str(part) for part in e['loc']) or 'linha'}: {e['msg']}"
+        for e in error.errors()
+    )
+
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def encode_rows(
+    rows: Iterable,
+    columns: Sequence[str],
+    fmt: str,
+    batch_size: int
+) -> Iterator[str]:
+    """
+    Serializa linhas do banco em NDJSON ou CSV, emitindo um pedaço a cada
+    `batch_size` linhas (poucos writes grandes em vez de um por linha).
+    
+    Args:
+        rows: Linhas com os atributos de `columns` (ex.: Row do SQLAlchemy)
+        columns: Colunas exportadas, na ordem do CSV
+        fmt: "ndjson" ou "csv"
+        batch_size: Linhas por pedaço emitido
+    """
+    buffer = io.StringIO()
+    if fmt == "csv":
+        writer = csv.writer(buffer, lineterminator="\n")
+        writer.writerow(columns)
+        write = lambda row: writer.writerow([getattr(row, c) for c in columns])
+    else:
+        write = lambda row: buffer.write(
+            json.dumps({c: getattr(row, c) for c in columns}, ensure_ascii=False) + "\n"
+        )
+
+    pending = 0
+    for row in rows:
+        write(row)
+        pending += 1
+        if pending >= batch_size:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+NDJSON_REQUEST_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {"application/x-ndjson": {"schema": {"type": "string"}}},
+        "description": "Um objeto JSON por linha",
+    }
+}
+
+IMPORT_REQUEST_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "application/x-ndjson": {"schema": {"type": "string"}},
+            "text/csv": {"schema": {"type": "string"}},
+        },
+        "description": "NDJSON (um objeto por linha) ou CSV com cabeçalho; aceita Content-Encoding: gzip",
+    }
+}
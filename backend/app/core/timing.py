@@ -0,0 +1,163 @@
+"""
+Fases de cada requisição no header `Server-Timing` (e no log de acesso).
+
+Fases medidas:
+
+- auth: validação do JWT (`get_current_user`)
+- pool: espera por uma conexão do pool (`get_db`)
+- db: tempo das queries (eventos do engine, app.db.instrumentation)
+- svc: chamadas aos serviços (inclui o tempo de db)
+- serialize: montagem dos schemas de resposta nas rotas e validação/JSON do
+  `response_model` depois que a rota retorna
+- total: até o início da resposta
+
+As fases podem se sobrepor (db está contido em svc). Ligado por ambiente com
+`SERVER_TIMING_ENABLED`.
+"""
+import asyncio
+import functools
+import logging
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+from fastapi.routing import APIRoute
+
+from app.core.config import settings
+from app.core.request_context import RequestContext, current_request
+
+logger = logging.getLogger("app.access")
+
+# Ordem das fases no header
+PHASES = ("auth", "pool", "db", "svc", "serialize")
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """
+    Soma a duração do bloco à fase `name` da requisição atual. Spans aninhados
+    da mesma fase (um serviço chamando outro) contam uma vez só.
+    """
+    request = current_request()
+    if request is None or name in request.active_spans:
+        yield
+        return
+
+    request.active_spans.add(name)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        request.add_timing(name, time.perf_counter() - start)
+        request.active_spans.discard(name)
+
+
+def timed(name: str) -> Callable:
+    """Decorator que mede cada chamada da função como um span `name`"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def timed_methods(name: str) -> Callable:
+    """Decorator de classe: mede todos os métodos estáticos como o span `name`"""
+    def decorator(cls):
+        for attr, value in list(vars(cls).items()):
+            if isinstance(value, staticmethod):
+                setattr(cls, attr, staticmethod(timed(name)(value.__func__)))
+        return cls
+    return decorator
+
+
+class TimedRoute(APIRoute):
+    """
+    APIRoute que registra quando a função da rota retorna, para medir a
+    serialização feita pelo FastAPI a partir daí (`response_model` + JSON).
+    """
+
+    def get_route_handler(self) -> Callable:
+        call = self.dependant.call
+
+        if asyncio.iscoroutinefunction(call):
+            @functools.wraps(call)
+            async def endpoint(*args, **kwargs):
+                try:
+                    return await call(*args, **kwargs)
+                finally:
+                    _mark_endpoint_done()
+        else:
+            @functools.wraps(call)
+            def endpoint(*args, **kwargs):
+                try:
+                    return call(*args, **kwargs)
+                finally:
+                    _mark_endpoint_done()
+
+        self.dependant.call = endpoint
+        handler = super().get_route_handler()
+
+        async def timed_handler(request):
+            response = await handler(request)
+            context = current_request()
+            if context is not None and context.endpoint_done is not None:
+                context.add_timing("serialize", time.perf_counter() - context.endpoint_done)
+            return response
+
+        return timed_handler
+
+
+def _mark_endpoint_done() -> None:
+    request = current_request()
+    if request is not None:
+        request.endpoint_done = time.perf_counter()
+
+
+def server_timing(request: RequestContext, total: float) -> str:
+    """Valor do header: `auth;dur=1.2, db;dur=8.0, ..., total;dur=15.3` (ms)"""
+    timings = dict(request.timings)
+    if request.db_queries:
+        timings["db"] = request.db_time
+    entries = [
+        f"{phase};dur={timings[phase] * 1000:.1f}" for phase in PHASES if phase in timings
+    ]
+    entries.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(entries)
+
+
+class ServerTimingMiddleware:
+    """
+    Middleware ASGI puro que adiciona `Server-Timing` ao início da resposta e
+    registra as fases no log de acesso (campo `server_timing`). Deve ficar
+    dentro do `RequestContextMiddleware`.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.SERVER_TIMING_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            request = current_request()
+            if message["type"] == "http.response.start" and request is not None:
+                value = server_timing(request, time.perf_counter() - start)
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [
+                    (b"server-timing", value.encode("latin-1"))
+                ]
+                logger.info(
+                    "%s %s %s server_timing=%s",
+                    request.method, request.route, message["status"], value,
+                    extra={"server_timing": value, "route": request.route},
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -1,30 +1,46 @@
-from sqlalchemy import create_engine, event
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.engine import Engine
-import os
-
-# Caminho para o banco de dados SQLite
-BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-DATABASE_URL = f"sqlite:///{os.path.join(BASE_DIR, 'eyesonasset.db')}"
-
-# Criar engine do SQLAlchemy
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False},  # Necessário para SQLite
-    echo=True  # Log SQL queries (pode desabilitar em produção)
-)
-
-# CRITICAL: Habilitar foreign keys no SQLite (desabilitado por padrão!)
-@event.listens_for(Engine, "connect")
-def set_sqlite_pragma(dbapi_conn, connection_record):
-    """Habilita foreign keys no SQLite em cada conexão"""
-    cursor = dbapi_conn.cursor()
-    cursor.execute("PRAGMA foreign_keys=ON")
-    cursor.close()
-
-# Criar SessionLocal
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+from app.core.config import settings
+from app.db.instrumentation import install_instrumentation
+from app.db.sqlite import configure_sqlite
+
+
+def build_engine(database_url: str = settings.DATABASE_URL, **kwargs) -> Engine:
+    """
+    Cria o engine do SQLAlchemy para `database_url`.
+
+    - SQLite: conexões usáveis de qualquer thread do threadpool e perfil de
+      desempenho (foreign keys, WAL...) aplicado em cada conexão
+    - Demais bancos (PostgreSQL): pool de conexões dimensionado pelas
+      configurações DB_POOL_*, compartilhado pelas threads do worker
+    """
+    url = make_url(database_url)
+    if url.get_backend_name() == "sqlite":
+        kwargs.setdefault("connect_args", {"check_same_thread": False})
+    else:
+        kwargs.setdefault("pool_size", settings.DB_POOL_SIZE)
+        kwargs.setdefault("max_overflow", settings.DB_MAX_OVERFLOW)
+        kwargs.setdefault("pool_timeout", settings.DB_POOL_TIMEOUT)
+        kwargs.setdefault("pool_recycle", settings.DB_POOL_RECYCLE)
+        kwargs.setdefault("pool_pre_ping", settings.DB_POOL_PRE_PING)
+
+    engine = create_engine(url, **kwargs)
+    configure_sqlite(engine)
+    return engine
+
+
+# Criar engine do SQLAlchemy a partir de DATABASE_URL. Em vez de logar todo SQL
+# (echo), cada query é cronometrada (métricas) e só as acima de SLOW_QUERY_MS
+# são registradas.
+engine = build_engine(echo=settings.DB_ECHO)
+install_instrumentation(engine)
+
+# Criar SessionLocal. Sem expirar os objetos no commit: a sessão dura uma
+# requisição, e o objeto recém-gravado é serializado sem um SELECT de refresh.
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 
 # Base para os modelos
 Base = declarative_base()
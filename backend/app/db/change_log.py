@@ -0,0 +1,80 @@
+"""
+Gravação do change_log (ver `ChangeLog`)
+"""
+from typing import NamedTuple, Sequence, Union
+
+from sqlalchemy import func, insert, literal, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.db.models.asset import Asset
+from app.db.models.change_log import ChangeLog
+from app.db.models.owner import Owner
+from app.db.versions import bump_table_versions
+
+# Contador (em table_versions) que fornece os `seq`
+CHANGE_LOG_COUNTER = "change_log"
+
+ENTITY_TABLES = {"asset": Asset.__table__, "owner": Owner.__table__}
+
+
+class Change(NamedTuple):
+    """Uma operação sobre um conjunto de registros da mesma entidade"""
+    entity: str  # asset ou owner
+    operation: str  # create, update ou delete
+    ids: Sequence[str]
+
+
+def record_changes(db: Union[Session, Connection], *changes: Change) -> None:
+    """
+    Grava as alterações no change_log e incrementa o contador das tabelas
+    afetadas (ETag das listagens), na transação da escrita.
+
+    Chamar imediatamente antes do commit: a reserva dos `seq` bloqueia o
+    contador até o fim da transação, e as escritas concorrentes esperam só
+    pelo commit.
+    """
+    changes = [change for change in changes if change.ids]
+    if not changes:
+        return
+
+    total = sum(len(change.ids) for change in changes)
+    increments = {ENTITY_TABLES[change.entity].name: 1 for change in changes}
+    increments[CHANGE_LOG_COUNTER] = total
+    seq = bump_table_versions(db, increments)[CHANGE_LOG_COUNTER] - total
+
+    rows = []
+    for change in changes:
+        for entity_id in change.ids:
+            seq += 1
+            rows.append({
+                "seq": seq,
+                "entity": change.entity,
+                "entity_id": entity_id,
+                "operation": change.operation
+            })
+    db.execute(insert(ChangeLog.__table__), rows)
+
+
+def record_table(db: Union[Session, Connection], entity: str, operation: str) -> int:
+    """
+    Grava `operation` para todas as linhas da tabela da entidade com um único
+    INSERT ... SELECT, para cargas e limpezas em massa. Retorna o número de
+    linhas registradas.
+    """
+    table = ENTITY_TABLES[entity]
+    count = db.execute(select(func.count()).select_from(table)).scalar()
+    if not count:
+        return 0
+
+    last = bump_table_versions(db, {table.name: 1, CHANGE_LOG_COUNTER: count})[CHANGE_LOG_COUNTER]
+    rows = select(
+        literal(last - count) + func.row_number().over(order_by=table.c.id),
+        literal(entity),
+        table.c.id,
+        literal(operation),
+    )
+    db.execute(insert(ChangeLog.__table__).from_select(
+        ["seq", "entity", "entity_id", "operation"], rows
+    ))
+    return count
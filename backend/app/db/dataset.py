@@ -0,0 +1,324 @@
+"""
+Gerador de dados sintéticos para ambientes de carga e benchmark.
+
+Gera N responsáveis e M ativos com distribuição realista: categorias com
+pesos diferentes (muitos notebooks, poucas aeronaves) e ativos concentrados
+em poucos responsáveis - alguns "pesados" com `heavy_owner_assets` ativos cada
+e o restante distribuído por uma lei de potência (`skew`). Tudo deriva de
+`seed`: a mesma semente gera sempre o mesmo banco, IDs inclusive.
+
+A carga usa inserts em lote do Core (executemany, sem objetos ORM) em uma
+única transação. No SQLite, durante a carga, o journal fica em memória e o
+fsync é desligado; os valores anteriores são restaurados ao final.
+
+Uso (banco de DATABASE_URL, já migrado):
+    python -m app.db.dataset --owners 10000 --assets 1000000 [--seed 0] [--truncate]
+"""
+import argparse
+import random
+import time
+import unicodedata
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from itertools import accumulate
+from typing import Iterator, List, Sequence
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.engine import Connection, Engine
+
+from app.db.change_log import record_table
+from app.db.models.asset import Asset
+from app.db.models.owner import Owner
+
+# Categorias com peso relativo e modelos usados nos nomes
+CATEGORIES = {
+    "Notebook": (30, ("Dell Latitude 5420", "Lenovo ThinkPad T14", "MacBook Pro 14")),
+    "Monitor": (18, ("Dell P2422H", "LG 27UL500", "Samsung S24R350")),
+    "Celular": (15, ("iPhone 13", "Galaxy S22", "Moto G82")),
+    "Veículo": (8, ("Fiat Strada", "Toyota Hilux", "VW Saveiro")),
+    "Ferramenta": (7, ("Furadeira Bosch", "Multímetro Fluke", "Parafusadeira Makita")),
+    "Impressora": (6, ("HP LaserJet M428", "Epson EcoTank L3250")),
+    "Servidor": (5, ("Dell PowerEdge R650", "HPE ProLiant DL380")),
+    "Mobiliário": (5, ("Cadeira ergonômica", "Mesa em L", "Armário de aço")),
+    "Switch": (4, ("Cisco Catalyst 9200", "Aruba 2930F")),
+    "Maquinário": (1.5, ("Empilhadeira Toyota", "Gerador Cummins")),
+    "Aeronave": (0.5, ("Boeing 737", "Embraer E195", "ATR 72")),
+}
+
+FIRST_NAMES = (
+    "Ana", "Bruno", "Carla", "Daniel", "Eduarda", "Felipe", "Gabriela", "Henrique",
+    "Isabela", "João", "Larissa", "Marcos", "Natália", "Otávio", "Paula", "Rafael",
+    "Sofia", "Thiago", "Vanessa", "Vinícius",
+)
+LAST_NAMES = (
+    "Silva", "Santos", "Oliveira", "Souza", "Rodrigues", "Ferreira", "Alves",
+    "Pereira", "Lima", "Gomes", "Costa", "Ribeiro", "Martins", "Carvalho", "Araújo",
+)
+
+# Bits de versão (4) e variante (10) de um UUID v4
+UUID_FIXED_MASK = 0xF000 << 64 | 0xC000 << 48
+UUID_FIXED_BITS = 0x4000 << 64 | 0x8000 << 48
+
+OWNER_COLUMNS = ("id", "name", "email", "phone")
+ASSET_COLUMNS = ("id", "name", "category", "owner")
+
+# PRAGMAs da carga no SQLite (sem journal em disco nem fsync)
+BULK_LOAD_PRAGMAS = {
+    "journal_mode": "MEMORY",
+    "synchronous": "OFF",
+    "cache_size": -262144,
+    "temp_store": "MEMORY",
+    # Ordenação da criação dos índices em várias threads
+    "threads": 4,
+    # ANALYZE por amostragem em vez de ler os índices inteiros
+    "analysis_limit": 1000,
+}
+
+
+@dataclass
+class Dataset:
+    """Resumo de uma carga"""
+    owners: int
+    assets: int
+    elapsed: float
+    owner_ids: List[str] = field(repr=False)
+    # Amostra dos IDs de ativos (os milhões de IDs não ficam em memória)
+    asset_sample: List[str] = field(repr=False)
+
+
+@contextmanager
+def relaxed_pragmas(connection: Connection) -> Iterator[None]:
+    """Aplica BULK_LOAD_PRAGMAS na conexão (só SQLite) e restaura os anteriores"""
+    if connection.dialect.name != "sqlite":
+        yield
+        return
+    previous = {
+        name: connection.exec_driver_sql(f"PRAGMA {name}").scalar()
+        for name in BULK_LOAD_PRAGMAS
+    }
+    for name, value in BULK_LOAD_PRAGMAS.items():
+        connection.exec_driver_sql(f"PRAGMA {name}={value}")
+    # Encerra a transação implícita (autobegin) antes da carga
+    connection.commit()
+    try:
+        yield
+    finally:
+        connection.rollback()
+        for name, value in previous.items():
+            connection.exec_driver_sql(f"PRAGMA {name}={value}")
+        connection.commit()
+
+
+@contextmanager
+def indexes_dropped(connection: Connection) -> Iterator[None]:
+    """
+    Remove os índices secundários de `assets` durante a carga e os recria ao
+    final, mesmo se ela falhar: construir um índice ordenando as linhas de uma
+    vez é muito mais rápido que mantê-lo a cada insert. A carga deve abrir a
+    própria transação dentro do bloco.
+    """
+    indexes = list(Asset.__table__.indexes)
+    for index in indexes:
+        index.drop(connection)
+    connection.commit()
+    try:
+        yield
+    finally:
+        connection.rollback()
+        for index in indexes:
+            index.create(connection)
+        connection.commit()
+
+
+def sequential_ids(rng: random.Random, count: int) -> Iterator[str]:
+    """
+    `count` UUIDs v4 em ordem crescente: os bits altos são o contador e os
+    demais, aleatórios. Continuam espalhados por todo o espaço, mas a chave
+    primária recebe os inserts em ordem (só acrescenta páginas ao fim do
+    índice em vez de dividir páginas aleatórias).
+    """
+    bits = 128 - max(count - 1, 1).bit_length()
+    for i in range(count):
+        # Versão 4 e variante RFC 4122 ficam nos bits aleatórios
+        value = (i << bits | rng.getrandbits(bits)) & ~UUID_FIXED_MASK | UUID_FIXED_BITS
+        digits = f"{value:032x}"
+        yield f"{digits[:8]}-{digits[8:12]}-{digits[12:16]}-{digits[16:20]}-{digits[20:]}"
+
+
+def ascii_lower(text: str) -> str:
+    """Minúsculas sem acentos (parte local dos emails)"""
+    return unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode().lower()
+
+
+def insert_rows(connection: Connection, table, columns: Sequence[str], rows: List[tuple]) -> None:
+    """
+    Insere `rows` (tuplas na ordem de `columns`) com um único executemany. No
+    SQLite o SQL compilado vai direto ao driver, sem o processamento de
+    parâmetros do SQLAlchemy por linha; nos demais bancos o insert do Core
+    agrupa as linhas em VALUES múltiplos.
+    """
+    if connection.dialect.name == "sqlite":
+        placeholders = ", ".join("?" for _ in columns)
+        connection.exec_driver_sql(
+            f"INSERT INTO {table.name} ({', '.join(columns)}) VALUES ({placeholders})", rows
+        )
+    else:
+        connection.execute(insert(table), [dict(zip(columns, row)) for row in rows])
+
+
+def generate_dataset(
+    engine: Engine,
+    owners: int,
+    assets: int,
+    seed: int = 0,
+    heavy_owners: int = 10,
+    heavy_owner_assets: int = 10000,
+    skew: float = 0.5,
+    batch_size: int = 50000,
+    sample_size: int = 10000,
+) -> Dataset:
+    """
+    Insere `owners` responsáveis e `assets` ativos no banco de `engine`, que
+    deve estar com o schema criado. Os emails seguem `nome.sobrenome.N@...`,
+    então a carga falha (sem gravar nada) se o banco já tiver os mesmos dados.
+
+    Os `heavy_owners` primeiros responsáveis recebem `heavy_owner_assets`
+    ativos cada (juntos, no máximo metade dos ativos); os demais ativos são
+    sorteados entre os outros responsáveis com peso 1/posição^skew (skew=0:
+    uniforme).
+
+    Ao final, todas as linhas das tabelas são registradas como criações no
+    change_log: o banco deve estar vazio, como o CLI exige.
+    """
+    if owners < 1 and assets:
+        raise ValueError("É preciso ao menos um responsável para gerar ativos")
+
+    rng = random.Random(seed)
+    start = time.perf_counter()
+
+    owner_ids = list(sequential_ids(rng, owners))
+
+    # Responsável de cada ativo, embaralhado para que os ativos dos pesados
+    # não fiquem agrupados na ordem de ID (a da paginação)
+    heavy_owners = min(heavy_owners, owners)
+    per_heavy_owner = min(heavy_owner_assets, assets // (2 * heavy_owners)) if heavy_owners else 0
+    assignments = [owner for owner in owner_ids[:heavy_owners] for _ in range(per_heavy_owner)]
+    tail_ids = owner_ids[heavy_owners:] or owner_ids
+    assignments += rng.choices(
+        tail_ids,
+        cum_weights=list(accumulate(1 / rank ** skew for rank in range(1, len(tail_ids) + 1))),
+        k=assets - len(assignments),
+    )
+    rng.shuffle(assignments)
+
+    categories = list(CATEGORIES)
+    models = {category: names for category, (_, names) in CATEGORIES.items()}
+    category_cum_weights = list(accumulate(weight for weight, _ in CATEGORIES.values()))
+    asset_ids = sequential_ids(rng, assets)
+    asset_sample: List[str] = []
+
+    with engine.connect() as connection, relaxed_pragmas(connection):
+        with indexes_dropped(connection), connection.begin():
+            for offset in range(0, owners, batch_size):
+                rows = []
+                for i in range(offset, min(offset + batch_size, owners)):
+                    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+                    rows.append((
+                        owner_ids[i],
+                        f"{first} {last}",
+                        f"{ascii_lower(first)}.{ascii_lower(last)}.{i}@empresa.com",
+                        f"+55 11 9{rng.randrange(10000):04d}-{rng.randrange(10000):04d}",
+                    ))
+                insert_rows(connection, Owner.__table__, OWNER_COLUMNS, rows)
+
+            for offset in range(0, assets, batch_size):
+                count = min(batch_size, assets - offset)
+                drawn_categories = rng.choices(categories, cum_weights=category_cum_weights, k=count)
+                rows = [
+                    (
+                        next(asset_ids),
+                        f"{models[category][(offset + i) % len(models[category])]} {offset + i:07d}",
+                        category,
+                        owner,
+                    )
+                    for i, (owner, category) in enumerate(
+                        zip(assignments[offset:offset + count], drawn_categories)
+                    )
+                ]
+                insert_rows(connection, Asset.__table__, ASSET_COLUMNS, rows)
+                if len(asset_sample) < sample_size:
+                    asset_sample.extend(row[0] for row in rows[:sample_size - len(asset_sample)])
+
+            # Criações no change_log (um INSERT ... SELECT por tabela), que
+            # também invalidam as ETags das listagens
+            record_table(connection, "owner", "create")
+            record_table(connection, "asset", "create")
+
+        # Estatísticas para o planejador após a carga
+        connection.exec_driver_sql("ANALYZE")
+        connection.commit()
+
+    return Dataset(
+        owners=owners,
+        assets=assets,
+        elapsed=time.perf_counter() - start,
+        owner_ids=owner_ids,
+        asset_sample=asset_sample,
+    )
+
+
+def truncate(engine: Engine) -> None:
+    """Remove todos os ativos e responsáveis (registrando as remoções no change_log)"""
+    with engine.begin() as connection:
+        record_table(connection, "asset", "delete")
+        record_table(connection, "owner", "delete")
+        connection.execute(delete(Asset))
+        connection.execute(delete(Owner))
+
+
+def main():
+    from app.core.config import settings
+    from app.db.base import build_engine
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--owners", type=int, default=10000, help="Responsáveis")
+    parser.add_argument("--assets", type=int, default=1000000, help="Ativos")
+    parser.add_argument("--seed", type=int, default=0, help="Semente (mesma semente, mesmo banco)")
+    parser.add_argument("--heavy-owners", type=int, default=10, help="Responsáveis com muitos ativos")
+    parser.add_argument("--heavy-owner-assets", type=int, default=10000, help="Ativos de cada um deles")
+    parser.add_argument("--skew", type=float, default=0.5, help="Concentração dos demais (0 = uniforme)")
+    parser.add_argument("--batch-size", type=int, default=50000, help="Linhas por executemany")
+    parser.add_argument("--database-url", default=settings.DATABASE_URL, help="Banco de destino")
+    parser.add_argument("--truncate", action="store_true", help="Apaga ativos e responsáveis antes")
+    args = parser.parse_args()
+
+    engine = build_engine(args.database_url)
+    try:
+        if args.truncate:
+            truncate(engine)
+        with engine.connect() as connection:
+            existing = connection.execute(select(func.count()).select_from(Owner)).scalar()
+        if existing:
+            parser.error(f"O banco já tem {existing} responsáveis; use --truncate para substituí-los")
+
+        dataset = generate_dataset(
+            engine,
+            owners=args.owners,
+            assets=args.assets,
+            seed=args.seed,
+            heavy_owners=args.heavy_owners,
+            heavy_owner_assets=args.heavy_owner_assets,
+            skew=args.skew,
+            batch_size=args.batch_size,
+        )
+    finally:
+        engine.dispose()
+
+    print(
+        f"{dataset.owners} responsáveis e {dataset.assets} ativos em {dataset.elapsed:.1f}s "
+        f"({dataset.assets / dataset.elapsed:,.0f} ativos/s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,20 @@
+"""
+Construções SQL que dependem do dialeto do banco
+"""
+from typing import Union
+
+from sqlalchemy import Table
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+
+def insert_for(db: Union[Session, Connection], table: Table):
+    """
+    Retorna um INSERT do dialeto da sessão (ou conexão), que suporta
+    `on_conflict_do_update`/`on_conflict_do_nothing` (SQLite e PostgreSQL).
+    """
+    dialect = db.get_bind().dialect if isinstance(db, Session) else db.dialect
+    if dialect.name == "postgresql":
+        return postgresql.insert(table)
+    return sqlite.insert(table)
@@ -0,0 +1,111 @@
+"""
+Instrumentação do engine: cronometra cada execução e alimenta, a partir de
+um único par de eventos, as estatísticas da requisição atual, as métricas e o
+log de queries lentas. Também acompanha as conexões do pool.
+
+`QueryCounter` conta as queries de um trecho de código (orçamentos de queries
+e detecção de N+1 nos testes).
+"""
+import time
+from collections import Counter
+from typing import Dict, List
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.metrics import (
+    DB_POOL_CHECKED_OUT,
+    DB_POOL_CHECKOUTS,
+    DB_POOL_CONNECTIONS,
+    DB_QUERY_DURATION,
+)
+from app.core.request_context import current_request
+from app.db.slow_queries import SlowQueryLog, normalize_statement, record_if_slow, slow_query_log
+
+
+def install_instrumentation(engine: Engine, log: SlowQueryLog = slow_query_log) -> None:
+    """Registra no `engine` os eventos de medição de queries e do pool"""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def start_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "handle_error")
+    def discard_timer(exception_context):
+        # A execução falhou: after_cursor_execute não será chamado
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_start_time"):
+            conn.info["query_start_time"].pop()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def stop_timer(conn, cursor, statement, parameters, context, executemany):
+        duration = time.perf_counter() - conn.info["query_start_time"].pop()
+        DB_QUERY_DURATION.observe(duration)
+
+        request = current_request()
+        if request is not None:
+            request.add_query(duration)
+        route = f"{request.method} {request.route}" if request else None
+
+        record_if_slow(
+            log, cursor, conn.dialect.name, statement, parameters, executemany,
+            duration * 1000, route,
+        )
+
+    @event.listens_for(engine, "connect")
+    def count_connection(dbapi_conn, connection_record):
+        DB_POOL_CONNECTIONS.inc()
+
+    @event.listens_for(engine, "close")
+    def discount_connection(dbapi_conn, connection_record):
+        DB_POOL_CONNECTIONS.dec()
+
+    @event.listens_for(engine, "checkout")
+    def count_checkout(dbapi_conn, connection_record, connection_proxy):
+        DB_POOL_CHECKOUTS.inc()
+        DB_POOL_CHECKED_OUT.inc()
+
+    @event.listens_for(engine, "checkin")
+    def count_checkin(dbapi_conn, connection_record):
+        DB_POOL_CHECKED_OUT.dec()
+
+
+class QueryCounter:
+    """
+    Context manager que registra as queries executadas no `engine` enquanto
+    ativo:
+
+        with QueryCounter(engine) as queries:
+            client.get("/integrations/assets")
+        assert queries.count <= 3
+    """
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self.statements: List[str] = []
+
+    def __enter__(self) -> "QueryCounter":
+        event.listen(self.engine, "after_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        event.remove(self.engine, "after_cursor_execute", self._record)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(normalize_statement(statement))
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def repeated(self, threshold: int = 2) -> Dict[str, int]:
+        """Consultas executadas `threshold` ou mais vezes (suspeitas de N+1)"""
+        return {
+            statement: times
+            for statement, times in Counter(self.statements).items()
+            if times >= threshold
+        }
+
+    def report(self) -> str:
+        """Lista numerada das queries, para mensagens de falha"""
+        return "\n".join(f"{i}. {statement}" for i, statement in enumerate(self.statements, 1))
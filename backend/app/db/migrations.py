@@ -0,0 +1,53 @@
+"""
+Integração com o Alembic: o schema é criado e alterado por migrações
+(`alembic upgrade head`), e a aplicação apenas confere na inicialização se o
+banco está na revisão esperada.
+"""
+from pathlib import Path
+from typing import Optional
+
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+
+
+def alembic_config(url: Optional[str] = None) -> Config:
+    """Configuração do Alembic do projeto, opcionalmente com outra URL de banco"""
+    config = Config(str(ALEMBIC_INI))
+    if url is not None:
+        config.set_main_option("sqlalchemy.url", url)
+    return config
+
+
+def database_url(config: Config) -> str:
+    """URL usada pelas migrações: a da configuração ou DATABASE_URL"""
+    return config.get_main_option("sqlalchemy.url") or settings.DATABASE_URL
+
+
+def head_revision() -> Optional[str]:
+    """Revisão mais recente entre as migrações do projeto"""
+    return ScriptDirectory.from_config(alembic_config()).get_current_head()
+
+
+def current_revision(engine: Engine) -> Optional[str]:
+    """Revisão aplicada no banco (None se ele nunca foi migrado)"""
+    with engine.connect() as connection:
+        return MigrationContext.configure(connection).get_current_revision()
+
+
+def check_revision(engine: Engine) -> None:
+    """
+    Confere se o banco está na última revisão. Não executa DDL: a inicialização
+    só lê `alembic_version`, e um banco desatualizado impede a subida.
+    """
+    current, head = current_revision(engine), head_revision()
+    if current != head:
+        raise RuntimeError(
+            f"Banco na revisão {current or '(nenhuma)'}, esperada {head}. "
+            "Execute 'alembic upgrade head'."
+        )
@@ -1,5 +1,7 @@
 from .asset import Asset
+from .change_log import ChangeLog
 from .owner import Owner
+from .table_version import TableVersion
 from .user import User
 
-__all__ = ["Asset", "Owner", "User"]
+__all__ = ["Asset", "ChangeLog", "Owner", "TableVersion", "User"]
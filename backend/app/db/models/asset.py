@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, ForeignKey
+from sqlalchemy import Column, Integer, String, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 import uuid
 from ..base import Base
@@ -7,14 +7,32 @@ from ..base import Base
 class Asset(Base):
     """Modelo de Ativo (Asset) no banco de dados"""
     __tablename__ = "assets"
+    __table_args__ = (
+        # Filtros por owner/categoria com a mesma ordenação (id) da paginação
+        Index("ix_assets_owner_id", "owner", "id"),
+        Index("ix_assets_category_id", "category", "id"),
+        # Ativos de um responsável por nome
+        Index("ix_assets_owner_name", "owner", "name"),
+        # Busca por prefixo do nome (range scan)
+        Index("ix_assets_name", "name"),
+        # Identificador no sistema de origem (sincronizações por upsert)
+        UniqueConstraint("source", "external_id", name="uq_assets_source_external_id"),
+    )
 
     id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     name = Column(String(140), nullable=False)
     category = Column(String(60), nullable=False)
     owner = Column(String(36), ForeignKey("owners.id", ondelete="CASCADE"), nullable=False)
+    source = Column(String(60), nullable=True)
+    external_id = Column(String(140), nullable=True)
+    # Incrementada a cada alteração da linha (ETag); o UPDATE do ORM confere a
+    # versão lida, então duas escritas concorrentes não geram a mesma versão
+    version = Column(Integer, nullable=False, default=1, server_default="1")
 
     # Relacionamento com Owner
     owner_rel = relationship("Owner", back_populates="assets")
 
+    __mapper_args__ = {"version_id_col": version}
+
     def __repr__(self):
         return f"<Asset(id={self.id}, name={self.name}, category={self.category})>"
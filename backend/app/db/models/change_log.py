@@ -0,0 +1,24 @@
+from sqlalchemy import BigInteger, Column, DateTime, String, func
+from ..base import Base
+
+
+class ChangeLog(Base):
+    """
+    Registro de cada criação, alteração e remoção de assets/owners, gravado na
+    mesma transação da escrita (sincronização incremental).
+
+    `seq` vem do contador `change_log` de table_versions, reservado no fim da
+    transação: a ordem de `seq` é a ordem dos commits, então um cliente que já
+    leu até `seq` N nunca recebe depois uma alteração com `seq` menor.
+    """
+    __tablename__ = "change_log"
+
+    # 64 bits: cresce um por registro alterado (cargas somam centenas de milhares)
+    seq = Column(BigInteger, primary_key=True, autoincrement=False)
+    entity = Column(String(10), nullable=False)  # asset ou owner
+    entity_id = Column(String(36), nullable=False)
+    operation = Column(String(10), nullable=False)  # create, update ou delete
+    changed_at = Column(DateTime, nullable=False, server_default=func.current_timestamp())
+
+    def __repr__(self):
+        return f"<ChangeLog(seq={self.seq}, entity={self.entity}, entity_id={self.entity_id}, operation={self.operation})>"
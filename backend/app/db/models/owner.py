@@ -1,6 +1,5 @@
-from sqlalchemy import Column, String
+from sqlalchemy import Column, Integer, String, UniqueConstraint
 from sqlalchemy.orm import relationship
-from sqlalchemy.dialects.postgresql import UUID
 import uuid
 from ..base import Base
 
@@ -8,11 +7,20 @@ from ..base import Base
 class Owner(Base):
     """Modelo de Responsável (Owner) no banco de dados"""
     __tablename__ = "owners"
+    __table_args__ = (
+        # Identificador no sistema de origem (sincronizações por upsert)
+        UniqueConstraint("source", "external_id", name="uq_owners_source_external_id"),
+    )
 
     id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     name = Column(String(140), nullable=False)
     email = Column(String(140), nullable=False, unique=True)
     phone = Column(String(20), nullable=False)
+    source = Column(String(60), nullable=True)
+    external_id = Column(String(140), nullable=True)
+    # Incrementada a cada alteração da linha (ETag); o UPDATE do ORM confere a
+    # versão lida, então duas escritas concorrentes não geram a mesma versão
+    version = Column(Integer, nullable=False, default=1, server_default="1")
 
     # Relacionamento com Assets (cascade delete)
     assets = relationship(
@@ -22,5 +30,7 @@ class Owner(Base):
         passive_deletes=True
     )
 
+    __mapper_args__ = {"version_id_col": version}
+
     def __repr__(self):
         return f"<Owner(id={self.id}, name={self.name}, email={self.email})>"
@@ -0,0 +1,19 @@
+from sqlalchemy import BigInteger, Column, String
+from ..base import Base
+
+
+class TableVersion(Base):
+    """
+    Contador de alterações por tabela (ETag das listagens).
+
+    Incrementado na mesma transação de cada escrita em assets/owners: enquanto
+    o contador não muda, qualquer página da listagem tem o mesmo conteúdo.
+    """
+    __tablename__ = "table_versions"
+
+    name = Column(String(60), primary_key=True)
+    # 64 bits: o contador change_log soma um por registro alterado
+    version = Column(BigInteger, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<TableVersion(name={self.name}, version={self.version})>"
@@ -1,5 +1,8 @@
 from typing import Generator
 from sqlalchemy.orm import Session
+
+from app.core.metrics import DB_POOL_WAIT
+from app.core.timing import span
 from .base import SessionLocal
 
 
@@ -7,9 +10,15 @@ def get_db() -> Generator[Session, None, None]:
     """
     Dependency para obter sessão do banco de dados.
     Garante que a sessão seja fechada após o uso.
+    
+    A conexão é retirada do pool já aqui, para medir a espera por ela
+    (métrica db_pool_wait_seconds, fase pool do Server-Timing) separada do
+    tempo das queries.
     """
     db = SessionLocal()
     try:
+        with DB_POOL_WAIT.time(), span("pool"):
+            db.connection()
         yield db
     finally:
         db.close()
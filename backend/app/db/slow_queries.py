@@ -0,0 +1,195 @@
+"""
+Log de queries lentas.
+
+Substitui o `echo=True` (que escrevia toda query no stdout, de forma síncrona):
+cada execução é apenas cronometrada (app.db.instrumentation) e só as que
+passam de `SLOW_QUERY_MS` são registradas, com:
+
+- o SQL (listas `IN (?, ?, ...)` colapsadas, para agrupar a mesma consulta)
+- o formato dos parâmetros (nomes e tipos, nunca os valores)
+- a rota que disparou a query
+- o plano de execução (`EXPLAIN QUERY PLAN` no SQLite, `EXPLAIN` no
+  PostgreSQL), capturado uma única vez por consulta
+
+As consultas ficam agregadas em memória (por processo) e são expostas em
+`GET /integrations/admin/slow-queries`.
+"""
+import logging
+import re
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Listas de placeholders: IN (?, ?, ?), IN (%(id_1)s, %(id_2)s), VALUES (...), (...)
+_PLACEHOLDER_LIST = re.compile(r"\((?:\s*(?:\?|%\(\w+\)s|:\w+)\s*,)+\s*(?:\?|%\(\w+\)s|:\w+)\s*\)")
+_REPEATED_LIST = re.compile(r"\(\?\.\.\.\)(?:\s*,\s*\(\?\.\.\.\))+")
+_WHITESPACE = re.compile(r"\s+")
+
+# Prefixo do comando que mostra o plano, por dialeto
+_EXPLAIN_PREFIX = {
+    "sqlite": "EXPLAIN QUERY PLAN ",
+    "postgresql": "EXPLAIN ",
+}
+
+
+@dataclass
+class SlowQuery:
+    """Agregado das execuções lentas de uma mesma consulta"""
+    statement: str
+    params_shape: str
+    route: Optional[str]
+    plan: Optional[List[str]]
+    count: int
+    total_ms: float
+    max_ms: float
+    last_seen: datetime
+
+    @property
+    def avg_ms(self) -> float:
+        return self.total_ms / self.count
+
+
+def normalize_statement(statement: str) -> str:
+    """SQL em uma linha, com listas de placeholders colapsadas em `(?...)`"""
+    statement = _WHITESPACE.sub(" ", statement).strip()
+    statement = _PLACEHOLDER_LIST.sub("(?...)", statement)
+    return _REPEATED_LIST.sub("(?...), ...", statement)
+
+
+def params_shape(parameters, executemany: bool = False) -> str:
+    """Descreve os parâmetros sem expor valores: `{name: str, limit: int}`"""
+    if executemany:
+        rows = list(parameters or [])
+        first = params_shape(rows[0]) if rows else "()"
+        return f"{len(rows)} x {first}"
+    if isinstance(parameters, dict):
+        items = ", ".join(f"{key}: {type(value).__name__}" for key, value in parameters.items())
+        return "{" + items + "}"
+    if parameters:
+        return "(" + ", ".join(type(value).__name__ for value in parameters) + ")"
+    return "()"
+
+
+def explain(cursor, dialect: str, statement: str, parameters) -> Optional[List[str]]:
+    """
+    Plano de execução de uma leitura, em um cursor novo da mesma conexão.
+    Escritas não são explicadas (o EXPLAIN não deve ter efeitos colaterais).
+    """
+    prefix = _EXPLAIN_PREFIX.get(dialect)
+    if prefix is None or not statement.lstrip().upper().startswith(("SELECT", "WITH")):
+        return None
+
+    explain_cursor = cursor.connection.cursor()
+    try:
+        explain_cursor.execute(prefix + statement, parameters)
+        # SQLite: (id, parent, notused, detail); PostgreSQL: (linha,)
+        return [str(row[-1]) for row in explain_cursor.fetchall()]
+    except Exception:
+        logger.debug("Falha ao obter o plano da query lenta", exc_info=True)
+        return None
+    finally:
+        explain_cursor.close()
+
+
+class SlowQueryLog:
+    """Registro, em memória e thread-safe, das consultas mais lentas"""
+
+    def __init__(self, threshold_ms: float, capacity: int, capture_plan: bool = True):
+        self.threshold_ms = threshold_ms
+        self.capacity = capacity
+        self.capture_plan = capture_plan
+        self._queries: Dict[str, SlowQuery] = {}
+        self._lock = threading.Lock()
+
+    def is_known(self, statement: str) -> bool:
+        """Indica se a consulta já foi registrada (e o plano já capturado)"""
+        return statement in self._queries
+
+    def record(
+        self,
+        statement: str,
+        duration_ms: float,
+        params_shape: str,
+        route: Optional[str] = None,
+        plan: Optional[List[str]] = None,
+    ) -> None:
+        """Agrega uma execução lenta de `statement` (SQL já normalizado)"""
+        now = datetime.now(timezone.utc)
+        with self._lock:
+            query = self._queries.get(statement)
+            if query is None:
+                query = SlowQuery(
+                    statement=statement,
+                    params_shape=params_shape,
+                    route=route,
+                    plan=plan,
+                    count=0,
+                    total_ms=0.0,
+                    max_ms=0.0,
+                    last_seen=now,
+                )
+                self._queries[statement] = query
+                self._evict()
+            query.count += 1
+            query.total_ms += duration_ms
+            query.last_seen = now
+            if duration_ms >= query.max_ms:
+                # Guarda o contexto da execução mais lenta
+                query.max_ms = duration_ms
+                query.params_shape = params_shape
+                query.route = route or query.route
+            if plan is not None:
+                query.plan = plan
+
+    def _evict(self) -> None:
+        """Mantém no máximo `capacity` consultas, descartando a menos lenta"""
+        while len(self._queries) > self.capacity:
+            fastest = min(self._queries.values(), key=lambda q: q.max_ms)
+            del self._queries[fastest.statement]
+
+    def top(self, limit: int = 20) -> List[SlowQuery]:
+        """As `limit` consultas com maior tempo máximo"""
+        with self._lock:
+            queries = sorted(self._queries.values(), key=lambda q: q.max_ms, reverse=True)
+        return queries[:limit]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._queries.clear()
+
+
+slow_query_log = SlowQueryLog(
+    threshold_ms=settings.SLOW_QUERY_MS,
+    capacity=settings.SLOW_QUERY_CAPACITY,
+    capture_plan=settings.SLOW_QUERY_EXPLAIN,
+)
+
+
+def record_if_slow(
+    log: SlowQueryLog, cursor, dialect: str, statement: str, parameters, executemany: bool,
+    duration_ms: float, route: Optional[str]
+) -> None:
+    """Registra a execução em `log` se ela passou do limite"""
+    if duration_ms < log.threshold_ms:
+        return
+
+    normalized = normalize_statement(statement)
+    plan = None
+    if log.capture_plan and not executemany and not log.is_known(normalized):
+        plan = explain(cursor, dialect, statement, parameters)
+
+    log.record(
+        normalized,
+        duration_ms,
+        params_shape(parameters, executemany),
+        route=route,
+        plan=plan,
+    )
+    logger.warning(
+        "Query lenta (%.1f ms) em %s: %s", duration_ms, route or "-", normalized[:500]
+    )
@@ -0,0 +1,106 @@
+"""
+Perfil de desempenho do SQLite e política de retry para escritas.
+
+O SQLite não guarda PRAGMAs no arquivo (exceto `journal_mode=WAL`), então o
+perfil é aplicado em cada conexão aberta pelo pool.
+"""
+import functools
+import time
+from typing import Callable, Dict, Optional, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm.exc import StaleDataError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+F = TypeVar("F", bound=Callable)
+
+# Mensagens do SQLite quando o lock não é obtido dentro do busy_timeout
+LOCKED_MESSAGES = ("database is locked", "database table is locked")
+
+
+def performance_pragmas() -> Dict[str, object]:
+    """
+    PRAGMAs do perfil de desempenho, lidos das configurações:
+
+    - journal_mode=WAL: leitores não bloqueiam o escritor (nem o contrário)
+    - synchronous=NORMAL: com WAL, fsync só no checkpoint; seguro contra
+      corrupção, podendo perder as últimas transações numa queda de energia
+    - busy_timeout: espera pelo lock em vez de falhar imediatamente
+    - cache_size: valor negativo = KiB de cache de páginas por conexão
+    - mmap_size: leitura via memória mapeada
+    - temp_store=MEMORY: tabelas e índices temporários em memória
+    """
+    return {
+        "journal_mode": settings.SQLITE_JOURNAL_MODE,
+        "synchronous": settings.SQLITE_SYNCHRONOUS,
+        "busy_timeout": settings.SQLITE_BUSY_TIMEOUT_MS,
+        "cache_size": -settings.SQLITE_CACHE_SIZE_KB,
+        "mmap_size": settings.SQLITE_MMAP_SIZE,
+        "temp_store": settings.SQLITE_TEMP_STORE,
+    }
+
+
+def apply_pragmas(dbapi_conn, pragmas: Dict[str, object]) -> None:
+    """Executa `PRAGMA nome=valor` na conexão DBAPI, sempre com foreign_keys=ON"""
+    cursor = dbapi_conn.cursor()
+    try:
+        # CRITICAL: foreign keys vêm desabilitadas por padrão no SQLite
+        cursor.execute("PRAGMA foreign_keys=ON")
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+def configure_sqlite(engine: Engine, pragmas: Optional[Dict[str, object]] = None) -> None:
+    """
+    Registra no `engine` o hook de conexão que aplica o perfil (por padrão o
+    de `performance_pragmas()`). Não faz nada para outros bancos.
+    """
+    if engine.dialect.name != "sqlite":
+        return
+    if pragmas is None:
+        pragmas = performance_pragmas()
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragma(dbapi_conn, connection_record):
+        apply_pragmas(dbapi_conn, pragmas)
+
+
+def is_locked_error(exc: OperationalError) -> bool:
+    """Indica se a falha foi lock do banco (e portanto pode ser repetida)"""
+    message = str(exc.orig).lower()
+    return any(locked in message for locked in LOCKED_MESSAGES)
+
+
+def retry_on_locked(func: F) -> F:
+    """
+    Repete uma operação de escrita que falhou com `database is locked`, ou
+    cujo registro foi alterado por outra transação entre a leitura e a escrita
+    (`StaleDataError`: a versão da linha não era mais a lida).
+
+    A função decorada recebe a sessão como primeiro argumento. A cada falha a
+    transação é desfeita e a operação inteira é repetida, sobre o estado
+    atual, após uma espera que dobra a cada tentativa
+    (`DB_WRITE_RETRY_DELAY`), até `DB_WRITE_RETRIES` vezes. Outros erros são
+    propagados sem retry.
+    """
+    @functools.wraps(func)
+    def wrapper(db: Session, *args, **kwargs):
+        attempt = 0
+        while True:
+            try:
+                return func(db, *args, **kwargs)
+            except (OperationalError, StaleDataError) as e:
+                retryable = isinstance(e, StaleDataError) or is_locked_error(e)
+                if attempt >= settings.DB_WRITE_RETRIES or not retryable:
+                    raise
+                db.rollback()
+                time.sleep(settings.DB_WRITE_RETRY_DELAY * 2 ** attempt)
+                attempt += 1
+
+    return wrapper
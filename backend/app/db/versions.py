@@ -0,0 +1,57 @@
+"""
+Contadores de alteração por tabela (ver `TableVersion`)
+"""
+from functools import lru_cache
+from typing import Dict, Union
+
+from sqlalchemy import TextClause, select, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.db.models.table_version import TableVersion
+
+
+@lru_cache(maxsize=None)
+def _bump_statement(count: int) -> TextClause:
+    """
+    Upsert de `count` contadores. O INSERT ... ON CONFLICT dos dialetos
+    (`insert_for`) não tem chave de cache no SQLAlchemy 2.0 e seria compilado
+    de novo a cada escrita (~1 ms); o texto é cacheável e a sintaxe é a mesma
+    no SQLite (3.35+) e no PostgreSQL.
+    """
+    values = ", ".join(f"(:name_{i}, :version_{i})" for i in range(count))
+    return text(
+        f"INSERT INTO {TableVersion.__tablename__} (name, version) VALUES {values} "
+        f"ON CONFLICT (name) DO UPDATE SET version = {TableVersion.__tablename__}.version + excluded.version "
+        "RETURNING name, version"
+    )
+
+
+def bump_table_versions(db: Union[Session, Connection], increments: Dict[str, int]) -> Dict[str, int]:
+    """
+    Soma `increments` aos contadores, em um único statement, na transação da
+    sessão (ou conexão), que precisa ser a mesma da escrita: o contador só
+    muda se ela for confirmada. Retorna os novos valores.
+
+    A linha de cada contador fica bloqueada até o commit, então transações que
+    incrementam o mesmo contador são confirmadas na ordem dos valores.
+    """
+    params = {}
+    # Sempre na mesma ordem: duas transações nunca esperam uma pela outra em
+    # ordens opostas (deadlock no PostgreSQL)
+    for i, name in enumerate(sorted(increments)):
+        params[f"name_{i}"] = name
+        params[f"version_{i}"] = increments[name]
+    rows = db.execute(_bump_statement(len(increments)), params)
+    return dict(rows.all())
+
+
+def bump_table_version(db: Union[Session, Connection], *tables: str) -> None:
+    """Incrementa em 1 o contador de cada tabela (ver `bump_table_versions`)"""
+    bump_table_versions(db, dict.fromkeys(tables, 1))
+
+
+def get_table_version(db: Session, table: str) -> int:
+    """Valor atual do contador (0 se a tabela nunca foi alterada)"""
+    version = db.execute(select(TableVersion.version).where(TableVersion.name == table)).scalar()
+    return version or 0
@@ -6,8 +6,15 @@ from pathlib import Path
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.v1 import api_router
-from app.db.base import engine, Base
-from app.db.models import Asset, Owner  # Importar modelos para criar tabelas
+from app.core.cache import entity_cache
+from app.core.change_feed import change_feed
+from app.core.config import settings
+from app.core.metrics import MetricsMiddleware, metrics_response
+from app.core.request_context import RequestContextMiddleware
+from app.core.security import RedactAccessTokenFilter
+from app.core.timing import ServerTimingMiddleware
+from app.db.base import engine
+from app.db.migrations import check_revision
 
 # Adicionar o diretório backend ao path
 backend_dir = Path(__file__).parent.parent
@@ -15,25 +22,31 @@ sys.path.insert(0, str(backend_dir))
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
+# O token de GET /changes/stream?access_token= não vai para o log de acesso
+logging.getLogger("uvicorn.access").addFilter(RedactAccessTokenFilter())
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup actions
     logging.info("Starting up...")
     
-    try:
-        # Criar todas as tabelas no banco de dados
-        logger.info("Creating database tables...")
-        Base.metadata.create_all(bind=engine)
-        logger.info("Database tables created successfully")
-        logger.info("Application started successfully")
+    # O schema é gerenciado pelo Alembic (alembic upgrade head); aqui só se
+    # confere a revisão, sem DDL. Um banco desatualizado impede a subida.
+    if settings.DB_CHECK_REVISION:
+        check_revision(engine)
+        logger.info("Database schema is up to date")
 
-    except Exception as e:
-        logger.error(f"Error during startup: {e}")
+    # Invalidações do cache de entidades vindas dos outros workers (REDIS_URL)
+    entity_cache.start()
+    # Leitura do change_log para GET /changes/stream
+    change_feed.start()
+    logger.info("Application started successfully")
 
     yield
     # Shutdown actions
     logging.info("Shutting down...")
+    await change_feed.stop()
+    entity_cache.stop()
 
 app = FastAPI(
     title="EyesOnAsset API",
@@ -54,8 +67,21 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Link", "X-Next-Cursor", "X-Total-Count", "Server-Timing"],
 )
 
+# Header Server-Timing (ligado por SERVER_TIMING_ENABLED)
+app.add_middleware(ServerTimingMiddleware)
+
+# Métricas por requisição (dentro do contexto da requisição, de onde vêm as
+# estatísticas de banco)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+# Contexto da requisição (rota, queries, fases) para métricas, Server-Timing e
+# log de queries lentas
+app.add_middleware(RequestContextMiddleware)
+
 # Incluir rotas da API v1
 app.include_router(api_router)
 
@@ -65,4 +91,11 @@ async def root():
         "message": "Welcome to the EyesOnAsset API",
         "version": "1.0.0",
         "docs": "/docs"
-    }
\ No newline at end of file
+    }
+
+
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        """Métricas no formato texto do Prometheus"""
+        return metrics_response()
@@ -1,20 +1,52 @@
 """
 Schemas package initialization
 """
-from .asset import AssetCreate, AssetUpdate, AssetResponse
-from .owner import OwnerCreate, OwnerUpdate, OwnerResponse
+from .asset import (
+    AssetCreate,
+    AssetBulkCreate,
+    AssetUpsert,
+    AssetUpdate,
+    AssetResponse,
+    AssetBatchGetResponse,
+)
+from .owner import (
+    OwnerCreate,
+    OwnerBulkCreate,
+    OwnerUpsert,
+    OwnerUpdate,
+    OwnerResponse,
+    OwnerBatchGetResponse,
+)
 from .user import UserCreate, UserUpdate, UserResponse, UserInDB
+from .admin import SlowQueryResponse
+from .bulk import BatchGetRequest, BulkItemResult, BulkResult, ImportResult, RowError, UpsertResult
+from .change import ChangeBatch, ChangeEntry
 
 __all__ = [
     "AssetCreate", 
+    "AssetBulkCreate",
+    "AssetUpsert",
     "AssetUpdate", 
     "AssetResponse",
+    "AssetBatchGetResponse",
     "OwnerCreate",
+    "OwnerBulkCreate",
+    "OwnerUpsert",
     "OwnerUpdate",
     "OwnerResponse",
+    "OwnerBatchGetResponse",
     "UserCreate",
     "UserUpdate",
     "UserResponse",
-    "UserInDB"
+    "UserInDB",
+    "BatchGetRequest",
+    "BulkItemResult",
+    "BulkResult",
+    "ImportResult",
+    "RowError",
+    "UpsertResult",
+    "ChangeBatch",
+    "ChangeEntry",
+    "SlowQueryResponse"
 ]
 
@@ -0,0 +1,21 @@
+"""
+Schemas das rotas administrativas
+"""
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class SlowQueryResponse(BaseModel):
+    """Schema de uma consulta do log de queries lentas"""
+    statement: str = Field(..., description="SQL normalizado")
+    params_shape: str = Field(..., description="Nomes e tipos dos parâmetros (sem valores)")
+    route: Optional[str] = Field(None, description="Rota da execução mais lenta")
+    plan: Optional[List[str]] = Field(None, description="Plano de execução (EXPLAIN)")
+    count: int = Field(..., description="Execuções acima do limite")
+    avg_ms: float = Field(..., description="Tempo médio dessas execuções (ms)")
+    max_ms: float = Field(..., description="Tempo da execução mais lenta (ms)")
+    last_seen: datetime = Field(..., description="Última execução lenta")
+
+    model_config = {"from_attributes": True}
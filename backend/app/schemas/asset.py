@@ -1,6 +1,8 @@
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
 from uuid import UUID
-from typing import Optional
+from typing import List, Optional
+
+from app.core.config import settings
 
 
 class AssetCreate(BaseModel):
@@ -37,6 +39,35 @@ class AssetCreate(BaseModel):
         }
 
 
+class AssetBulkCreate(BaseModel):
+    """Schema para criação de ativos em lote"""
+    items: List[AssetCreate] = Field(
+        ...,
+        min_length=1,
+        max_length=settings.BULK_MAX_ITEMS,
+        description="Ativos a criar"
+    )
+
+
+class AssetUpsert(AssetCreate):
+    """
+    Schema de uma linha de sincronização de ativo, identificada por external_id.
+    O responsável pode ser informado pelo ID (`owner`) ou pelo external_id do
+    responsável na mesma origem (`owner_external_id`).
+    """
+    external_id: str = Field(..., min_length=1, max_length=140, description="ID no sistema de origem")
+    owner: Optional[str] = Field(None, description="ID do responsável (UUID)")
+    owner_external_id: Optional[str] = Field(
+        None, min_length=1, max_length=140, description="external_id do responsável na mesma origem"
+    )
+
+    @model_validator(mode="after")
+    def validate_owner_reference(self) -> "AssetUpsert":
+        if (self.owner is None) == (self.owner_external_id is None):
+            raise ValueError("Informe exatamente um entre owner e owner_external_id")
+        return self
+
+
 class AssetUpdate(BaseModel):
     """Schema para atualização de ativo"""
     name: Optional[str] = Field(None, min_length=1, max_length=140, description="Nome do ativo")
@@ -72,7 +103,17 @@ class AssetResponse(BaseModel):
     name: str
     category: str
     owner: str
+    source: Optional[str] = None
+    external_id: Optional[str] = None
 
     class Config:
         from_attributes = True
 
+
+class AssetBatchGetResponse(BaseModel):
+    """Schema para resposta de busca em lote por IDs"""
+    items: Optional[List[AssetResponse]] = Field(
+        None, description="Registros encontrados, na ordem dos IDs (omitido com exists_only)"
+    )
+    found: List[str] = Field(..., description="IDs encontrados")
+    missing: List[str] = Field(..., description="IDs não encontrados")
@@ -0,0 +1,80 @@
+"""
+Schemas para respostas de operações em lote
+"""
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+from app.core.config import settings
+
+
+class BatchGetRequest(BaseModel):
+    """Schema para busca de vários registros por ID"""
+    ids: List[str] = Field(
+        ...,
+        min_length=1,
+        max_length=settings.BATCH_GET_MAX_IDS,
+        description="IDs a buscar"
+    )
+    exists_only: bool = Field(
+        False,
+        description="Apenas verifica a existência (não retorna os registros)"
+    )
+
+
+class BulkItemResult(BaseModel):
+    """Resultado de uma linha de uma operação em lote"""
+    index: int = Field(..., description="Posição da linha no payload (a partir de 0)")
+    id: Optional[str] = Field(None, description="ID do registro criado")
+    error: Optional[str] = Field(None, description="Motivo da rejeição da linha")
+
+
+class BulkResult(BaseModel):
+    """Resumo de uma operação em lote com o resultado de cada linha"""
+    created: int = Field(..., description="Quantidade de registros criados")
+    failed: int = Field(..., description="Quantidade de linhas rejeitadas")
+    results: List[BulkItemResult]
+
+
+class RowError(BaseModel):
+    """Linha rejeitada em uma operação em streaming"""
+    line: int = Field(..., description="Número da linha no corpo da requisição (a partir de 1)")
+    error: str = Field(..., description="Motivo da rejeição da linha")
+
+
+class StreamResult(BaseModel):
+    """Base dos resumos de operações em streaming, com as linhas rejeitadas"""
+    received: int = Field(0, description="Linhas recebidas")
+    failed: int = Field(0, description="Linhas rejeitadas")
+    errors: List[RowError] = Field(
+        default_factory=list,
+        description="Linhas rejeitadas (limitado a BULK_MAX_ERRORS)"
+    )
+
+    def add_error(self, line: int, error: str) -> None:
+        """Registra uma linha rejeitada"""
+        self.failed += 1
+        if len(self.errors) < settings.BULK_MAX_ERRORS:
+            self.errors.append(RowError(line=line, error=error))
+
+
+class UpsertResult(StreamResult):
+    """Resumo de uma sincronização (upsert) por external_id"""
+    inserted: int = Field(0, description="Registros novos")
+    updated: int = Field(0, description="Registros existentes que mudaram")
+    unchanged: int = Field(0, description="Registros existentes sem alteração (não regravados)")
+
+    def merge(self, other: "UpsertResult") -> None:
+        """Acumula o resultado de um bloco processado"""
+        self.received += other.received
+        self.inserted += other.inserted
+        self.updated += other.updated
+        self.unchanged += other.unchanged
+        self.failed += other.failed
+        room = settings.BULK_MAX_ERRORS - len(self.errors)
+        self.errors.extend(other.errors[:max(room, 0)])
+
+
+class ImportResult(StreamResult):
+    """Resumo de uma importação em streaming"""
+    created: int = Field(0, description="Registros criados")
+    chunks: int = Field(0, description="Blocos processados (um commit por bloco)")
@@ -0,0 +1,28 @@
+"""
+Schemas da sincronização incremental (change_log)
+"""
+from datetime import datetime
+from pydantic import BaseModel, Field
+from typing import List, Literal, Optional, Union
+
+from .asset import AssetResponse
+from .owner import OwnerResponse
+
+
+class ChangeEntry(BaseModel):
+    """Última alteração de um registro dentro do lote"""
+    seq: int = Field(..., description="Posição da alteração no change_log")
+    entity: Literal["asset", "owner"]
+    id: str = Field(..., description="ID do registro")
+    operation: Literal["create", "update", "delete"]
+    changed_at: datetime
+    data: Optional[Union[AssetResponse, OwnerResponse]] = Field(
+        None, description="Estado atual do registro (omitido nas remoções)"
+    )
+
+
+class ChangeBatch(BaseModel):
+    """Lote de alterações a partir de um `since`"""
+    changes: List[ChangeEntry]
+    next_since: int = Field(..., description="Valor de `since` para o próximo lote")
+    has_more: bool = Field(..., description="Há mais alterações depois de next_since")
@@ -1,5 +1,7 @@
 from pydantic import BaseModel, Field, EmailStr, field_validator
-from typing import Optional
+from typing import List, Optional
+
+from app.core.config import settings
 
 
 class OwnerCreate(BaseModel):
@@ -36,6 +38,21 @@ class OwnerCreate(BaseModel):
         }
 
 
+class OwnerBulkCreate(BaseModel):
+    """Schema para criação de responsáveis em lote"""
+    items: List[OwnerCreate] = Field(
+        ...,
+        min_length=1,
+        max_length=settings.BULK_MAX_ITEMS,
+        description="Responsáveis a criar"
+    )
+
+
+class OwnerUpsert(OwnerCreate):
+    """Schema de uma linha de sincronização de responsável, identificada por external_id"""
+    external_id: str = Field(..., min_length=1, max_length=140, description="ID no sistema de origem")
+
+
 class OwnerUpdate(BaseModel):
     """Schema para atualização de responsável"""
     name: Optional[str] = Field(None, min_length=1, max_length=140, description="Nome completo")
@@ -71,6 +88,17 @@ class OwnerResponse(BaseModel):
     name: str
     email: str
     phone: str
+    source: Optional[str] = None
+    external_id: Optional[str] = None
 
     class Config:
         from_attributes = True
+
+
+class OwnerBatchGetResponse(BaseModel):
+    """Schema para resposta de busca em lote por IDs"""
+    items: Optional[List[OwnerResponse]] = Field(
+        None, description="Registros encontrados, na ordem dos IDs (omitido com exists_only)"
+    )
+    found: List[str] = Field(..., description="IDs encontrados")
+    missing: List[str] = Field(..., description="IDs não encontrados")
@@ -1,13 +1,30 @@
+from sqlalchemy import func, insert, or_, select
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+import uuid
+from app.core.cache import CachedEntity, entity_cache
+from app.core.change_feed import change_feed
+from app.db.dialects import insert_for
 from app.db.models.asset import Asset
-from app.schemas.asset import AssetCreate, AssetUpdate
+from app.db.sqlite import retry_on_locked
+from app.db.change_log import Change, record_changes
+from app.db.versions import get_table_version
+from app.schemas.asset import AssetCreate, AssetResponse, AssetUpdate, AssetUpsert
+from app.schemas.bulk import BulkItemResult, BulkResult, UpsertResult
+from app.services.batching import IN_CLAUSE_CHUNK_SIZE, chunked, latest_by_external_id, new_ids
+from app.services.owner_service import OwnerService
+from app.core.timing import span, timed_methods
 
 
+@timed_methods("svc")
 class AssetService:
     """Serviço para operações CRUD de Assets"""
 
+    # Colunas (e ordem do CSV) das exportações
+    EXPORT_COLUMNS = ("id", "name", "category", "owner", "source", "external_id")
+
     @staticmethod
+    @retry_on_locked
     def create_asset(db: Session, asset_data: AssetCreate) -> Asset:
         """Cria um novo asset no banco de dados"""
         db_asset = Asset(
@@ -16,21 +33,264 @@ class AssetService:
             owner=asset_data.owner
         )
         db.add(db_asset)
+        db.flush()
+        record_changes(db, Change("asset", "create", [db_asset.id]))
         db.commit()
-        db.refresh(db_asset)
+        change_feed.notify()
+        # Pode haver uma entrada negativa (404) para o id
+        entity_cache.invalidate("asset", db_asset.id)
         return db_asset
 
+    @staticmethod
+    @retry_on_locked
+    def create_assets_bulk(db: Session, assets_data: List[AssetCreate]) -> BulkResult:
+        """
+        Cria vários assets em uma única transação.
+        Os owners referenciados são validados com uma query IN (...) e as linhas
+        válidas são inseridas de uma vez (executemany); linhas com owner
+        inexistente são rejeitadas individualmente, sem abortar o lote.
+        """
+        existing_owners = OwnerService.get_existing_ids(db, (a.owner for a in assets_data))
+
+        ids = iter(new_ids(len(assets_data)))
+        rows = []
+        results = []
+        for index, asset_data in enumerate(assets_data):
+            if asset_data.owner not in existing_owners:
+                results.append(BulkItemResult(
+                    index=index,
+                    error=f"Owner com ID {asset_data.owner} não encontrado"
+                ))
+                continue
+            asset_id = next(ids)
+            rows.append({
+                "id": asset_id,
+                "name": asset_data.name,
+                "category": asset_data.category,
+                "owner": asset_data.owner
+            })
+            results.append(BulkItemResult(index=index, id=asset_id))
+
+        if rows:
+            db.execute(insert(Asset.__table__), rows)
+            record_changes(db, Change("asset", "create", [row["id"] for row in rows]))
+            db.commit()
+            change_feed.notify()
+            entity_cache.invalidate("asset", *(row["id"] for row in rows))
+
+        return BulkResult(created=len(rows), failed=len(results) - len(rows), results=results)
+
+    @staticmethod
+    @retry_on_locked
+    def upsert_assets(
+        db: Session,
+        source: str,
+        rows: List[Tuple[int, AssetUpsert]]
+    ) -> UpsertResult:
+        """
+        Insere ou atualiza assets identificados por (source, external_id) com
+        um único INSERT ... ON CONFLICT DO UPDATE em uma transação.
+        Registros existentes só são regravados quando algum campo mudou.
+        
+        Args:
+            db: Sessão do banco de dados
+            source: Sistema de origem dos external_id (também usada para
+                resolver `owner_external_id`)
+            rows: Pares (número da linha, dados) - o número é usado nos erros
+        """
+        result = UpsertResult(received=len(rows))
+        rows = latest_by_external_id(rows, result)
+
+        owner_ids = OwnerService.get_existing_ids(
+            db, (item.owner for _, item in rows if item.owner is not None)
+        )
+        owners_by_external_id = OwnerService.get_ids_by_external_id(
+            db, source, (item.owner_external_id for _, item in rows if item.owner_external_id is not None)
+        )
+
+        values = []
+        for line, item in rows:
+            if item.owner_external_id is not None:
+                owner = owners_by_external_id.get(item.owner_external_id)
+                if owner is None:
+                    result.add_error(line, f"Owner com external_id {item.owner_external_id} não encontrado")
+                    continue
+            else:
+                owner = item.owner
+                if owner not in owner_ids:
+                    result.add_error(line, f"Owner com ID {owner} não encontrado")
+                    continue
+            values.append({
+                "id": str(uuid.uuid4()),
+                "name": item.name,
+                "category": item.category,
+                "owner": owner,
+                "source": source,
+                "external_id": item.external_id
+            })
+
+        if not values:
+            return result
+
+        existing = AssetService.get_ids_by_external_id(db, source, (v["external_id"] for v in values))
+        columns = ("name", "category", "owner")
+        stmt = insert_for(db, Asset.__table__)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["source", "external_id"],
+            set_={
+                **{column: stmt.excluded[column] for column in columns},
+                "version": Asset.__table__.c.version + 1,
+            },
+            where=or_(*(Asset.__table__.c[c].is_distinct_from(stmt.excluded[c]) for c in columns))
+        )
+        # Linhas inalteradas (WHERE do DO UPDATE falso) não retornam
+        written = db.execute(stmt.returning(Asset.__table__.c.id), values).scalars().all()
+        existing_ids = set(existing.values())
+        updated = [asset_id for asset_id in written if asset_id in existing_ids]
+        inserted = [asset_id for asset_id in written if asset_id not in existing_ids]
+        record_changes(db, Change("asset", "create", inserted), Change("asset", "update", updated))
+        db.commit()
+        change_feed.notify()
+        entity_cache.invalidate("asset", *written)
+
+        result.inserted = len(inserted)
+        result.updated = len(updated)
+        result.unchanged = len(existing) - result.updated
+        return result
+
+    @staticmethod
+    def get_ids_by_external_id(db: Session, source: str, external_ids: Iterable[str]) -> Dict[str, str]:
+        """Mapeia os external_id já existentes na origem para os IDs internos"""
+        ids = {}
+        for chunk in chunked(set(external_ids), IN_CLAUSE_CHUNK_SIZE):
+            query = db.query(Asset.id, Asset.external_id).filter(
+                Asset.source == source,
+                Asset.external_id.in_(chunk)
+            )
+            ids.update((row.external_id, row.id) for row in query)
+        return ids
+
+    @staticmethod
+    def get_asset_json(db: Session, asset_id: str) -> Optional[CachedEntity]:
+        """
+        Versão e JSON (AssetResponse) de um asset, servidos pelo cache de
+        entidades; None se o asset não existir.
+        """
+        def load() -> Optional[CachedEntity]:
+            db_asset = AssetService.get_asset(db, asset_id)
+            if db_asset is None:
+                return None
+            with span("serialize"):
+                body = AssetResponse.model_validate(db_asset).model_dump_json().encode()
+            return CachedEntity(db_asset.version, body)
+
+        return entity_cache.get_or_load("asset", asset_id, load)
+
+    @staticmethod
+    def get_asset_version(db: Session, asset_id: str) -> Optional[int]:
+        """
+        Versão atual de um asset (None se não existir), do cache ou de uma
+        consulta só à coluna, sem serializar nada
+        """
+        found, cached = entity_cache.peek("asset", asset_id)
+        if found:
+            return cached.version if cached is not None else None
+        return db.execute(select(Asset.version).where(Asset.id == asset_id)).scalar()
+
+    @staticmethod
+    def get_list_version(db: Session) -> int:
+        """Contador de alterações da tabela assets (ETag das listagens)"""
+        return get_table_version(db, "assets")
+
     @staticmethod
     def get_asset(db: Session, asset_id: str) -> Optional[Asset]:
         """Busca um asset por ID"""
         return db.query(Asset).filter(Asset.id == asset_id).first()
 
     @staticmethod
-    def get_assets(db: Session, skip: int = 0, limit: int = 100) -> List[Asset]:
-        """Lista todos os assets com paginação"""
-        return db.query(Asset).offset(skip).limit(limit).all()
+    def get_assets_by_ids(db: Session, asset_ids: Iterable[str]) -> List[Asset]:
+        """Busca vários assets por ID com uma query IN (...) por bloco de IDs"""
+        assets = []
+        for chunk in chunked(set(asset_ids), IN_CLAUSE_CHUNK_SIZE):
+            assets.extend(db.query(Asset).filter(Asset.id.in_(chunk)).all())
+        return assets
+
+    @staticmethod
+    def get_existing_ids(db: Session, asset_ids: Iterable[str]) -> Set[str]:
+        """
+        Retorna quais dos IDs informados existem. Lê apenas o índice da chave
+        primária, sem carregar as linhas.
+        """
+        existing = set()
+        for chunk in chunked(set(asset_ids), IN_CLAUSE_CHUNK_SIZE):
+            rows = db.query(Asset.id).filter(Asset.id.in_(chunk)).all()
+            existing.update(row.id for row in rows)
+        return existing
+
+    @staticmethod
+    def get_assets(
+        db: Session,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[str] = None,
+        owner: Optional[str] = None,
+        category: Optional[str] = None,
+        name: Optional[str] = None
+    ) -> List[Asset]:
+        """
+        Lista os assets ordenados por ID, com filtros opcionais combináveis
+        por owner, categoria (exatos) e prefixo do nome.
+        Com `after` a paginação é por keyset (id > after), que usa o índice da
+        chave primária e custa o mesmo em qualquer página; `skip` (offset) é
+        mantido por compatibilidade e ignorado quando `after` é informado.
+        """
+        query = db.query(Asset).order_by(Asset.id)
+        if owner is not None:
+            query = query.filter(Asset.owner == owner)
+        if category is not None:
+            query = query.filter(Asset.category == category)
+        if name:
+            # O intervalo [prefixo, prefixo + maior code point) permite ao banco
+            # percorrer ix_assets_name; o LIKE garante a semântica exata de prefixo
+            query = query.filter(
+                Asset.name >= name,
+                Asset.name < name + "\U0010ffff",
+                Asset.name.startswith(name, autoescape=True),
+            )
+        if after is not None:
+            query = query.filter(Asset.id > after)
+        elif skip:
+            query = query.offset(skip)
+        return query.limit(limit).all()
+
+    @staticmethod
+    def iter_assets_for_export(db: Session, batch_size: int = 1000) -> Iterator:
+        """
+        Percorre todos os assets (ordenados por ID) com um cursor no servidor:
+        as linhas são buscadas em blocos de `batch_size` (yield_per), sem
+        materializar objetos ORM, em uma única query e transação de leitura -
+        um snapshot consistente da tabela. Fecha a sessão ao terminar.
+        """
+        stmt = (
+            select(Asset.id, Asset.name, Asset.category, Asset.owner, Asset.source, Asset.external_id)
+            .order_by(Asset.id)
+            .execution_options(yield_per=batch_size)
+        )
+        try:
+            yield from db.execute(stmt)
+        finally:
+            db.close()
+
+    @staticmethod
+    def count_assets(db: Session, owner: Optional[str] = None) -> int:
+        """Conta os assets (de um owner, se informado, pelo índice de owner)"""
+        query = db.query(func.count(Asset.id))
+        if owner is not None:
+            query = query.filter(Asset.owner == owner)
+        return query.scalar()
 
     @staticmethod
+    @retry_on_locked
     def update_asset(db: Session, asset_id: str, asset_data: AssetUpdate) -> Optional[Asset]:
         """Atualiza um asset existente"""
         db_asset = db.query(Asset).filter(Asset.id == asset_id).first()
@@ -42,11 +302,17 @@ class AssetService:
         for field, value in update_data.items():
             setattr(db_asset, field, value)
 
+        if not db.is_modified(db_asset):
+            return db_asset
+        db.flush()
+        record_changes(db, Change("asset", "update", [asset_id]))
         db.commit()
-        db.refresh(db_asset)
+        change_feed.notify()
+        entity_cache.invalidate("asset", asset_id)
         return db_asset
 
     @staticmethod
+    @retry_on_locked
     def delete_asset(db: Session, asset_id: str) -> bool:
         """Deleta um asset"""
         db_asset = db.query(Asset).filter(Asset.id == asset_id).first()
@@ -54,5 +320,9 @@ class AssetService:
             return False
 
         db.delete(db_asset)
+        db.flush()
+        record_changes(db, Change("asset", "delete", [asset_id]))
         db.commit()
+        change_feed.notify()
+        entity_cache.invalidate("asset", asset_id)
         return True
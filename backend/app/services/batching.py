@@ -0,0 +1,52 @@
+"""
+Utilitários para operações em lote
+"""
+import os
+from itertools import islice
+from typing import Iterable, Iterator, List, Tuple, TypeVar
+
+from app.schemas.bulk import UpsertResult
+
+T = TypeVar("T")
+
+# Máximo de parâmetros por cláusula IN (...). Mantém cada query bem abaixo do
+# limite de variáveis do SQLite (999 em builds antigas) e com planos estáveis.
+IN_CLAUSE_CHUNK_SIZE = 500
+
+
+def chunked(items: Iterable[T], size: int) -> Iterator[List[T]]:
+    """Divide `items` em listas de no máximo `size` elementos"""
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def new_ids(count: int) -> List[str]:
+    """
+    Gera `count` UUIDs v4 no formato textual de `str(uuid.uuid4())` a partir de
+    uma única leitura de os.urandom: ~4x mais rápido que um uuid4() por linha,
+    o que pesa em lotes de 10.000 registros.
+    """
+    raw = os.urandom(16 * count).hex()
+    ids = []
+    for start in range(0, 32 * count, 32):
+        h = raw[start:start + 32]
+        # Versão 4 no 13º dígito e variante RFC 4122 (8, 9, a ou b) no 17º
+        ids.append(f"{h[:8]}-{h[8:12]}-4{h[13:16]}-{'89ab'[int(h[16], 16) & 3]}{h[17:20]}-{h[20:]}")
+    return ids
+
+
+def latest_by_external_id(rows: List[Tuple[int, T]], result: UpsertResult) -> List[Tuple[int, T]]:
+    """
+    Mantém apenas a última linha de cada external_id do bloco (a mais recente
+    prevalece, como em reenvios sucessivos) e registra as substituídas como erro
+    em `result`. Um mesmo registro não pode ser alvo de dois ON CONFLICT no
+    mesmo INSERT.
+    """
+    latest = {}
+    for line, item in rows:
+        previous = latest.get(item.external_id)
+        if previous is not None:
+            result.add_error(previous[0], f"external_id repetido; substituído pela linha {line}")
+        latest[item.external_id] = (line, item)
+    return list(latest.values())
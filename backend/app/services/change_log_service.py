@@ -0,0 +1,71 @@
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from typing import Dict, Tuple
+
+from app.db.models.change_log import ChangeLog
+from app.schemas.asset import AssetResponse
+from app.schemas.change import ChangeBatch, ChangeEntry
+from app.schemas.owner import OwnerResponse
+from app.services.asset_service import AssetService
+from app.services.owner_service import OwnerService
+from app.core.timing import span, timed_methods
+
+
+@timed_methods("svc")
+class ChangeLogService:
+    """Serviço de leitura do change_log (sincronização incremental)"""
+
+    @staticmethod
+    def get_changes(db: Session, since: int, limit: int) -> ChangeBatch:
+        """
+        Alterações com `seq` > `since`, até `limit` entradas do change_log.
+
+        Cada registro aparece uma vez por lote, com a sua última alteração e o
+        estado atual (uma consulta IN (...) por entidade, não por entrada).
+        Um registro que não existe mais vira uma remoção, mesmo que a remoção
+        só venha em um lote seguinte: o cliente aplica cada entrada como
+        upsert/remoção e converge para o estado atual.
+        """
+        rows = db.execute(
+            select(ChangeLog).where(ChangeLog.seq > since).order_by(ChangeLog.seq).limit(limit + 1)
+        ).scalars().all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        latest: Dict[Tuple[str, str], ChangeLog] = {}
+        for row in rows:
+            latest.pop((row.entity, row.entity_id), None)
+            latest[(row.entity, row.entity_id)] = row
+
+        wanted = {"asset": set(), "owner": set()}
+        for (entity, entity_id), row in latest.items():
+            if row.operation != "delete":
+                wanted[entity].add(entity_id)
+        current = {}
+        if wanted["asset"]:
+            for asset in AssetService.get_assets_by_ids(db, wanted["asset"]):
+                current[("asset", asset.id)] = asset
+        if wanted["owner"]:
+            for owner in OwnerService.get_owners_by_ids(db, wanted["owner"]):
+                current[("owner", owner.id)] = owner
+
+        with span("serialize"):
+            changes = []
+            schemas = {"asset": AssetResponse, "owner": OwnerResponse}
+            # `latest` mantém a ordem da última alteração de cada registro
+            for key, row in latest.items():
+                obj = current.get(key)
+                changes.append(ChangeEntry(
+                    seq=row.seq,
+                    entity=row.entity,
+                    id=row.entity_id,
+                    operation=row.operation if obj is not None else "delete",
+                    changed_at=row.changed_at,
+                    data=schemas[row.entity].model_validate(obj) if obj is not None else None
+                ))
+
+        return ChangeBatch(
+            changes=changes,
+            next_since=rows[-1].seq if rows else since,
+            has_more=has_more
+        )
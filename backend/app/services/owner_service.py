@@ -1,14 +1,31 @@
+from sqlalchemy import insert, or_, select
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
-from typing import List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+import uuid
+from app.core.cache import CachedEntity, entity_cache
+from app.core.change_feed import change_feed
+from app.db.dialects import insert_for
+from app.db.models.asset import Asset
 from app.db.models.owner import Owner
-from app.schemas.owner import OwnerCreate, OwnerUpdate
+from app.db.sqlite import retry_on_locked
+from app.db.change_log import Change, record_changes
+from app.db.versions import get_table_version
+from app.schemas.owner import OwnerCreate, OwnerResponse, OwnerUpdate, OwnerUpsert
+from app.schemas.bulk import BulkItemResult, BulkResult, UpsertResult
+from app.services.batching import IN_CLAUSE_CHUNK_SIZE, chunked, latest_by_external_id, new_ids
+from app.core.timing import span, timed_methods
 
 
+@timed_methods("svc")
 class OwnerService:
     """Serviço para operações CRUD de Owners"""
 
+    # Colunas (e ordem do CSV) das exportações
+    EXPORT_COLUMNS = ("id", "name", "email", "phone", "source", "external_id")
+
     @staticmethod
+    @retry_on_locked
     def create_owner(db: Session, owner_data: OwnerCreate) -> Owner:
         """Cria um novo owner no banco de dados"""
         db_owner = Owner(
@@ -18,12 +35,179 @@ class OwnerService:
         )
         db.add(db_owner)
         try:
+            db.flush()
+            record_changes(db, Change("owner", "create", [db_owner.id]))
             db.commit()
-            db.refresh(db_owner)
-            return db_owner
+            change_feed.notify()
+        except IntegrityError:
+            db.rollback()
+            raise ValueError("Email já cadastrado")
+        # Pode haver uma entrada negativa (404) para o id
+        entity_cache.invalidate("owner", db_owner.id)
+        return db_owner
+
+    @staticmethod
+    @retry_on_locked
+    def create_owners_bulk(db: Session, owners_data: List[OwnerCreate]) -> BulkResult:
+        """
+        Cria vários owners em uma única transação.
+        Os emails do lote são comparados com os já cadastrados em uma query
+        IN (...) (atendida pelo índice único de owners.email) e entre si; as
+        linhas em conflito são rejeitadas individualmente e as demais inseridas
+        de uma vez (executemany).
+        """
+        existing_emails = OwnerService.get_existing_emails(db, (o.email for o in owners_data))
+
+        rows = []
+        results = []
+        seen_emails = set()
+        ids = iter(new_ids(len(owners_data)))
+        for index, owner_data in enumerate(owners_data):
+            if owner_data.email in existing_emails:
+                results.append(BulkItemResult(index=index, error="Email já cadastrado"))
+                continue
+            if owner_data.email in seen_emails:
+                results.append(BulkItemResult(index=index, error="Email duplicado no lote"))
+                continue
+            seen_emails.add(owner_data.email)
+            owner_id = next(ids)
+            rows.append({
+                "id": owner_id,
+                "name": owner_data.name,
+                "email": owner_data.email,
+                "phone": owner_data.phone
+            })
+            results.append(BulkItemResult(index=index, id=owner_id))
+
+        if rows:
+            try:
+                db.execute(insert(Owner.__table__), rows)
+                record_changes(db, Change("owner", "create", [row["id"] for row in rows]))
+                db.commit()
+                change_feed.notify()
+            except IntegrityError:
+                # Um email foi cadastrado por outra requisição após a verificação
+                db.rollback()
+                raise ValueError("Email já cadastrado")
+            entity_cache.invalidate("owner", *(row["id"] for row in rows))
+
+        return BulkResult(created=len(rows), failed=len(results) - len(rows), results=results)
+
+    @staticmethod
+    @retry_on_locked
+    def upsert_owners(
+        db: Session,
+        source: str,
+        rows: List[Tuple[int, OwnerUpsert]]
+    ) -> UpsertResult:
+        """
+        Insere ou atualiza owners identificados por (source, external_id) com
+        um único INSERT ... ON CONFLICT DO UPDATE em uma transação.
+        Registros existentes só são regravados quando algum campo mudou.
+        
+        Args:
+            db: Sessão do banco de dados
+            source: Sistema de origem dos external_id
+            rows: Pares (número da linha, dados) - o número é usado nos erros
+        
+        Raises:
+            ValueError: Se um email conflitar dentro do próprio bloco de forma
+                que só o banco consiga detectar (ex.: troca de emails)
+        """
+        result = UpsertResult(received=len(rows))
+        rows = latest_by_external_id(rows, result)
+
+        emails = {item.email for _, item in rows}
+        owners_by_email = {}
+        for chunk in chunked(emails, IN_CLAUSE_CHUNK_SIZE):
+            query = db.query(Owner.email, Owner.source, Owner.external_id)
+            for row in query.filter(Owner.email.in_(chunk)):
+                owners_by_email[row.email] = (row.source, row.external_id)
+
+        values = []
+        seen_emails = set()
+        for line, item in rows:
+            current = owners_by_email.get(item.email)
+            if current is not None and current != (source, item.external_id):
+                result.add_error(line, "Email já cadastrado")
+                continue
+            if item.email in seen_emails:
+                result.add_error(line, "Email duplicado no lote")
+                continue
+            seen_emails.add(item.email)
+            values.append({
+                "id": str(uuid.uuid4()),
+                "name": item.name,
+                "email": item.email,
+                "phone": item.phone,
+                "source": source,
+                "external_id": item.external_id
+            })
+
+        if not values:
+            return result
+
+        existing = OwnerService.get_ids_by_external_id(db, source, (v["external_id"] for v in values))
+        columns = ("name", "email", "phone")
+        stmt = insert_for(db, Owner.__table__)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["source", "external_id"],
+            set_={
+                **{column: stmt.excluded[column] for column in columns},
+                "version": Owner.__table__.c.version + 1,
+            },
+            where=or_(*(Owner.__table__.c[c].is_distinct_from(stmt.excluded[c]) for c in columns))
+        )
+        existing_ids = set(existing.values())
+        try:
+            # Linhas inalteradas (WHERE do DO UPDATE falso) não retornam
+            written = db.execute(stmt.returning(Owner.__table__.c.id), values).scalars().all()
+            updated = [owner_id for owner_id in written if owner_id in existing_ids]
+            inserted = [owner_id for owner_id in written if owner_id not in existing_ids]
+            record_changes(db, Change("owner", "create", inserted), Change("owner", "update", updated))
+            db.commit()
+            change_feed.notify()
         except IntegrityError:
             db.rollback()
             raise ValueError("Email já cadastrado")
+        entity_cache.invalidate("owner", *written)
+
+        result.inserted = len(inserted)
+        result.updated = len(updated)
+        result.unchanged = len(existing) - result.updated
+        return result
+
+    @staticmethod
+    def get_owner_json(db: Session, owner_id: str) -> Optional[CachedEntity]:
+        """
+        Versão e JSON (OwnerResponse) de um owner, servidos pelo cache de
+        entidades; None se o owner não existir.
+        """
+        def load() -> Optional[CachedEntity]:
+            db_owner = OwnerService.get_owner(db, owner_id)
+            if db_owner is None:
+                return None
+            with span("serialize"):
+                body = OwnerResponse.model_validate(db_owner).model_dump_json().encode()
+            return CachedEntity(db_owner.version, body)
+
+        return entity_cache.get_or_load("owner", owner_id, load)
+
+    @staticmethod
+    def get_owner_version(db: Session, owner_id: str) -> Optional[int]:
+        """
+        Versão atual de um owner (None se não existir), do cache ou de uma
+        consulta só à coluna, sem serializar nada
+        """
+        found, cached = entity_cache.peek("owner", owner_id)
+        if found:
+            return cached.version if cached is not None else None
+        return db.execute(select(Owner.version).where(Owner.id == owner_id)).scalar()
+
+    @staticmethod
+    def get_list_version(db: Session) -> int:
+        """Contador de alterações da tabela owners (ETag das listagens)"""
+        return get_table_version(db, "owners")
 
     @staticmethod
     def get_owner(db: Session, owner_id: str) -> Optional[Owner]:
@@ -31,11 +215,87 @@ class OwnerService:
         return db.query(Owner).filter(Owner.id == owner_id).first()
 
     @staticmethod
-    def get_owners(db: Session, skip: int = 0, limit: int = 100) -> List[Owner]:
-        """Lista todos os owners com paginação"""
-        return db.query(Owner).offset(skip).limit(limit).all()
+    def get_owners_by_ids(db: Session, owner_ids: Iterable[str]) -> List[Owner]:
+        """Busca vários owners por ID com uma query IN (...) por bloco de IDs"""
+        owners = []
+        for chunk in chunked(set(owner_ids), IN_CLAUSE_CHUNK_SIZE):
+            owners.extend(db.query(Owner).filter(Owner.id.in_(chunk)).all())
+        return owners
+
+    @staticmethod
+    def get_existing_ids(db: Session, owner_ids: Iterable[str]) -> Set[str]:
+        """
+        Retorna quais dos IDs informados existem, com uma query IN (...) por
+        bloco de IDs em vez de uma busca por ID. Lê apenas o índice da chave
+        primária, sem carregar as linhas.
+        """
+        existing = set()
+        for chunk in chunked(set(owner_ids), IN_CLAUSE_CHUNK_SIZE):
+            rows = db.query(Owner.id).filter(Owner.id.in_(chunk)).all()
+            existing.update(row.id for row in rows)
+        return existing
+
+    @staticmethod
+    def get_ids_by_external_id(db: Session, source: str, external_ids: Iterable[str]) -> Dict[str, str]:
+        """Mapeia external_id -> ID dos owners da origem informada"""
+        ids = {}
+        for chunk in chunked(set(external_ids), IN_CLAUSE_CHUNK_SIZE):
+            query = db.query(Owner.external_id, Owner.id).filter(
+                Owner.source == source,
+                Owner.external_id.in_(chunk)
+            )
+            ids.update((row.external_id, row.id) for row in query)
+        return ids
+
+    @staticmethod
+    def get_existing_emails(db: Session, emails: Iterable[str]) -> Set[str]:
+        """Retorna quais dos emails informados já estão cadastrados"""
+        existing = set()
+        for chunk in chunked(set(emails), IN_CLAUSE_CHUNK_SIZE):
+            rows = db.query(Owner.email).filter(Owner.email.in_(chunk)).all()
+            existing.update(row.email for row in rows)
+        return existing
 
     @staticmethod
+    def get_owners(
+        db: Session,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[str] = None
+    ) -> List[Owner]:
+        """
+        Lista os owners ordenados por ID.
+        Com `after` a paginação é por keyset (id > after), que usa o índice da
+        chave primária e custa o mesmo em qualquer página; `skip` (offset) é
+        mantido por compatibilidade e ignorado quando `after` é informado.
+        """
+        query = db.query(Owner).order_by(Owner.id)
+        if after is not None:
+            query = query.filter(Owner.id > after)
+        elif skip:
+            query = query.offset(skip)
+        return query.limit(limit).all()
+
+    @staticmethod
+    def iter_owners_for_export(db: Session, batch_size: int = 1000) -> Iterator:
+        """
+        Percorre todos os owners (ordenados por ID) com um cursor no servidor:
+        as linhas são buscadas em blocos de `batch_size` (yield_per), sem
+        materializar objetos ORM, em uma única query e transação de leitura -
+        um snapshot consistente da tabela. Fecha a sessão ao terminar.
+        """
+        stmt = (
+            select(Owner.id, Owner.name, Owner.email, Owner.phone, Owner.source, Owner.external_id)
+            .order_by(Owner.id)
+            .execution_options(yield_per=batch_size)
+        )
+        try:
+            yield from db.execute(stmt)
+        finally:
+            db.close()
+
+    @staticmethod
+    @retry_on_locked
     def update_owner(db: Session, owner_id: str, owner_data: OwnerUpdate) -> Optional[Owner]:
         """Atualiza um owner existente"""
         db_owner = db.query(Owner).filter(Owner.id == owner_id).first()
@@ -47,24 +307,41 @@ class OwnerService:
         for field, value in update_data.items():
             setattr(db_owner, field, value)
 
+        if not db.is_modified(db_owner):
+            return db_owner
         try:
+            db.flush()
+            record_changes(db, Change("owner", "update", [owner_id]))
             db.commit()
-            db.refresh(db_owner)
-            return db_owner
+            change_feed.notify()
         except IntegrityError:
             db.rollback()
             raise ValueError("Email já cadastrado")
+        entity_cache.invalidate("owner", owner_id)
+        return db_owner
 
     @staticmethod
+    @retry_on_locked
     def delete_owner(db: Session, owner_id: str) -> bool:
         """
         Deleta um owner e seus assets relacionados (cascade delete).
         Retorna True se deletado com sucesso, False se não encontrado.
+        
+        Os assets são removidos pelo banco (ON DELETE CASCADE); seus IDs são
+        lidos antes, na mesma transação, para registrar as remoções no
+        change_log e invalidá-los no cache.
         """
         db_owner = db.query(Owner).filter(Owner.id == owner_id).first()
         if not db_owner:
             return False
 
+        asset_ids = [row.id for row in db.query(Asset.id).filter(Asset.owner == owner_id)]
         db.delete(db_owner)
+        db.flush()
+        record_changes(db, Change("owner", "delete", [owner_id]), Change("asset", "delete", asset_ids))
         db.commit()
+        change_feed.notify()
+        entity_cache.invalidate("owner", owner_id)
+        entity_cache.invalidate("asset", *asset_ids)
         return True
+
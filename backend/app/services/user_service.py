@@ -5,14 +5,18 @@ from sqlalchemy.orm import Session
 from typing import Optional
 
 from app.db.models.user import User
+from app.db.sqlite import retry_on_locked
 from app.schemas.user import UserCreate, UserUpdate
 from app.core.security import get_password_hash, verify_password
+from app.core.timing import timed_methods
 
 
+@timed_methods("svc")
 class UserService:
     """Serviço para operações de negócio relacionadas a User"""
     
     @staticmethod
+    @retry_on_locked
     def create_user(db: Session, user: UserCreate) -> User:
         """
         Cria um novo usuário no banco de dados.
@@ -43,7 +47,6 @@ class UserService:
         
         db.add(db_user)
         db.commit()
-        db.refresh(db_user)
         
         return db_user
     
@@ -99,21 +102,33 @@ class UserService:
         return db.query(User).filter(User.username == username).first()
     
     @staticmethod
-    def get_users(db: Session, skip: int = 0, limit: int = 100) -> list[User]:
+    def get_users(
+        db: Session,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[str] = None
+    ) -> list[User]:
         """
-        Lista todos os usuários com paginação.
+        Lista os usuários ordenados por ID, com paginação.
         
         Args:
             db: Sessão do banco de dados
-            skip: Número de registros a pular
+            skip: Número de registros a pular (ignorado se `after` for informado)
             limit: Número máximo de registros a retornar
+            after: ID do último usuário da página anterior (paginação por keyset)
             
         Returns:
             Lista de usuários
         """
-        return db.query(User).offset(skip).limit(limit).all()
+        query = db.query(User).order_by(User.id)
+        if after is not None:
+            query = query.filter(User.id > after)
+        elif skip:
+            query = query.offset(skip)
+        return query.limit(limit).all()
     
     @staticmethod
+    @retry_on_locked
     def update_user(db: Session, user_id: str, user_update: UserUpdate) -> Optional[User]:
         """
         Atualiza um usuário existente.
@@ -146,11 +161,11 @@ class UserService:
             db_user.hashed_password = get_password_hash(user_update.password)
         
         db.commit()
-        db.refresh(db_user)
         
         return db_user
     
     @staticmethod
+    @retry_on_locked
     def delete_user(db: Session, user_id: str) -> bool:
         """
         Deleta um usuário.
@@ -0,0 +1,61 @@
+"""
+Benchmark de criação em lote: ativos/segundo via POST /integrations/assets/bulk.
+
+Uso:
+    python -m benchmarks.bulk [--rows 50000] [--batch 10000]
+"""
+import argparse
+import asyncio
+import time
+
+from app.schemas.owner import OwnerCreate
+from app.services.owner_service import OwnerService
+
+from .common import asgi_client, login, override_database, temporary_database
+
+
+async def main_async(args) -> None:
+    with temporary_database() as session_factory, override_database(session_factory):
+        db = session_factory()
+        try:
+            owner_ids = [
+                OwnerService.create_owner(
+                    db, OwnerCreate(name=f"Owner {i}", email=f"owner{i}@empresa.com", phone="0")
+                ).id
+                for i in range(10)
+            ]
+        finally:
+            db.close()
+
+        async with asgi_client() as client:
+            headers = await login(client)
+            start = time.perf_counter()
+            created = 0
+            for offset in range(0, args.rows, args.batch):
+                items = [
+                    {
+                        "name": f"Asset {i}",
+                        "category": "Bench",
+                        "owner": owner_ids[i % len(owner_ids)]
+                    }
+                    for i in range(offset, min(offset + args.batch, args.rows))
+                ]
+                response = await client.post(
+                    "/integrations/assets/bulk", json={"items": items}, headers=headers
+                )
+                response.raise_for_status()
+                created += response.json()["created"]
+            elapsed = time.perf_counter() - start
+
+    print(f"{created} ativos em {elapsed:.2f}s ({created / elapsed:,.0f} ativos/s, lotes de {args.batch})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=50000, help="Total de ativos")
+    parser.add_argument("--batch", type=int, default=10000, help="Ativos por requisição")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
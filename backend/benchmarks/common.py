@@ -0,0 +1,106 @@
+"""
+Infraestrutura compartilhada pelos benchmarks.
+
+Os benchmarks rodam contra um banco SQLite temporário em arquivo (nunca contra
+o banco da aplicação) e acessam a API em processo via ASGI, sem rede.
+"""
+import logging
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+import httpx
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.main import app
+from app.db.base import Base
+from app.db.sessions import get_db
+from app.db.sqlite import configure_sqlite
+from app.schemas.user import UserCreate
+from app.services.user_service import UserService
+
+
+# O httpx registra cada requisição em INFO, o que distorce as medições
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+BENCH_USERNAME = "benchmark"
+BENCH_PASSWORD = "benchmark"
+
+
+@contextmanager
+def temporary_database(pragmas: Optional[Dict[str, object]] = None) -> Iterator[sessionmaker]:
+    """
+    Cria um banco SQLite temporário com todas as tabelas e retorna a
+    fábrica de sessões ligada a ele. O arquivo é removido ao final.
+
+    As conexões recebem o perfil de `pragmas` (por padrão o mesmo da aplicação).
+    """
+    with tempfile.TemporaryDirectory() as tmpdir:
+        engine = create_engine(
+            f"sqlite:///{os.path.join(tmpdir, 'bench.db')}",
+            connect_args={"check_same_thread": False},
+        )
+        configure_sqlite(engine, pragmas)
+        Base.metadata.create_all(bind=engine)
+        session_factory = sessionmaker(
+            autocommit=False, autoflush=False, expire_on_commit=False, bind=engine
+        )
+
+        db = session_factory()
+        try:
+            UserService.create_user(
+                db, UserCreate(username=BENCH_USERNAME, password=BENCH_PASSWORD)
+            )
+        finally:
+            db.close()
+
+        try:
+            yield session_factory
+        finally:
+            engine.dispose()
+
+
+@contextmanager
+def override_database(session_factory: sessionmaker) -> Iterator[None]:
+    """Faz a aplicação usar `session_factory` no lugar de `get_db`"""
+    def _get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = _get_db
+    try:
+        yield
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+
+
+def asgi_client() -> httpx.AsyncClient:
+    """Cliente HTTP assíncrono que chama a aplicação diretamente via ASGI"""
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app),
+        base_url="http://benchmark",
+    )
+
+
+async def login(client: httpx.AsyncClient) -> dict:
+    """Autentica o usuário de benchmark e retorna os headers com o token"""
+    response = await client.post(
+        "/integrations/login",
+        data={"username": BENCH_USERNAME, "password": BENCH_PASSWORD},
+    )
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def percentile(samples: list, pct: float) -> float:
+    """Percentil (0-100) por nearest-rank de uma lista de amostras"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[rank]
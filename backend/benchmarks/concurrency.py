@@ -0,0 +1,115 @@
+"""
+Benchmark de concorrência: vazão da API conforme o número de requisições
+simultâneas.
+
+Cada nível de concorrência dispara o mesmo total de requisições
+(GET /integrations/asset/{id} e GET /integrations/assets) e mede vazão e
+latências. Com as rotas rodando no threadpool, a vazão deve crescer com o
+número de requisições em voo em vez de ficar travada na de uma única conexão.
+
+Uso:
+    python -m benchmarks.concurrency [--requests 2000] [--levels 1,2,4,8,16,32]
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from app.schemas.asset import AssetCreate
+from app.schemas.owner import OwnerCreate
+from app.services.asset_service import AssetService
+from app.services.owner_service import OwnerService
+
+from .common import asgi_client, login, override_database, percentile, temporary_database
+
+
+def seed(session_factory, assets: int) -> list:
+    """Cria um owner com `assets` ativos e retorna os IDs dos ativos"""
+    db = session_factory()
+    try:
+        owner = OwnerService.create_owner(
+            db, OwnerCreate(name="Benchmark", email="bench@empresa.com", phone="0")
+        )
+        return [
+            AssetService.create_asset(
+                db, AssetCreate(name=f"Asset {i}", category="Bench", owner=owner.id)
+            ).id
+            for i in range(assets)
+        ]
+    finally:
+        db.close()
+
+
+async def run_level(client, headers: dict, asset_ids: list, concurrency: int, total: int) -> dict:
+    """Executa `total` requisições com no máximo `concurrency` em voo"""
+    latencies = []
+    errors = 0
+    counter = iter(range(total))
+
+    async def worker():
+        nonlocal errors
+        for i in counter:
+            if i % 2:
+                url = f"/integrations/asset/{asset_ids[i % len(asset_ids)]}"
+            else:
+                url = "/integrations/assets?limit=20"
+            start = time.perf_counter()
+            response = await client.get(url, headers=headers)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code != 200:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "concurrency": concurrency,
+        "requests": total,
+        "errors": errors,
+        "throughput_rps": round(total / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+    }
+
+
+async def main_async(args) -> list:
+    levels = [int(level) for level in args.levels.split(",")]
+    results = []
+
+    with temporary_database() as session_factory, override_database(session_factory):
+        asset_ids = seed(session_factory, args.assets)
+        async with asgi_client() as client:
+            headers = await login(client)
+            # Aquecimento (imports preguiçosos, caches do SQLite)
+            await run_level(client, headers, asset_ids, 4, 100)
+            for level in levels:
+                results.append(await run_level(client, headers, asset_ids, level, args.requests))
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000, help="Requisições por nível")
+    parser.add_argument("--levels", default="1,2,4,8,16,32", help="Níveis de concorrência")
+    parser.add_argument("--assets", type=int, default=500, help="Ativos criados no banco")
+    parser.add_argument("--json", dest="json_path", help="Grava os resultados em JSON")
+    args = parser.parse_args()
+
+    results = asyncio.run(main_async(args))
+
+    print(f"{'conc':>5} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'erros':>6}")
+    for r in results:
+        print(
+            f"{r['concurrency']:>5} {r['throughput_rps']:>9} "
+            f"{r['p50_ms']:>8} {r['p99_ms']:>8} {r['errors']:>6}"
+        )
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
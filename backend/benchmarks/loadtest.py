@@ -0,0 +1,367 @@
+"""
+Teste de carga HTTP contra o processo real do uvicorn.
+
+Sobe `app.main:app` em localhost (com `--workers` processos) sobre um banco
+SQLite temporário migrado (`alembic upgrade head`) e populado pelo gerador de
+dados sintéticos, faz login uma vez e, para cada nível de concorrência,
+repete por `--duration` segundos uma mistura ponderada de cenários:
+listar/buscar/criar/atualizar/remover ativos e responsáveis, além de rajadas
+de login (bcrypt). Com `--url` o alvo é um servidor já em execução, e nada é
+criado além dos registros dos próprios cenários.
+
+O relatório traz, por nível e por rota (template), vazão, p50/p95/p99 e taxa
+de erros, impresso como tabela e gravado em JSON com `--output`.
+
+Uso:
+    python -m benchmarks.loadtest [--levels 1,8,32] [--duration 10] [--workers 1]
+        [--assets 10000] [--mix get_asset=30,login_burst=0] [--output carga.json]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+import httpx
+from alembic import command
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.dataset import generate_dataset
+from app.db.migrations import alembic_config
+from app.db.sqlite import configure_sqlite
+from app.schemas.user import UserCreate
+from app.services.user_service import UserService
+
+from .common import BENCH_PASSWORD, BENCH_USERNAME, percentile
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+# Cenário -> peso na mistura padrão
+DEFAULT_MIX = {
+    "list_assets": 20,
+    "get_asset": 25,
+    "create_asset": 8,
+    "update_asset": 6,
+    "delete_asset": 4,
+    "list_owners": 10,
+    "get_owner": 12,
+    "create_owner": 5,
+    "update_owner": 4,
+    "delete_owner": 3,
+    "login_burst": 3,
+}
+
+# Logins simultâneos de uma rajada
+LOGIN_BURST_SIZE = 5
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def prepare_database(database_url: str, owners: int, assets: int, seed: int) -> None:
+    """Migra o banco, cria o usuário do teste e popula os dados sintéticos"""
+    command.upgrade(alembic_config(database_url), "head")
+    engine = create_engine(database_url)
+    configure_sqlite(engine)
+    try:
+        with sessionmaker(bind=engine)() as db:
+            UserService.create_user(db, UserCreate(username=BENCH_USERNAME, password=BENCH_PASSWORD))
+        generate_dataset(engine, owners=owners, assets=assets, seed=seed)
+    finally:
+        engine.dispose()
+
+
+@contextmanager
+def uvicorn_server(database_url: str, workers: int) -> Iterator[str]:
+    """Sobe o uvicorn em uma porta livre e retorna a URL base quando responder"""
+    port = free_port()
+    env = {
+        **os.environ,
+        "DATABASE_URL": database_url,
+        "SERVER_TIMING_ENABLED": "false",
+    }
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--host", "127.0.0.1", "--port", str(port),
+            "--workers", str(workers), "--no-access-log", "--log-level", "warning",
+        ],
+        cwd=BACKEND_DIR,
+        env=env,
+    )
+    url = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            if process.poll() is not None:
+                raise RuntimeError(f"uvicorn terminou com código {process.returncode}")
+            try:
+                httpx.get(f"{url}/", timeout=1).raise_for_status()
+                break
+            except httpx.HTTPError:
+                if time.monotonic() > deadline:
+                    raise RuntimeError("uvicorn não respondeu em 30s")
+                time.sleep(0.2)
+        yield url
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+class LoadTest:
+    """Cenários e estatísticas (latências e erros por rota) de uma execução"""
+
+    def __init__(self, client: httpx.AsyncClient, headers: dict, rng: random.Random):
+        self.client = client
+        self.headers = headers
+        self.rng = rng
+        self.asset_ids: List[str] = []
+        self.owner_ids: List[str] = []
+        # Registros criados pelos cenários, removidos pelos cenários de delete
+        self.created = {"asset": deque(), "owner": deque()}
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.sequence = 0
+        # Distingue os emails criados por execuções diferentes contra o mesmo alvo
+        self.run_id = uuid.uuid4().hex[:8]
+
+    async def request(self, route: str, method: str, url: str, auth: bool = True, **kwargs):
+        """Executa e mede uma requisição, agrupada por `route` (método + template)"""
+        start = time.perf_counter()
+        try:
+            response = await self.client.request(
+                method, url, headers=self.headers if auth else None, **kwargs
+            )
+        except httpx.HTTPError:
+            response = None
+        self.latencies[route].append(time.perf_counter() - start)
+        if response is None or response.status_code >= 400:
+            self.errors[route] += 1
+            return None
+        return response
+
+    async def load_ids(self) -> None:
+        """IDs existentes (primeiras páginas) usados pelos cenários de leitura"""
+        for entity, target in (("assets", self.asset_ids), ("owners", self.owner_ids)):
+            response = await self.client.get(
+                f"/integrations/{entity}?limit=500", headers=self.headers
+            )
+            response.raise_for_status()
+            target.extend(row["id"] for row in response.json())
+        if not self.owner_ids:
+            raise RuntimeError("O alvo não tem responsáveis; popule o banco antes")
+
+    def next_number(self) -> int:
+        self.sequence += 1
+        return self.sequence
+
+    async def list_assets(self):
+        await self.request("GET /integrations/assets", "GET", "/integrations/assets?limit=50")
+
+    async def get_asset(self):
+        if self.asset_ids:
+            asset_id = self.rng.choice(self.asset_ids)
+            await self.request("GET /integrations/asset/{asset_id}", "GET", f"/integrations/asset/{asset_id}")
+
+    async def create_asset(self):
+        response = await self.request(
+            "POST /integrations/asset", "POST", "/integrations/asset",
+            json={"name": f"Carga {self.next_number()}", "category": "Carga", "owner": self.rng.choice(self.owner_ids)},
+        )
+        if response is not None:
+            self.created["asset"].append(response.json()["id"])
+
+    async def update_asset(self):
+        if self.asset_ids:
+            asset_id = self.rng.choice(self.asset_ids)
+            await self.request(
+                "PUT /integrations/asset/{asset_id}", "PUT", f"/integrations/asset/{asset_id}",
+                json={"name": f"Atualizado {self.next_number()}"},
+            )
+
+    async def delete_asset(self):
+        if self.created["asset"]:
+            asset_id = self.created["asset"].popleft()
+            await self.request("DELETE /integrations/asset/{asset_id}", "DELETE", f"/integrations/asset/{asset_id}")
+
+    async def list_owners(self):
+        await self.request("GET /integrations/owners", "GET", "/integrations/owners?limit=50")
+
+    async def get_owner(self):
+        owner_id = self.rng.choice(self.owner_ids)
+        await self.request("GET /integrations/owner/{owner_id}", "GET", f"/integrations/owner/{owner_id}")
+
+    async def create_owner(self):
+        number = self.next_number()
+        response = await self.request(
+            "POST /integrations/owner", "POST", "/integrations/owner",
+            json={"name": f"Carga {number}", "email": f"carga.{self.run_id}.{number}@teste.com", "phone": "0"},
+        )
+        if response is not None:
+            self.created["owner"].append(response.json()["id"])
+
+    async def update_owner(self):
+        owner_id = self.rng.choice(self.owner_ids)
+        await self.request(
+            "PUT /integrations/owner/{owner_id}", "PUT", f"/integrations/owner/{owner_id}",
+            json={"phone": str(self.next_number())},
+        )
+
+    async def delete_owner(self):
+        if self.created["owner"]:
+            owner_id = self.created["owner"].popleft()
+            await self.request("DELETE /integrations/owner/{owner_id}", "DELETE", f"/integrations/owner/{owner_id}")
+
+    async def login_burst(self):
+        await asyncio.gather(*(
+            self.request(
+                "POST /integrations/login", "POST", "/integrations/login", auth=False,
+                data={"username": BENCH_USERNAME, "password": BENCH_PASSWORD},
+            )
+            for _ in range(LOGIN_BURST_SIZE)
+        ))
+
+    async def run_level(self, concurrency: int, duration: float, mix: Dict[str, float]) -> dict:
+        """Mantém `concurrency` cenários em andamento por `duration` segundos"""
+        self.latencies.clear()
+        self.errors.clear()
+        scenarios = [getattr(self, name) for name in mix]
+        weights = list(mix.values())
+        deadline = time.perf_counter() + duration
+
+        async def worker():
+            while time.perf_counter() < deadline:
+                await self.rng.choices(scenarios, weights)[0]()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+        endpoints = {
+            route: endpoint_stats(samples, self.errors[route], elapsed)
+            for route, samples in sorted(self.latencies.items())
+        }
+        all_samples = [sample for samples in self.latencies.values() for sample in samples]
+        return {
+            "concurrency": concurrency,
+            "duration_s": round(elapsed, 2),
+            **endpoint_stats(all_samples, sum(self.errors.values()), elapsed),
+            "endpoints": endpoints,
+        }
+
+
+def endpoint_stats(samples: List[float], errors: int, elapsed: float) -> dict:
+    """Vazão, percentis (ms) e taxa de erros de um conjunto de requisições"""
+    return {
+        "requests": len(samples),
+        "errors": errors,
+        "error_rate": round(errors / len(samples), 4) if samples else 0.0,
+        "throughput_rps": round(len(samples) / elapsed, 1),
+        "p50_ms": round(percentile(samples, 50) * 1000, 2),
+        "p95_ms": round(percentile(samples, 95) * 1000, 2),
+        "p99_ms": round(percentile(samples, 99) * 1000, 2),
+    }
+
+
+def parse_mix(value: Optional[str]) -> Dict[str, float]:
+    """`nome=peso,...` sobre a mistura padrão (peso 0 remove o cenário)"""
+    mix = dict(DEFAULT_MIX)
+    for item in filter(None, (value or "").split(",")):
+        name, _, weight = item.partition("=")
+        if name not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f"Cenário desconhecido: {name}")
+        mix[name] = float(weight)
+    return {name: weight for name, weight in mix.items() if weight > 0}
+
+
+async def run(url: str, args) -> List[dict]:
+    limits = httpx.Limits(max_connections=max(args.levels) + LOGIN_BURST_SIZE)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=30) as client:
+        response = await client.post(
+            "/integrations/login",
+            data={"username": args.username, "password": args.password},
+        )
+        response.raise_for_status()
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        test = LoadTest(client, headers, random.Random(args.seed))
+        await test.load_ids()
+        await test.run_level(min(args.levels), min(args.duration, 2), args.mix)  # Aquecimento
+        return [await test.run_level(level, args.duration, args.mix) for level in args.levels]
+
+
+def print_report(levels: List[dict]) -> None:
+    print(f"{'conc':>5} {'rota':<40} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'erros':>7}")
+    for level in levels:
+        rows = [("total", level)] + list(level["endpoints"].items())
+        for route, stats in rows:
+            print(
+                f"{level['concurrency']:>5} {route:<40} {stats['throughput_rps']:>8} "
+                f"{stats['p50_ms']:>8} {stats['p95_ms']:>8} {stats['p99_ms']:>8} "
+                f"{stats['error_rate']:>7.2%}"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--levels", default="1,8,32", help="Níveis de concorrência")
+    parser.add_argument("--duration", type=float, default=10, help="Segundos por nível")
+    parser.add_argument("--workers", type=int, default=1, help="Processos do uvicorn")
+    parser.add_argument("--owners", type=int, default=1000, help="Responsáveis no banco temporário")
+    parser.add_argument("--assets", type=int, default=10000, help="Ativos no banco temporário")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(None), help="Pesos: nome=peso,...")
+    parser.add_argument("--seed", type=int, default=0, help="Semente dos dados e dos sorteios")
+    parser.add_argument("--url", help="Servidor já em execução (não sobe o uvicorn)")
+    parser.add_argument("--username", default=BENCH_USERNAME, help="Usuário do login (com --url)")
+    parser.add_argument("--password", default=BENCH_PASSWORD, help="Senha do login (com --url)")
+    parser.add_argument("--output", help="Grava o relatório em JSON")
+    args = parser.parse_args()
+    args.levels = [int(level) for level in args.levels.split(",")]
+
+    if args.url:
+        levels = asyncio.run(run(args.url, args))
+    else:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            database_url = f"sqlite:///{os.path.join(tmpdir, 'loadtest.db')}"
+            prepare_database(database_url, args.owners, args.assets, args.seed)
+            with uvicorn_server(database_url, args.workers) as url:
+                levels = asyncio.run(run(url, args))
+
+    print_report(levels)
+
+    if args.output:
+        report = {
+            "meta": {
+                "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "target": args.url or "uvicorn local",
+                "workers": None if args.url else args.workers,
+                "duration_s": args.duration,
+                "mix": args.mix,
+                "seed": args.seed,
+            },
+            "levels": levels,
+        }
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
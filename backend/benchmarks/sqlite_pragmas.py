@@ -0,0 +1,149 @@
+"""
+Benchmark do perfil SQLite: vazão de leitura e escrita com cada PRAGMA.
+
+Para cada perfil (cumulativo, do padrão do SQLite até o perfil completo da
+aplicação) um banco novo é populado e, durante `--seconds`, threads leitoras
+(GET por ID e listagem) disputam o banco com threads escritoras (um INSERT e
+um commit por ativo). No modo rollback-journal padrão cada commit bloqueia os
+leitores; com WAL leitores e escritor seguem em paralelo.
+
+Uso:
+    python -m benchmarks.sqlite_pragmas [--seconds 5] [--readers 4] [--writers 2]
+"""
+import argparse
+import json
+import random
+import threading
+import time
+
+from sqlalchemy.exc import OperationalError
+
+from app.db.sqlite import performance_pragmas
+from app.schemas.asset import AssetCreate
+from app.schemas.owner import OwnerCreate
+from app.services.asset_service import AssetService
+from app.services.owner_service import OwnerService
+
+from .common import temporary_database
+
+
+def profiles() -> dict:
+    """Perfis cumulativos, cada um acrescentando PRAGMAs ao anterior"""
+    full = performance_pragmas()
+    return {
+        "padrao": {"journal_mode": "DELETE", "synchronous": "FULL"},
+        "wal": {"journal_mode": "WAL", "synchronous": "FULL"},
+        "wal+normal": {"journal_mode": "WAL", "synchronous": "NORMAL"},
+        "wal+normal+busy": {
+            "journal_mode": "WAL",
+            "synchronous": "NORMAL",
+            "busy_timeout": full["busy_timeout"],
+        },
+        "completo": full,
+    }
+
+
+def seed(session_factory, assets: int) -> tuple:
+    """Cria um owner com `assets` ativos; retorna o ID do owner e dos ativos"""
+    db = session_factory()
+    try:
+        owner = OwnerService.create_owner(
+            db, OwnerCreate(name="Benchmark", email="bench@empresa.com", phone="0")
+        )
+        items = [
+            AssetCreate(name=f"Asset {i}", category="Bench", owner=owner.id)
+            for i in range(assets)
+        ]
+        result = AssetService.create_assets_bulk(db, items)
+        return owner.id, [r.id for r in result.results]
+    finally:
+        db.close()
+
+
+def run_profile(pragmas: dict, args) -> dict:
+    """Executa a carga mista contra um banco novo com o perfil `pragmas`"""
+    with temporary_database(pragmas) as session_factory:
+        owner_id, asset_ids = seed(session_factory, args.assets)
+        stop = threading.Event()
+        counts = {"reads": 0, "writes": 0, "errors": 0}
+        lock = threading.Lock()
+
+        def count(key):
+            with lock:
+                counts[key] += 1
+
+        def reader():
+            db = session_factory()
+            try:
+                while not stop.is_set():
+                    try:
+                        if random.random() < 0.5:
+                            AssetService.get_asset(db, random.choice(asset_ids))
+                        else:
+                            AssetService.get_assets(db, limit=20, owner=owner_id)
+                        db.rollback()  # Encerra a transação de leitura
+                        count("reads")
+                    except OperationalError:
+                        db.rollback()
+                        count("errors")
+            finally:
+                db.close()
+
+        def writer():
+            db = session_factory()
+            try:
+                i = 0
+                while not stop.is_set():
+                    try:
+                        AssetService.create_asset(
+                            db, AssetCreate(name=f"Novo {i}", category="Bench", owner=owner_id)
+                        )
+                        count("writes")
+                    except OperationalError:
+                        db.rollback()
+                        count("errors")
+                    i += 1
+            finally:
+                db.close()
+
+        threads = [threading.Thread(target=reader) for _ in range(args.readers)]
+        threads += [threading.Thread(target=writer) for _ in range(args.writers)]
+        start = time.perf_counter()
+        for t in threads:
+            t.start()
+        time.sleep(args.seconds)
+        stop.set()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - start
+
+    return {
+        "reads_per_s": round(counts["reads"] / elapsed, 1),
+        "writes_per_s": round(counts["writes"] / elapsed, 1),
+        "errors": counts["errors"],
+        "pragmas": pragmas,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seconds", type=float, default=5, help="Duração por perfil")
+    parser.add_argument("--readers", type=int, default=4, help="Threads leitoras")
+    parser.add_argument("--writers", type=int, default=2, help="Threads escritoras")
+    parser.add_argument("--assets", type=int, default=5000, help="Ativos criados no banco")
+    parser.add_argument("--json", dest="json_path", help="Grava os resultados em JSON")
+    args = parser.parse_args()
+
+    results = {name: run_profile(pragmas, args) for name, pragmas in profiles().items()}
+
+    print(f"{'perfil':<18} {'leituras/s':>11} {'escritas/s':>11} {'erros':>6}")
+    for name, r in results.items():
+        print(f"{name:<18} {r['reads_per_s']:>11} {r['writes_per_s']:>11} {r['errors']:>6}")
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+"""
+Suíte de benchmarks: latência das operações de ativos e responsáveis, pelos
+serviços e pela API (ASGI), e do login (bcrypt), em vários tamanhos de banco.
+
+Para cada tamanho um banco novo é populado fora da medição pelo gerador de
+dados sintéticos (app.db.dataset, um responsável para cada 10 ativos) e cada
+operação é executada `--iterations` vezes:
+
+- service.{asset,owner}.{create,get,list,update,delete}: chamadas diretas aos
+  serviços, uma sessão por chamada (como uma requisição)
+- api.{asset,owner}.{create,get,list,update,delete}: as mesmas operações pelas
+  rotas, via ASGI em processo (validação, JWT, serialização)
+- api.login: POST /integrations/login, dominado pelo bcrypt
+
+Os registros criados são os removidos em seguida, então o banco mantém o
+tamanho. Os resultados (p50/p95/média em ms) vão para JSON; com `--baseline`,
+cada operação é comparada com uma execução anterior e o comando sai com
+código 1 se alguma piorou além da tolerância (gate de regressão no CI).
+
+Uso:
+    python -m benchmarks.suite [--sizes 10000,100000,1000000] [--iterations 200]
+        [--output resultado.json] [--baseline benchmarks/baseline.json] [--tolerance 0.5]
+"""
+import argparse
+import asyncio
+import json
+import platform
+import random
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, List
+
+import sqlalchemy
+
+from app.db.dataset import generate_dataset
+from app.schemas.asset import AssetCreate, AssetUpdate
+from app.schemas.owner import OwnerCreate, OwnerUpdate
+from app.services.asset_service import AssetService
+from app.services.owner_service import OwnerService
+
+from .common import (
+    BENCH_PASSWORD,
+    BENCH_USERNAME,
+    asgi_client,
+    login,
+    override_database,
+    percentile,
+    temporary_database,
+)
+
+# Ativos por responsável no banco populado
+ASSETS_PER_OWNER = 10
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """p50/p95/média (ms) de uma lista de durações em segundos"""
+    return {
+        "p50_ms": round(percentile(samples, 50) * 1000, 3),
+        "p95_ms": round(percentile(samples, 95) * 1000, 3),
+        "mean_ms": round(sum(samples) / len(samples) * 1000, 3),
+        "samples": len(samples),
+    }
+
+
+def measure(operation: Callable[[int], object], iterations: int) -> Dict[str, float]:
+    """Executa `operation(i)` `iterations` vezes e resume as durações"""
+    samples = []
+    for i in range(iterations):
+        start = time.perf_counter()
+        operation(i)
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+
+async def measure_async(operation: Callable[[int], Awaitable], iterations: int) -> Dict[str, float]:
+    """Versão assíncrona de `measure`"""
+    samples = []
+    for i in range(iterations):
+        start = time.perf_counter()
+        await operation(i)
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+
+def bench_services(session_factory, owner_ids, asset_ids, iterations, rng) -> Dict[str, dict]:
+    """Operações CRUD chamando os serviços diretamente"""
+    results = {}
+
+    def call(method, *args):
+        with session_factory() as db:
+            return method(db, *args)
+
+    # Aquecimento (caches do SQLite, imports preguiçosos)
+    for asset_id in asset_ids[:20]:
+        call(AssetService.get_asset, asset_id)
+
+    created = []
+    results["service.asset.create"] = measure(lambda i: created.append(call(
+        AssetService.create_asset,
+        AssetCreate(name=f"Bench {i}", category="Bench", owner=rng.choice(owner_ids)),
+    ).id), iterations)
+    results["service.asset.get"] = measure(
+        lambda i: call(AssetService.get_asset, rng.choice(asset_ids)), iterations
+    )
+    results["service.asset.list"] = measure(
+        lambda i: call(AssetService.get_assets, 0, 100), iterations
+    )
+    results["service.asset.update"] = measure(lambda i: call(
+        AssetService.update_asset, rng.choice(asset_ids), AssetUpdate(name=f"Atualizado {i}")
+    ), iterations)
+    results["service.asset.delete"] = measure(
+        lambda i: call(AssetService.delete_asset, created[i]), iterations
+    )
+
+    created = []
+    results["service.owner.create"] = measure(lambda i: created.append(call(
+        OwnerService.create_owner,
+        OwnerCreate(name=f"Bench {i}", email=f"svc{i}@bench.com", phone="0"),
+    ).id), iterations)
+    results["service.owner.get"] = measure(
+        lambda i: call(OwnerService.get_owner, rng.choice(owner_ids)), iterations
+    )
+    results["service.owner.list"] = measure(
+        lambda i: call(OwnerService.get_owners, 0, 100), iterations
+    )
+    results["service.owner.update"] = measure(lambda i: call(
+        OwnerService.update_owner, rng.choice(owner_ids), OwnerUpdate(name=f"Atualizado {i}")
+    ), iterations)
+    results["service.owner.delete"] = measure(
+        lambda i: call(OwnerService.delete_owner, created[i]), iterations
+    )
+    return results
+
+
+async def bench_api(client, owner_ids, asset_ids, iterations, login_iterations, rng) -> Dict[str, dict]:
+    """As mesmas operações pelas rotas da API, mais o login"""
+    results = {}
+    headers = await login(client)
+
+    async def request(method, url, **kwargs):
+        response = await client.request(method, url, headers=headers, **kwargs)
+        response.raise_for_status()
+        return response
+
+    for asset_id in asset_ids[:20]:
+        await request("GET", f"/integrations/asset/{asset_id}")
+
+    for entity, ids, payload, update in (
+        (
+            "asset", asset_ids,
+            lambda i: {"name": f"Bench {i}", "category": "Bench", "owner": rng.choice(owner_ids)},
+            lambda i: {"name": f"Atualizado {i}"},
+        ),
+        (
+            "owner", owner_ids,
+            lambda i: {"name": f"Bench {i}", "email": f"api{i}@bench.com", "phone": "0"},
+            lambda i: {"name": f"Atualizado {i}"},
+        ),
+    ):
+        created = []
+
+        async def create(i):
+            response = await request("POST", f"/integrations/{entity}", json=payload(i))
+            created.append(response.json()["id"])
+
+        results[f"api.{entity}.create"] = await measure_async(create, iterations)
+        results[f"api.{entity}.get"] = await measure_async(
+            lambda i: request("GET", f"/integrations/{entity}/{rng.choice(ids)}"), iterations
+        )
+        results[f"api.{entity}.list"] = await measure_async(
+            lambda i: request("GET", f"/integrations/{entity}s?limit=100"), iterations
+        )
+        results[f"api.{entity}.update"] = await measure_async(
+            lambda i: request("PUT", f"/integrations/{entity}/{rng.choice(ids)}", json=update(i)),
+            iterations,
+        )
+        results[f"api.{entity}.delete"] = await measure_async(
+            lambda i: request("DELETE", f"/integrations/{entity}/{created[i]}"), iterations
+        )
+
+    async def do_login(i):
+        response = await client.post(
+            "/integrations/login",
+            data={"username": BENCH_USERNAME, "password": BENCH_PASSWORD},
+        )
+        response.raise_for_status()
+
+    results["api.login"] = await measure_async(do_login, login_iterations)
+    return results
+
+
+async def run_size(size: int, args) -> Dict[str, dict]:
+    """Popula um banco com `size` ativos e mede todas as operações"""
+    rng = random.Random(args.seed)
+    with temporary_database() as session_factory, override_database(session_factory):
+        dataset = generate_dataset(
+            session_factory.kw["bind"],
+            owners=max(1, size // ASSETS_PER_OWNER),
+            assets=size,
+            seed=args.seed,
+        )
+        owner_ids, asset_ids = dataset.owner_ids, dataset.asset_sample
+        results = bench_services(session_factory, owner_ids, asset_ids, args.iterations, rng)
+        async with asgi_client() as client:
+            results.update(await bench_api(
+                client, owner_ids, asset_ids, args.iterations, args.login_iterations, rng
+            ))
+    return results
+
+
+def compare(current: dict, baseline: dict, tolerance: float, min_delta_ms: float) -> List[dict]:
+    """
+    Compara o p50 de cada operação presente nas duas execuções. Uma operação
+    regrediu quando o p50 cresceu mais que `tolerance` (fração) e mais que
+    `min_delta_ms` (evita falsos alarmes em operações de microssegundos).
+    """
+    rows = []
+    for size, operations in current["results"].items():
+        for name, stats in operations.items():
+            base = baseline["results"].get(size, {}).get(name)
+            if base is None:
+                continue
+            delta = stats["p50_ms"] - base["p50_ms"]
+            ratio = stats["p50_ms"] / base["p50_ms"] if base["p50_ms"] else 1.0
+            rows.append({
+                "size": size,
+                "operation": name,
+                "baseline_ms": base["p50_ms"],
+                "current_ms": stats["p50_ms"],
+                "change": round(ratio - 1, 3),
+                "regression": ratio > 1 + tolerance and delta > min_delta_ms,
+            })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default="10000,100000", help="Ativos no banco, separados por vírgula")
+    parser.add_argument("--iterations", type=int, default=200, help="Execuções de cada operação")
+    parser.add_argument("--login-iterations", type=int, default=20, help="Execuções do login (bcrypt)")
+    parser.add_argument("--seed", type=int, default=0, help="Semente dos dados e das escolhas aleatórias")
+    parser.add_argument("--output", help="Grava os resultados em JSON")
+    parser.add_argument("--baseline", help="JSON de uma execução anterior para comparar")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="Piora máxima do p50 (fração)")
+    parser.add_argument("--min-delta-ms", type=float, default=1.0, help="Piora mínima, em ms, para falhar")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    report = {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "sqlalchemy": sqlalchemy.__version__,
+            "platform": platform.platform(),
+            "iterations": args.iterations,
+            "login_iterations": args.login_iterations,
+            "seed": args.seed,
+        },
+        "results": {},
+    }
+    for size in sizes:
+        start = time.perf_counter()
+        report["results"][str(size)] = asyncio.run(run_size(size, args))
+        print(f"{size} ativos: {time.perf_counter() - start:.1f}s", file=sys.stderr)
+
+    print(f"{'ativos':>8} {'operação':<22} {'p50 ms':>9} {'p95 ms':>9} {'média ms':>9}")
+    for size, operations in report["results"].items():
+        for name, stats in operations.items():
+            print(
+                f"{size:>8} {name:<22} {stats['p50_ms']:>9} "
+                f"{stats['p95_ms']:>9} {stats['mean_ms']:>9}"
+            )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        rows = compare(report, baseline, args.tolerance, args.min_delta_ms)
+        regressions = [row for row in rows if row["regression"]]
+        print(f"\nComparação com {args.baseline} (tolerância {args.tolerance:.0%} no p50):")
+        for row in rows:
+            flag = "REGRESSÃO" if row["regression"] else ""
+            print(
+                f"{row['size']:>8} {row['operation']:<22} {row['baseline_ms']:>9} "
+                f"-> {row['current_ms']:>9} ({row['change']:+.0%}) {flag}"
+            )
+        if regressions:
+            print(f"\n{len(regressions)} operação(ões) acima da tolerância", file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
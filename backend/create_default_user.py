@@ -0,0 +1,29 @@
+"""
+Cria o usuário padrão (eyesonasset/eyesonasset) no banco de DATABASE_URL, se
+ainda não existir. O banco precisa estar migrado (`alembic upgrade head`).
+
+Uso:
+    python create_default_user.py
+"""
+from app.db.base import SessionLocal
+from app.schemas.user import UserCreate
+from app.services.user_service import UserService
+
+DEFAULT_USERNAME = "eyesonasset"
+DEFAULT_PASSWORD = "eyesonasset"
+
+
+def main():
+    db = SessionLocal()
+    try:
+        if UserService.get_user_by_username(db, DEFAULT_USERNAME):
+            print(f"Usuário '{DEFAULT_USERNAME}' já existe")
+            return
+        UserService.create_user(db, UserCreate(username=DEFAULT_USERNAME, password=DEFAULT_PASSWORD))
+        print(f"Usuário '{DEFAULT_USERNAME}' criado")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,9 @@
+"""
+Funções auxiliares compartilhadas entre os testes
+"""
+from prometheus_client import REGISTRY
+
+
+def sample(name, **labels) -> float:
+    """Valor atual de uma métrica do registro padrão (0 se ainda não existe)"""
+    return REGISTRY.get_sample_value(name, labels) or 0.0
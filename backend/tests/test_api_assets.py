@@ -3,6 +3,8 @@ Testes de integração para as rotas da API de Assets
 """
 import pytest
 
+from app.core.config import settings
+
 
 class TestAssetRoutes:
     """Testes para as rotas de Asset"""
@@ -106,6 +108,68 @@ class TestAssetRoutes:
         assert response.status_code == 200
         assert len(response.json()) == 2
     
+    def test_list_assets_cursor_pagination(self, client, auth_headers, created_owner, sample_asset_data):
+        """Testa paginação por cursor seguindo o header X-Next-Cursor"""
+        for i in range(5):
+            data = {**sample_asset_data, "name": f"Asset {i}", "owner": created_owner["id"]}
+            client.post("/integrations/asset", json=data, headers=auth_headers)
+        
+        seen = []
+        url = "/integrations/assets?limit=2"
+        while True:
+            response = client.get(url, headers=auth_headers)
+            assert response.status_code == 200
+            seen.extend(asset["id"] for asset in response.json())
+            cursor = response.headers.get("X-Next-Cursor")
+            if cursor is None:
+                assert "Link" not in response.headers
+                break
+            assert 'rel="next"' in response.headers["Link"]
+            url = f"/integrations/assets?limit=2&after={cursor}"
+        
+        assert len(seen) == 5
+        assert seen == sorted(seen)
+    
+    def test_list_assets_limit_above_max(self, client, auth_headers):
+        """Testa que o servidor impõe o tamanho máximo de página"""
+        response = client.get("/integrations/assets?limit=100000", headers=auth_headers)
+        
+        assert response.status_code == 422
+    
+    def test_list_assets_invalid_cursor(self, client, auth_headers):
+        """Testa erro com cursor malformado"""
+        response = client.get("/integrations/assets?after=%%%", headers=auth_headers)
+        
+        assert response.status_code == 400
+    
+    def test_list_assets_filters(self, client, auth_headers, created_owner, sample_owner_data):
+        """Testa filtros de owner, categoria e prefixo do nome na listagem"""
+        other = client.post(
+            "/integrations/owner",
+            json={**sample_owner_data, "email": "outro@empresa.com"},
+            headers=auth_headers
+        ).json()
+        for name, category, owner in [
+            ("Boeing 737", "Aeronave", created_owner),
+            ("Airbus A320", "Aeronave", other),
+            ("Bobcat S70", "Trator", created_owner),
+        ]:
+            client.post(
+                "/integrations/asset",
+                json={"name": name, "category": category, "owner": owner["id"]},
+                headers=auth_headers
+            )
+        
+        def names(query):
+            response = client.get(f"/integrations/assets?{query}", headers=auth_headers)
+            assert response.status_code == 200
+            return sorted(asset["name"] for asset in response.json())
+        
+        assert names(f"owner={created_owner['id']}") == ["Bobcat S70", "Boeing 737"]
+        assert names("category=Aeronave") == ["Airbus A320", "Boeing 737"]
+        assert names("name=Bo") == ["Bobcat S70", "Boeing 737"]
+        assert names(f"owner={other['id']}&category=Trator") == []
+    
     def test_update_asset_success(self, client, auth_headers, created_asset):
         """Testa atualização bem-sucedida de asset"""
         update_data = {"name": "Aeronave Boeing 777"}
@@ -178,3 +242,80 @@ class TestAssetRoutes:
         assert response.status_code == 200
         owner = response.json()
         assert owner["id"] == created_owner["id"]
+    
+    def test_create_assets_bulk(self, client, auth_headers, created_owner):
+        """Testa criação de ativos em lote com resultado por linha"""
+        items = [
+            {"name": f"Asset {i}", "category": "Lote", "owner": created_owner["id"]}
+            for i in range(50)
+        ]
+        items.append({"name": "Órfão", "category": "Lote", "owner": "inexistente"})
+        
+        response = client.post(
+            "/integrations/assets/bulk", json={"items": items}, headers=auth_headers
+        )
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["created"] == 50
+        assert data["failed"] == 1
+        assert data["results"][50]["error"] is not None
+        
+        response = client.get(
+            "/integrations/assets?category=Lote&limit=500", headers=auth_headers
+        )
+        assert len(response.json()) == 50
+    
+    def test_create_assets_bulk_validation_error(self, client, auth_headers, created_owner):
+        """Testa que linhas inválidas pelo schema rejeitam o payload (422)"""
+        items = [{"name": "", "category": "Lote", "owner": created_owner["id"]}]
+        
+        response = client.post(
+            "/integrations/assets/bulk", json={"items": items}, headers=auth_headers
+        )
+        
+        assert response.status_code == 422
+    
+    def test_create_assets_bulk_unauthorized(self, client):
+        """Testa que a criação em lote exige autenticação"""
+        response = client.post("/integrations/assets/bulk", json={"items": []})
+        
+        assert response.status_code == 403
+    
+    def test_batch_get_assets(self, client, auth_headers, created_asset):
+        """Testa busca em lote por IDs, na ordem enviada e com IDs ausentes"""
+        missing_id = "00000000-0000-0000-0000-000000000000"
+        payload = {"ids": [missing_id, created_asset["id"], created_asset["id"]]}
+        
+        response = client.post(
+            "/integrations/assets/batch-get", json=payload, headers=auth_headers
+        )
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert [a["id"] for a in data["items"]] == [created_asset["id"]]
+        assert data["items"][0]["name"] == created_asset["name"]
+        assert data["found"] == [created_asset["id"]]
+        assert data["missing"] == [missing_id]
+    
+    def test_batch_get_assets_exists_only(self, client, auth_headers, created_asset):
+        """Testa o modo exists_only, que não retorna os registros"""
+        payload = {"ids": [created_asset["id"], "inexistente"], "exists_only": True}
+        
+        response = client.post(
+            "/integrations/assets/batch-get", json=payload, headers=auth_headers
+        )
+        
+        assert response.status_code == 200
+        assert response.json() == {
+            "found": [created_asset["id"]],
+            "missing": ["inexistente"]
+        }
+    
+    def test_batch_get_assets_limits(self, client, auth_headers):
+        """Testa que a lista de IDs não pode ser vazia nem exceder o limite"""
+        for ids in ([], ["x"] * (settings.BATCH_GET_MAX_IDS + 1)):
+            response = client.post(
+                "/integrations/assets/batch-get", json={"ids": ids}, headers=auth_headers
+            )
+            assert response.status_code == 422
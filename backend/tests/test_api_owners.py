@@ -126,6 +126,25 @@ class TestOwnerRoutes:
         assert response.status_code == 200
         assert len(response.json()) == 2
     
+    def test_list_owners_cursor_pagination(self, client, sample_owner_data, auth_headers):
+        """Testa paginação por cursor seguindo o header Link"""
+        for i in range(3):
+            data = {**sample_owner_data, "email": f"owner{i}@empresa.com"}
+            client.post("/integrations/owner", json=data, headers=auth_headers)
+        
+        response = client.get("/integrations/owners?limit=2", headers=auth_headers)
+        assert response.status_code == 200
+        first_page = response.json()
+        assert len(first_page) == 2
+        next_url = response.headers["Link"].split(";")[0].strip("<>")
+        
+        response = client.get(next_url, headers=auth_headers)
+        assert response.status_code == 200
+        second_page = response.json()
+        assert len(second_page) == 1
+        assert second_page[0]["id"] > first_page[-1]["id"]
+        assert "X-Next-Cursor" not in response.headers
+    
     def test_update_owner_success(self, client, created_owner, auth_headers):
         """Testa atualização bem-sucedida de owner"""
         update_data = {"phone": "+55 11 99999-9999"}
@@ -207,3 +226,85 @@ class TestOwnerRoutes:
             headers=auth_headers
         )
         assert response.status_code == 404
+    
+    def test_create_owners_bulk(self, client, created_owner, auth_headers):
+        """Testa criação de responsáveis em lote com conflitos reportados por linha"""
+        items = [
+            {"name": f"Owner {i}", "email": f"owner{i}@empresa.com", "phone": "1"}
+            for i in range(20)
+        ]
+        items.append({"name": "Repetido", "email": created_owner["email"], "phone": "1"})
+        items.append({"name": "Repetido", "email": "owner0@empresa.com", "phone": "1"})
+        
+        response = client.post(
+            "/integrations/owners/bulk", json={"items": items}, headers=auth_headers
+        )
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["created"] == 20
+        assert data["failed"] == 2
+        assert data["results"][20]["error"] == "Email já cadastrado"
+        assert data["results"][21]["error"] == "Email duplicado no lote"
+        
+        response = client.get("/integrations/owners", headers=auth_headers)
+        assert len(response.json()) == 21
+    
+    def test_list_owner_assets(self, client, created_owner, sample_owner_data, auth_headers):
+        """Testa listagem paginada dos ativos de um responsável, com contagem"""
+        other = client.post(
+            "/integrations/owner",
+            json={**sample_owner_data, "email": "outro@empresa.com"},
+            headers=auth_headers
+        ).json()
+        items = [
+            {"name": f"Asset {i}", "category": "Cat", "owner": created_owner["id"]}
+            for i in range(5)
+        ]
+        items.append({"name": "De outro", "category": "Cat", "owner": other["id"]})
+        client.post("/integrations/assets/bulk", json={"items": items}, headers=auth_headers)
+        
+        url = f"/integrations/owner/{created_owner['id']}/assets"
+        response = client.get(f"{url}?limit=3&include_count=true", headers=auth_headers)
+        assert response.status_code == 200
+        assert response.headers["X-Total-Count"] == "5"
+        first_page = response.json()
+        assert len(first_page) == 3
+        
+        cursor = response.headers["X-Next-Cursor"]
+        response = client.get(f"{url}?limit=3&after={cursor}", headers=auth_headers)
+        second_page = response.json()
+        assert len(second_page) == 2
+        assert "X-Total-Count" not in response.headers
+        assert all(a["owner"] == created_owner["id"] for a in first_page + second_page)
+    
+    def test_list_owner_assets_owner_not_found(self, client, auth_headers):
+        """Testa 404 ao listar ativos de responsável inexistente"""
+        response = client.get(
+            "/integrations/owner/00000000-0000-0000-0000-000000000000/assets",
+            headers=auth_headers
+        )
+        
+        assert response.status_code == 404
+    
+    def test_batch_get_owners(self, client, created_owner, auth_headers):
+        """Testa busca de responsáveis em lote por IDs"""
+        missing_id = "00000000-0000-0000-0000-000000000000"
+        payload = {"ids": [created_owner["id"], missing_id]}
+        
+        response = client.post(
+            "/integrations/owners/batch-get", json=payload, headers=auth_headers
+        )
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["items"][0]["email"] == created_owner["email"]
+        assert data["found"] == [created_owner["id"]]
+        assert data["missing"] == [missing_id]
+        
+        payload["exists_only"] = True
+        response = client.post(
+            "/integrations/owners/batch-get", json=payload, headers=auth_headers
+        )
+        assert "items" not in response.json()
+        assert response.json()["found"] == [created_owner["id"]]
@@ -0,0 +1,40 @@
+"""
+Testes da configuração da aplicação (rotas e middlewares)
+"""
+import inspect
+
+from fastapi.routing import APIRoute
+
+from app.main import app
+from app.db.sessions import get_db
+
+
+# Rotas que leem o corpo em streaming no event loop e delegam cada bloco de
+# acesso ao banco ao threadpool (app.core.streams)
+STREAMING_ROUTES = {
+    "/integrations/assets/upsert",
+    "/integrations/owners/upsert",
+    "/integrations/assets/import",
+    "/integrations/owners/import",
+}
+
+
+def _depends_on(dependant, dependency) -> bool:
+    return any(
+        sub.call is dependency or _depends_on(sub, dependency)
+        for sub in dependant.dependencies
+    )
+
+
+def test_db_routes_do_not_block_event_loop():
+    """Rotas que usam a Session síncrona devem rodar no threadpool (def, não async def)"""
+    blocking = [
+        route.path
+        for route in app.routes
+        if isinstance(route, APIRoute)
+        and _depends_on(route.dependant, get_db)
+        and inspect.iscoroutinefunction(route.endpoint)
+        and route.path not in STREAMING_ROUTES
+    ]
+
+    assert blocking == []
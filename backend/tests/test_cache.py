@@ -0,0 +1,359 @@
+"""
+Testes do cache de entidades (GET /asset/{id} e /owner/{id})
+"""
+import json
+import time
+import uuid
+
+import fakeredis
+import pytest
+import redis
+
+from app.core.cache import CacheBackend, CachedEntity, EntityCache, LRUCache, RedisCache, RedisInvalidationBus, build_entity_cache, entity_cache
+from app.core.config import settings
+from tests.helpers import sample
+
+
+class TestLRUCache:
+    """Estrutura do cache em si"""
+
+    def test_evicts_least_recently_used(self):
+        """Testa o limite de tamanho, mantendo as chaves lidas recentemente"""
+        cache = LRUCache(capacity=2, ttl=60, negative_ttl=60)
+        cache.set("asset:a", b"a")
+        cache.set("asset:b", b"b")
+        cache.get("asset:a")
+        before = sample("cache_evictions_total", entity="asset")
+
+        cache.set("asset:c", b"c")
+
+        assert cache.get("asset:b") == (False, None)
+        assert cache.get("asset:a") == (True, b"a")
+        assert len(cache) == 2
+        assert sample("cache_evictions_total", entity="asset") == before + 1
+
+    def test_entries_expire(self):
+        """Testa a validade separada de entradas positivas e negativas"""
+        cache = LRUCache(capacity=10, ttl=60, negative_ttl=0.01)
+        cache.set("asset:a", b"a")
+        cache.set("asset:missing", None)
+        assert cache.get("asset:missing") == (True, None)
+
+        time.sleep(0.02)
+
+        assert cache.get("asset:missing") == (False, None)
+        assert cache.get("asset:a") == (True, b"a")
+
+    def test_load_racing_invalidation_is_not_stored(self):
+        """Testa que uma leitura iniciada antes de uma invalidação não é gravada"""
+        cache = EntityCache(LRUCache(capacity=10, ttl=60, negative_ttl=60))
+
+        def stale_loader():
+            cache.invalidate("asset", "a")
+            return CachedEntity(1, b"antigo")
+
+        assert cache.get_or_load("asset", "a", stale_loader).body == b"antigo"
+        assert cache.get_or_load("asset", "a", lambda: CachedEntity(2, b"novo")) == (2, b"novo")
+
+
+class TestRedisCache:
+    """Backend compartilhado, contra um servidor Redis em memória (fakeredis)"""
+
+    @pytest.fixture
+    def server(self):
+        return fakeredis.FakeServer()
+
+    def _store(self, server, **kwargs):
+        client = fakeredis.FakeRedis(server=server)
+        return RedisCache(client, **{"ttl": 60, "negative_ttl": 60, "prefix": "test:", **kwargs})
+
+    def test_entries_shared_between_clients(self, server):
+        """Testa valores, "não existe" e remoção vistos por outro worker"""
+        writer, reader = self._store(server), self._store(server)
+        writer.set("asset:a", b'{"id": "a"}')
+        writer.set("asset:missing", None)
+
+        assert reader.get("asset:a") == (True, b'{"id": "a"}')
+        assert reader.get("asset:missing") == (True, None)
+        assert reader.get("asset:other") == (False, None)
+
+        writer.delete("asset:a")
+        assert reader.get("asset:a") == (False, None)
+
+    def test_ttl_applied_by_server(self, server):
+        """Testa a validade das entradas e o prefixo das chaves"""
+        store = self._store(server, ttl=30, negative_ttl=0.05)
+        store.set("owner:a", b"{}")
+        store.set("owner:missing", None)
+
+        assert 0 < store.client.pttl("test:owner:a") <= 30000
+        time.sleep(0.1)
+        assert store.get("owner:missing") == (False, None)
+
+    def test_clear_only_own_prefix(self, server):
+        """Testa que clear() não apaga chaves de outras aplicações"""
+        store = self._store(server)
+        store.set("asset:a", b"{}")
+        store.client.set("outra:chave", b"1")
+
+        store.clear()
+
+        assert store.get("asset:a") == (False, None)
+        assert store.client.get("outra:chave") == b"1"
+
+    def test_load_racing_other_worker_is_not_stored(self, server):
+        """Testa que a leitura de um worker não regrava o valor invalidado por outro"""
+        reader, writer = EntityCache(self._store(server)), EntityCache(self._store(server))
+
+        def stale_loader():
+            # A reserva da leitura em andamento não é vista como entrada
+            assert writer.peek("asset", "a") == (False, None)
+            # Outro worker grava e invalida enquanto esta leitura vai ao banco
+            writer.invalidate("asset", "a")
+            return CachedEntity(1, b"antigo")
+
+        assert reader.get_or_load("asset", "a", stale_loader).body == b"antigo"
+        assert writer.peek("asset", "a") == (False, None)
+
+        assert writer.get_or_load("asset", "a", lambda: CachedEntity(2, b"novo")) == (2, b"novo")
+        assert reader.peek("asset", "a") == (True, CachedEntity(2, b"novo"))
+
+    def test_unreachable_server_degrades_to_miss(self):
+        """Testa que a queda do Redis vira miss, sem erro na requisição"""
+        client = redis.Redis(host="127.0.0.1", port=1, socket_connect_timeout=0.1)
+        cache = EntityCache(RedisCache(client, ttl=60, negative_ttl=60, prefix="test:"))
+        before = sample("cache_errors_total", operation="get")
+
+        assert cache.get_or_load("asset", "a", lambda: CachedEntity(1, b"{}")) == (1, b"{}")
+        cache.invalidate("asset", "a")
+
+        assert sample("cache_errors_total", operation="get") == before + 1
+
+
+class TestInvalidationBus:
+    """Invalidação entre workers por pub/sub"""
+
+    @pytest.fixture
+    def workers(self):
+        """Dois workers, cada um com seu LRU, ligados ao mesmo servidor"""
+        server = fakeredis.FakeServer()
+        caches = [
+            EntityCache(
+                LRUCache(capacity=100, ttl=60, negative_ttl=60),
+                RedisInvalidationBus(fakeredis.FakeRedis(server=server), "test:invalidate"),
+            )
+            for _ in range(2)
+        ]
+        for cache in caches:
+            cache.start()
+        time.sleep(0.1)  # Inscrição no canal
+        yield caches
+        for cache in caches:
+            cache.stop()
+
+    @staticmethod
+    def _wait_until(condition, timeout=2.0):
+        deadline = time.monotonic() + timeout
+        while not condition():
+            assert time.monotonic() < deadline, "Invalidação não recebida"
+            time.sleep(0.005)
+
+    def test_write_in_one_worker_drops_key_in_other(self, workers):
+        """Testa que a escrita em um worker descarta a cópia do outro"""
+        writer, reader = workers
+        reader.get_or_load("owner", "a", lambda: CachedEntity(1, b"antigo"))
+        writer.get_or_load("owner", "a", lambda: CachedEntity(1, b"antigo"))
+
+        writer.invalidate("owner", "a")
+
+        self._wait_until(lambda: reader.store.get("owner:a") == (False, None))
+        assert reader.get_or_load("owner", "a", lambda: CachedEntity(2, b"novo")).body == b"novo"
+
+    def test_own_messages_are_ignored(self, workers):
+        """Testa que o worker não reprocessa as próprias invalidações"""
+        writer, reader = workers
+        writer.invalidate("asset", "a")
+        self._wait_until(lambda: reader._invalidations == 1)
+
+        assert writer._invalidations == 1
+
+
+def test_api_with_redis_backend(client, auth_headers, created_owner, monkeypatch):
+    """Testa leitura e invalidação pela API com o cache no Redis"""
+    store = RedisCache(fakeredis.FakeRedis(), ttl=60, negative_ttl=60, prefix="test:")
+    monkeypatch.setattr(entity_cache, "store", store)
+    url = f"/integrations/owner/{created_owner['id']}"
+
+    assert client.get(url, headers=auth_headers).json() == created_owner
+    assert store.get(f"owner:{created_owner['id']}")[0]
+
+    client.put(url, json={"name": "Outro nome"}, headers=auth_headers)
+
+    assert client.get(url, headers=auth_headers).json()["name"] == "Outro nome"
+
+
+def test_build_entity_cache_validates_settings(monkeypatch):
+    """Testa a escolha do backend pelas configurações"""
+    monkeypatch.setattr(settings, "ENTITY_CACHE_BACKEND", "memcached")
+    with pytest.raises(ValueError):
+        build_entity_cache()
+
+    monkeypatch.setattr(settings, "ENTITY_CACHE_BACKEND", "redis")
+    monkeypatch.setattr(settings, "REDIS_URL", "")
+    with pytest.raises(ValueError):
+        build_entity_cache()
+
+    monkeypatch.setattr(settings, "REDIS_URL", "redis://localhost:6379/0")
+    cache = build_entity_cache()
+    assert isinstance(cache.store, RedisCache)
+    assert cache.bus.channel == settings.ENTITY_CACHE_PREFIX + "invalidate"
+
+
+def test_incomplete_backend_fails_on_instantiation():
+    """Testa que um backend sem todos os métodos não chega a ser criado"""
+    class GetOnly(CacheBackend):
+        def get(self, key):
+            return False, None
+
+    with pytest.raises(TypeError):
+        GetOnly()
+
+
+class TestReadThrough:
+    """Rotas de leitura servidas pelo cache"""
+
+    def test_second_read_skips_database(self, client, auth_headers, created_asset, assert_max_queries):
+        """Testa hit sem consulta ao banco e resposta idêntica"""
+        url = f"/integrations/asset/{created_asset['id']}"
+        first = client.get(url, headers=auth_headers)
+        hits = sample("cache_requests_total", entity="asset", result="hit")
+
+        with assert_max_queries(0):
+            second = client.get(url, headers=auth_headers)
+
+        assert second.status_code == 200
+        assert second.headers["content-type"] == "application/json"
+        assert second.json() == first.json() == created_asset
+        assert sample("cache_requests_total", entity="asset", result="hit") == hits + 1
+
+    def test_missing_id_is_negatively_cached(self, client, auth_headers, assert_max_queries):
+        """Testa que o 404 de um ID inexistente também é guardado"""
+        url = "/integrations/owner/nao-existe"
+        assert client.get(url, headers=auth_headers).status_code == 404
+        negative_hits = sample("cache_requests_total", entity="owner", result="negative_hit")
+
+        with assert_max_queries(0):
+            response = client.get(url, headers=auth_headers)
+
+        assert response.status_code == 404
+        assert sample("cache_requests_total", entity="owner", result="negative_hit") == negative_hits + 1
+
+    def test_disabled_cache_always_queries(self, client, auth_headers, created_owner, assert_max_queries, monkeypatch):
+        """Testa ENTITY_CACHE_ENABLED=false"""
+        monkeypatch.setattr(settings, "ENTITY_CACHE_ENABLED", False)
+        url = f"/integrations/owner/{created_owner['id']}"
+        client.get(url, headers=auth_headers)
+
+        with assert_max_queries(1) as queries:
+            client.get(url, headers=auth_headers)
+
+        assert queries.count == 1
+        assert len(entity_cache.store) == 0
+
+
+class TestInvalidation:
+    """Escritas descartam as entradas afetadas"""
+
+    def test_update_asset(self, client, auth_headers, created_asset):
+        """Testa que a leitura após o PUT vê o novo valor"""
+        url = f"/integrations/asset/{created_asset['id']}"
+        client.get(url, headers=auth_headers)
+
+        client.put(url, json={"name": "Novo nome"}, headers=auth_headers)
+
+        assert client.get(url, headers=auth_headers).json()["name"] == "Novo nome"
+
+    def test_delete_asset(self, client, auth_headers, created_asset):
+        """Testa que o asset removido passa a responder 404"""
+        url = f"/integrations/asset/{created_asset['id']}"
+        client.get(url, headers=auth_headers)
+
+        client.delete(url, headers=auth_headers)
+
+        assert client.get(url, headers=auth_headers).status_code == 404
+
+    def test_update_owner(self, client, auth_headers, created_owner):
+        """Testa que a leitura após o PUT vê o novo valor"""
+        url = f"/integrations/owner/{created_owner['id']}"
+        client.get(url, headers=auth_headers)
+
+        client.put(url, json={"phone": "+55 11 0000-0000"}, headers=auth_headers)
+
+        assert client.get(url, headers=auth_headers).json()["phone"] == "+55 11 0000-0000"
+
+    def test_owner_delete_cascades_to_assets(self, client, auth_headers, created_asset):
+        """Testa que os assets removidos em cascata saem do cache"""
+        asset_url = f"/integrations/asset/{created_asset['id']}"
+        owner_url = f"/integrations/owner/{created_asset['owner']}"
+        client.get(asset_url, headers=auth_headers)
+        client.get(owner_url, headers=auth_headers)
+        before = sample("cache_invalidations_total", entity="asset")
+
+        assert client.delete(owner_url, headers=auth_headers).status_code == 204
+
+        assert client.get(owner_url, headers=auth_headers).status_code == 404
+        assert client.get(asset_url, headers=auth_headers).status_code == 404
+        assert sample("cache_invalidations_total", entity="asset") == before + 1
+
+    def test_upsert_updates_cached_asset(self, client, auth_headers, created_owner):
+        """Testa a invalidação pelo upsert em lote (external_id)"""
+        def upsert(name):
+            row = {"external_id": "ext-1", "name": name, "category": "Equipamento", "owner": created_owner["id"]}
+            response = client.post(
+                "/integrations/assets/upsert?source=erp",
+                content=json.dumps(row) + "\n",
+                headers={**auth_headers, "Content-Type": "application/x-ndjson"},
+            )
+            assert response.status_code == 200
+
+        upsert("Antigo")
+        asset_id = client.get("/integrations/assets", headers=auth_headers).json()[0]["id"]
+        url = f"/integrations/asset/{asset_id}"
+        assert client.get(url, headers=auth_headers).json()["name"] == "Antigo"
+
+        upsert("Novo")
+
+        assert client.get(url, headers=auth_headers).json()["name"] == "Novo"
+
+    @pytest.mark.parametrize("path, bulk", [
+        ("asset", False), ("assets/bulk", True), ("owner", False), ("owners/bulk", True),
+    ])
+    def test_create_drops_negative_entry(
+        self, client, auth_headers, created_owner, sample_asset_data, path, bulk, monkeypatch
+    ):
+        """Testa que o 404 em cache de um id não sobrevive à criação com esse id"""
+        new_id = uuid.uuid4()
+        entity = path.split("/")[0].rstrip("s")
+        url = f"/integrations/{entity}/{new_id}"
+        assert client.get(url, headers=auth_headers).status_code == 404
+
+        monkeypatch.setattr(uuid, "uuid4", lambda: new_id)
+        monkeypatch.setattr(f"app.services.{entity}_service.new_ids", lambda count: [str(new_id)] * count)
+        if entity == "asset":
+            item = {**sample_asset_data, "owner": created_owner["id"]}
+        else:
+            item = {"name": "Maria", "email": "maria@empresa.com", "phone": "1"}
+        response = client.post(
+            f"/integrations/{path}", json={"items": [item]} if bulk else item, headers=auth_headers
+        )
+        assert response.status_code in (200, 201)
+
+        assert client.get(url, headers=auth_headers).status_code == 200
+
+
+@pytest.mark.parametrize("entity", ["asset", "owner"])
+def test_invalidate_without_ids_is_noop(entity):
+    """Testa que escritas sem linhas existentes não contam invalidações"""
+    before = sample("cache_invalidations_total", entity=entity)
+    entity_cache.invalidate(entity)
+    assert sample("cache_invalidations_total", entity=entity) == before
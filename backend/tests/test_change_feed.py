@@ -0,0 +1,177 @@
+"""
+Testes do feed de alterações em tempo real (GET /changes/stream, SSE)
+"""
+import json
+import logging
+import time
+
+import pytest
+from prometheus_client import REGISTRY
+from sqlalchemy.orm import sessionmaker
+
+from app.core.change_feed import ChangeFeed
+from app.core.config import settings
+from app.core.security import RedactAccessTokenFilter
+from app.schemas.asset import AssetCreate, AssetUpdate
+from app.services.asset_service import AssetService
+
+
+@pytest.fixture
+def short_streams(monkeypatch):
+    """Conexões que terminam logo, sem leituras periódicas concorrentes"""
+    monkeypatch.setattr(settings, "CHANGE_FEED_MAX_AGE", 0.2)
+    monkeypatch.setattr(settings, "CHANGE_FEED_POLL_INTERVAL", 60)
+
+
+def _events(body):
+    """(id, event, data) de cada evento do corpo SSE"""
+    events = []
+    for block in body.split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines() if not line.startswith(":"))
+        if "data" in fields:
+            events.append((int(fields["id"]), fields["event"], json.loads(fields["data"])))
+    return events
+
+
+class TestStreamEndpoint:
+    """GET /integrations/changes/stream"""
+
+    def test_resumes_from_last_event_id(self, client, auth_headers, created_asset, short_streams):
+        """Testa a retomada com Last-Event-ID e o fim da conexão em CHANGE_FEED_MAX_AGE"""
+        response = client.get(
+            "/integrations/changes/stream", headers={**auth_headers, "Last-Event-ID": "1"}
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert response.headers["cache-control"] == "no-store"
+        assert response.text.startswith("retry: 3000\n\n")
+        assert [(seq, event, data["operation"]) for seq, event, data in _events(response.text)] == [
+            (2, "asset", "create")
+        ]
+        assert _events(response.text)[0][2]["data"]["name"] == created_asset["name"]
+
+    def test_without_position_sends_only_new_changes(self, client, auth_headers, created_asset, short_streams):
+        """Testa que sem since/Last-Event-ID só há keep-alive"""
+        response = client.get("/integrations/changes/stream", headers=auth_headers)
+
+        assert _events(response.text) == []
+        assert ": ping" in response.text
+
+    def test_entity_filter_and_query_token(self, client, auth_headers, created_asset, short_streams):
+        """Testa o token em access_token (EventSource) e o filtro por entidade"""
+        token = auth_headers["Authorization"].split()[1]
+        response = client.get(f"/integrations/changes/stream?since=0&entity=owner&access_token={token}")
+
+        assert [(seq, event) for seq, event, _ in _events(response.text)] == [(1, "owner")]
+
+    def test_stream_kept_out_of_request_latency(self, client, auth_headers, short_streams):
+        """Testa que a conexão longa tem métrica própria, fora da latência HTTP"""
+        labels = {"method": "GET", "route": "/integrations/changes/stream"}
+        latency = REGISTRY.get_sample_value("http_request_duration_seconds_count", labels) or 0
+        connections = REGISTRY.get_sample_value("change_feed_connection_duration_seconds_count") or 0
+
+        assert client.get("/integrations/changes/stream", headers=auth_headers).status_code == 200
+
+        assert (REGISTRY.get_sample_value("http_request_duration_seconds_count", labels) or 0) == latency
+        assert REGISTRY.get_sample_value("change_feed_connection_duration_seconds_count") == connections + 1
+        assert REGISTRY.get_sample_value("http_requests_in_progress") == 0
+
+    def test_rejects_bad_requests(self, client, auth_headers):
+        """Testa acesso sem token e Last-Event-ID inválido"""
+        assert client.get("/integrations/changes/stream").status_code == 403
+        assert client.get("/integrations/changes/stream?access_token=x").status_code == 401
+        response = client.get("/integrations/changes/stream", headers={**auth_headers, "Last-Event-ID": "abc"})
+        assert response.status_code == 400
+
+
+def test_access_log_hides_query_token():
+    """Testa que o token da query string não aparece no log de acesso"""
+    record = logging.LogRecord(
+        "uvicorn.access", logging.INFO, __file__, 0, '%s - "%s %s HTTP/%s" %d',
+        ("127.0.0.1:5000", "GET", "/integrations/changes/stream?access_token=eyJ.abc-1&since=3", "1.1", 200),
+        None,
+    )
+
+    assert RedactAccessTokenFilter().filter(record)
+
+    assert record.getMessage() == (
+        '127.0.0.1:5000 - "GET /integrations/changes/stream?access_token=***&since=3 HTTP/1.1" 200'
+    )
+
+
+class TestChangeFeed:
+    """Distribuição dos eventos entre as conexões"""
+
+    @pytest.fixture
+    def feed(self, db_session, created_owner, monkeypatch):
+        monkeypatch.setattr(settings, "CHANGE_FEED_POLL_INTERVAL", 60)
+        monkeypatch.setattr(settings, "CHANGE_FEED_HEARTBEAT", 0.05)
+        return ChangeFeed(sessionmaker(bind=db_session.get_bind(), expire_on_commit=False))
+
+    @staticmethod
+    async def _until_idle(stream):
+        """Consome o stream até o primeiro keep-alive (releitura concluída)"""
+        frames = []
+        async for frame in stream:
+            if frame == b": ping\n\n":
+                return frames
+            frames.append(frame)
+
+    async def test_pushes_new_changes(self, feed, db_session, created_owner, monkeypatch):
+        """Testa que uma escrita notificada chega à conexão aberta"""
+        feed.start()
+        try:
+            stream = feed.stream(None, None, time.monotonic() + 5)
+            assert await self._until_idle(stream) == [b"retry: 3000\n\n"]
+            monkeypatch.setattr(settings, "CHANGE_FEED_HEARTBEAT", 60)
+
+            asset = AssetService.create_asset(
+                db_session, AssetCreate(name="Notebook", category="Notebook", owner=created_owner["id"])
+            )
+            feed.notify()
+            frame = await stream.__anext__()
+
+            assert frame.startswith(b"id: 2\nevent: asset\ndata: ")
+            assert asset.id.encode() in frame
+            await stream.aclose()
+            assert feed.connections == 0
+        finally:
+            await feed.stop()
+
+    async def test_full_queue_falls_back_to_change_log(self, feed, db_session, created_owner, monkeypatch):
+        """Testa que a conexão lenta descarta a fila e relê tudo do change_log, em ordem"""
+        monkeypatch.setattr(settings, "CHANGE_FEED_QUEUE_SIZE", 1)
+        feed.start()
+        try:
+            stream = feed.stream(1, "asset", time.monotonic() + 5)
+            await self._until_idle(stream)
+            monkeypatch.setattr(settings, "CHANGE_FEED_HEARTBEAT", 60)
+
+            items = [AssetCreate(name=f"Ativo {i}", category="Notebook", owner=created_owner["id"]) for i in range(3)]
+            AssetService.create_assets_bulk(db_session, items)
+            AssetService.update_asset(db_session, AssetService.get_assets(db_session)[0].id, AssetUpdate(name="X"))
+            lagged = REGISTRY.get_sample_value("change_feed_lagged_total")
+            feed.notify()
+
+            frames = [await stream.__anext__() for _ in range(3)]
+
+            # Releitura: uma entrada por registro, a alteração no seq 5
+            seqs = [int(frame.split(b"\n")[0][4:]) for frame in frames]
+            assert seqs == sorted(seqs) and seqs[-1] == 5
+            assert b'"name":"X"' in frames[-1]
+            assert REGISTRY.get_sample_value("change_feed_lagged_total") == lagged + 1
+        finally:
+            await feed.stop()
+
+    async def test_stop_closes_streams(self, feed):
+        """Testa que o shutdown encerra as conexões abertas"""
+        feed.start()
+        stream = feed.stream(None, None, time.monotonic() + 5)
+        await self._until_idle(stream)
+
+        await feed.stop()
+
+        with pytest.raises(StopAsyncIteration):
+            while True:
+                await stream.__anext__()
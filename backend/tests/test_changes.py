@@ -0,0 +1,160 @@
+"""
+Testes do change_log e da sincronização incremental (GET /changes)
+"""
+import json
+
+from sqlalchemy import select
+
+from app.db.models.change_log import ChangeLog
+from app.db.models.table_version import TableVersion
+
+
+def _changes(client, auth_headers, since=0, limit=None):
+    params = {"since": since}
+    if limit is not None:
+        params["limit"] = limit
+    response = client.get("/integrations/changes", params=params, headers=auth_headers)
+    assert response.status_code == 200
+    return response.json()
+
+
+def _log(db_session):
+    rows = db_session.execute(select(ChangeLog).order_by(ChangeLog.seq)).scalars().all()
+    return [(row.seq, row.entity, row.entity_id, row.operation) for row in rows]
+
+
+class TestChangeLog:
+    """Gravação do change_log pelos serviços"""
+
+    def test_writes_are_recorded_in_order(self, client, auth_headers, created_asset, db_session):
+        """Testa criação, alteração e remoção com seq contínuos"""
+        asset_id, owner_id = created_asset["id"], created_asset["owner"]
+        client.put(f"/integrations/asset/{asset_id}", json={"name": "Novo"}, headers=auth_headers)
+        client.delete(f"/integrations/asset/{asset_id}", headers=auth_headers)
+
+        assert _log(db_session) == [
+            (1, "owner", owner_id, "create"),
+            (2, "asset", asset_id, "create"),
+            (3, "asset", asset_id, "update"),
+            (4, "asset", asset_id, "delete"),
+        ]
+
+    def test_noop_update_is_not_recorded(self, client, auth_headers, created_asset, db_session):
+        """Testa que um PUT com os mesmos valores não gera alteração"""
+        response = client.put(
+            f"/integrations/asset/{created_asset['id']}",
+            json={"name": created_asset["name"]},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 200
+        assert len(_log(db_session)) == 2
+
+    def test_owner_delete_records_cascaded_assets(self, client, auth_headers, created_asset, db_session):
+        """Testa as remoções dos ativos apagados junto com o responsável"""
+        client.delete(f"/integrations/owner/{created_asset['owner']}", headers=auth_headers)
+
+        assert _log(db_session)[2:] == [
+            (3, "owner", created_asset["owner"], "delete"),
+            (4, "asset", created_asset["id"], "delete"),
+        ]
+
+    def test_upsert_records_only_written_rows(self, client, auth_headers, db_session):
+        """Testa que o upsert separa criações e alterações e ignora linhas inalteradas"""
+        def upsert(*rows):
+            client.post(
+                "/integrations/owners/upsert?source=erp",
+                content="".join(json.dumps(row) + "\n" for row in rows),
+                headers={**auth_headers, "Content-Type": "application/x-ndjson"},
+            )
+
+        first = {"external_id": "o-1", "name": "Um", "email": "o1@empresa.com", "phone": "1"}
+        second = {"external_id": "o-2", "name": "Dois", "email": "o2@empresa.com", "phone": "2"}
+        upsert(first)
+        upsert({**first, "name": "Um (novo)"}, second)
+
+        assert [(entity, operation) for _, entity, _, operation in _log(db_session)] == [
+            ("owner", "create"), ("owner", "create"), ("owner", "update"),
+        ]
+
+
+class TestChangesEndpoint:
+    """GET /integrations/changes"""
+
+    def test_returns_latest_state_once_per_record(self, client, auth_headers, created_asset):
+        """Testa que cada registro aparece uma vez, com o estado atual"""
+        client.put(f"/integrations/asset/{created_asset['id']}", json={"name": "Novo"}, headers=auth_headers)
+
+        batch = _changes(client, auth_headers)
+
+        assert batch["has_more"] is False
+        assert batch["next_since"] == 3
+        assert [(c["seq"], c["entity"], c["operation"]) for c in batch["changes"]] == [
+            (1, "owner", "create"),
+            (3, "asset", "update"),
+        ]
+        assert batch["changes"][1]["data"]["name"] == "Novo"
+
+    def test_batches_until_caught_up(self, client, auth_headers, created_owner, sample_asset_data):
+        """Testa a paginação por next_since/has_more"""
+        items = [{**sample_asset_data, "owner": created_owner["id"]} for _ in range(5)]
+        client.post("/integrations/assets/bulk", json={"items": items}, headers=auth_headers)
+
+        seen, since, batches = [], 0, 0
+        while True:
+            batch = _changes(client, auth_headers, since=since, limit=2)
+            seen.extend(c["seq"] for c in batch["changes"])
+            since, batches = batch["next_since"], batches + 1
+            if not batch["has_more"]:
+                break
+
+        assert seen == [1, 2, 3, 4, 5, 6]
+        assert batches == 3
+        assert _changes(client, auth_headers, since=since) == {"changes": [], "next_since": 6, "has_more": False}
+
+    def test_cascade_delete_returns_tombstones(self, client, auth_headers, created_asset):
+        """Testa as remoções (sem data) do responsável e dos seus ativos"""
+        since = _changes(client, auth_headers)["next_since"]
+        client.delete(f"/integrations/owner/{created_asset['owner']}", headers=auth_headers)
+
+        changes = _changes(client, auth_headers, since=since)["changes"]
+
+        assert [(c["entity"], c["id"], c["operation"]) for c in changes] == [
+            ("owner", created_asset["owner"], "delete"),
+            ("asset", created_asset["id"], "delete"),
+        ]
+        assert all("data" not in c for c in changes)
+
+    def test_record_deleted_in_a_later_batch_is_a_tombstone(self, client, auth_headers, created_asset):
+        """Testa que uma criação cujo registro já foi removido vem como remoção"""
+        client.delete(f"/integrations/asset/{created_asset['id']}", headers=auth_headers)
+
+        batch = _changes(client, auth_headers, limit=2)
+
+        assert batch["has_more"] is True
+        assert (batch["changes"][1]["operation"], batch["changes"][1]["seq"]) == ("delete", 2)
+
+    def test_cost_does_not_grow_with_changes(
+        self, client, auth_headers, created_owner, sample_asset_data, assert_max_queries
+    ):
+        """Testa um lote com uma consulta ao change_log e uma por entidade"""
+        items = [{**sample_asset_data, "owner": created_owner["id"]} for _ in range(50)]
+        client.post("/integrations/assets/bulk", json={"items": items}, headers=auth_headers)
+
+        with assert_max_queries(3):
+            batch = _changes(client, auth_headers)
+
+        assert len(batch["changes"]) == 51
+
+    def test_seq_beyond_32_bits(self, client, auth_headers, created_owner, sample_asset_data, db_session):
+        """Testa que o seq não estoura em 2^31 (BIGINT no PostgreSQL)"""
+        db_session.query(TableVersion).filter(TableVersion.name == "change_log").update({"version": 2**31})
+        db_session.commit()
+
+        client.post("/integrations/asset", json={**sample_asset_data, "owner": created_owner["id"]}, headers=auth_headers)
+
+        assert _changes(client, auth_headers, since=2**31)["changes"][0]["seq"] == 2**31 + 1
+
+    def test_requires_authentication(self, client):
+        """Testa o acesso sem token"""
+        assert client.get("/integrations/changes").status_code == 403
@@ -0,0 +1,171 @@
+"""
+Testes dos GETs condicionais (ETag / If-None-Match) e do Cache-Control
+"""
+import json
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.core.cache import entity_cache
+from app.db.models.asset import Asset
+from app.db.versions import bump_table_version, get_table_version
+from app.schemas.asset import AssetUpdate
+from app.services.asset_service import AssetService
+
+
+def _get(client, url, auth_headers, etag=None):
+    headers = {**auth_headers, "If-None-Match": etag} if etag else auth_headers
+    return client.get(url, headers=headers)
+
+
+class TestEntityETag:
+    """GET /asset/{id} e /owner/{id}"""
+
+    @pytest.mark.parametrize("kind", ["asset", "owner"])
+    def test_not_modified_without_query(self, client, auth_headers, created_asset, assert_max_queries, kind):
+        """Testa 304 sem corpo e sem consulta com a entidade no cache"""
+        entity_id = created_asset["id"] if kind == "asset" else created_asset["owner"]
+        url = f"/integrations/{kind}/{entity_id}"
+        first = _get(client, url, auth_headers)
+        assert first.headers["etag"] == '"1"'
+        assert first.headers["cache-control"] == "private, no-cache"
+
+        with assert_max_queries(0):
+            response = _get(client, url, auth_headers, first.headers["etag"])
+
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == '"1"'
+
+    def test_not_modified_on_cache_miss_reads_only_version(
+        self, client, auth_headers, created_asset, assert_max_queries
+    ):
+        """Testa que, fora do cache, a ETag é conferida com uma consulta à versão"""
+        url = f"/integrations/asset/{created_asset['id']}"
+        etag = _get(client, url, auth_headers).headers["etag"]
+        entity_cache.clear()
+
+        with assert_max_queries(1) as queries:
+            response = _get(client, url, auth_headers, etag)
+
+        assert response.status_code == 304
+        assert "version" in queries.statements[0] and "name" not in queries.statements[0]
+
+    def test_update_changes_etag(self, client, auth_headers, created_asset):
+        """Testa que a ETag antiga deixa de valer após o PUT"""
+        url = f"/integrations/asset/{created_asset['id']}"
+        etag = _get(client, url, auth_headers).headers["etag"]
+
+        client.put(url, json={"name": "Novo nome"}, headers=auth_headers)
+        response = _get(client, url, auth_headers, etag)
+
+        assert response.status_code == 200
+        assert response.json()["name"] == "Novo nome"
+        assert response.headers["etag"] == '"2"'
+
+    def test_upsert_changes_etag(self, client, auth_headers):
+        """Testa que o upsert incrementa a versão só das linhas alteradas"""
+        def upsert(name):
+            row = {"external_id": "o-1", "name": name, "email": "o1@empresa.com", "phone": "1"}
+            response = client.post(
+                "/integrations/owners/upsert?source=erp",
+                content=json.dumps(row) + "\n",
+                headers={**auth_headers, "Content-Type": "application/x-ndjson"},
+            )
+            assert response.status_code == 200
+
+        upsert("Antigo")
+        owner_id = client.get("/integrations/owners", headers=auth_headers).json()[0]["id"]
+        url = f"/integrations/owner/{owner_id}"
+
+        upsert("Antigo")
+        assert _get(client, url, auth_headers).headers["etag"] == '"1"'
+        upsert("Novo")
+        assert _get(client, url, auth_headers).headers["etag"] == '"2"'
+
+    def test_stale_or_foreign_etag(self, client, auth_headers, created_owner):
+        """Testa listas de ETags, ETag fraca e `*`"""
+        url = f"/integrations/owner/{created_owner['id']}"
+
+        assert _get(client, url, auth_headers, '"7"').status_code == 200
+        assert _get(client, url, auth_headers, '"7", W/"1"').status_code == 304
+        assert _get(client, url, auth_headers, "*").status_code == 304
+        assert _get(client, "/integrations/owner/nao-existe", auth_headers, "*").status_code == 404
+
+
+class TestListETag:
+    """GET /assets e /owners"""
+
+    def test_not_modified_runs_only_counter_query(self, client, auth_headers, created_asset, assert_max_queries):
+        """Testa 304 da listagem com uma única consulta ao contador"""
+        first = _get(client, "/integrations/assets", auth_headers)
+        assert first.headers["cache-control"] == "private, no-cache"
+
+        with assert_max_queries(1):
+            response = _get(client, "/integrations/assets", auth_headers, first.headers["etag"])
+
+        assert response.status_code == 304
+
+    @pytest.mark.parametrize("write", ["create", "update", "delete_owner"])
+    def test_writes_change_list_etag(self, client, auth_headers, created_asset, sample_asset_data, write):
+        """Testa criação, atualização e a remoção em cascata pelo responsável"""
+        etag = _get(client, "/integrations/assets", auth_headers).headers["etag"]
+
+        if write == "create":
+            client.post(
+                "/integrations/asset",
+                json={**sample_asset_data, "owner": created_asset["owner"]},
+                headers=auth_headers,
+            )
+        elif write == "update":
+            client.put(f"/integrations/asset/{created_asset['id']}", json={"name": "X"}, headers=auth_headers)
+        else:
+            client.delete(f"/integrations/owner/{created_asset['owner']}", headers=auth_headers)
+
+        response = _get(client, "/integrations/assets", auth_headers, etag)
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+
+    def test_owner_writes_do_not_change_asset_list(self, client, auth_headers, created_asset):
+        """Testa que cada listagem tem seu contador"""
+        etag = _get(client, "/integrations/assets", auth_headers).headers["etag"]
+
+        client.put(f"/integrations/owner/{created_asset['owner']}", json={"name": "Outro"}, headers=auth_headers)
+
+        assert _get(client, "/integrations/assets", auth_headers, etag).status_code == 304
+
+
+def test_concurrent_update_gets_new_version(db_session, created_asset):
+    """Testa que a escrita sobre uma versão já alterada é repetida, sem repetir a versão"""
+    stale = db_session.get(Asset, created_asset["id"])
+    other = Session(bind=db_session.get_bind(), expire_on_commit=False)
+    try:
+        AssetService.update_asset(other, created_asset["id"], AssetUpdate(name="Outra sessão"))
+    finally:
+        other.close()
+    assert stale.version == 1
+
+    updated = AssetService.update_asset(db_session, created_asset["id"], AssetUpdate(category="Veículo"))
+
+    assert (updated.version, updated.name, updated.category) == (3, "Outra sessão", "Veículo")
+
+
+def test_table_version_counter(db_session):
+    """Testa o contador: 0 antes da primeira escrita e incremento por transação"""
+    assert get_table_version(db_session, "assets") == 0
+
+    bump_table_version(db_session, "assets")
+    bump_table_version(db_session, "assets", "owners")
+    db_session.commit()
+
+    assert get_table_version(db_session, "assets") == 2
+    assert get_table_version(db_session, "owners") == 1
+
+
+def test_no_store_routes(client, auth_headers):
+    """Testa que token e exportações não ficam em caches"""
+    login = client.post("/integrations/login", data={"username": "eyesonasset", "password": "eyesonasset"})
+    export = client.get("/integrations/owners/export", headers=auth_headers)
+
+    assert login.headers["cache-control"] == "no-store"
+    assert export.headers["cache-control"] == "no-store"
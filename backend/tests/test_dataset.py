@@ -0,0 +1,118 @@
+"""
+Testes do gerador de dados sintéticos
+"""
+import uuid
+from collections import Counter
+
+import pytest
+from sqlalchemy import create_engine, inspect, select
+from sqlalchemy.exc import IntegrityError
+
+from app.db.base import Base
+from app.db.change_log import CHANGE_LOG_COUNTER
+from app.db.dataset import CATEGORIES, generate_dataset, truncate
+from app.db.models.asset import Asset
+from app.db.models.change_log import ChangeLog
+from app.db.models.owner import Owner
+from app.db.sqlite import configure_sqlite
+from app.db.versions import get_table_version
+
+
+@pytest.fixture
+def dataset_engine(tmp_path):
+    """Banco SQLite em arquivo com o perfil da aplicação (WAL)"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'dataset.db'}")
+    configure_sqlite(engine)
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+def _rows(engine, model):
+    with engine.connect() as connection:
+        return connection.execute(select(model.__table__).order_by(model.id)).all()
+
+
+def test_generates_requested_volume(dataset_engine):
+    """Testa contagens, IDs UUID v4 e referências válidas"""
+    dataset = generate_dataset(dataset_engine, owners=50, assets=2000, heavy_owners=2, heavy_owner_assets=300)
+
+    owners, assets = _rows(dataset_engine, Owner), _rows(dataset_engine, Asset)
+    assert (dataset.owners, dataset.assets) == (len(owners), len(assets)) == (50, 2000)
+    assert all(uuid.UUID(row.id).version == 4 for row in owners + assets)
+    assert {row.owner for row in assets} <= {row.id for row in owners}
+    assert set(dataset.asset_sample) <= {row.id for row in assets}
+    assert {row.category for row in assets} <= set(CATEGORIES)
+
+
+def test_skew_and_category_distribution(dataset_engine):
+    """Testa os responsáveis pesados e a predominância das categorias comuns"""
+    dataset = generate_dataset(dataset_engine, owners=100, assets=5000, heavy_owners=3, heavy_owner_assets=500)
+
+    per_owner = Counter(row.owner for row in _rows(dataset_engine, Asset))
+    assert [per_owner[owner_id] for owner_id in dataset.owner_ids[:3]] == [500, 500, 500]
+    assert max(per_owner[owner_id] for owner_id in dataset.owner_ids[3:]) < 500
+
+    categories = Counter(row.category for row in _rows(dataset_engine, Asset))
+    assert categories["Notebook"] > categories["Servidor"] > categories["Aeronave"]
+
+
+def test_same_seed_same_database(tmp_path):
+    """Testa a reprodutibilidade a partir da semente"""
+    contents = []
+    for name, seed in (("a", 7), ("b", 7), ("c", 8)):
+        engine = create_engine(f"sqlite:///{tmp_path / name}.db")
+        Base.metadata.create_all(engine)
+        generate_dataset(engine, owners=20, assets=500, seed=seed, heavy_owners=1, heavy_owner_assets=100)
+        contents.append((_rows(engine, Owner), _rows(engine, Asset)))
+        engine.dispose()
+
+    assert contents[0] == contents[1]
+    assert contents[0] != contents[2]
+
+
+def test_load_restores_pragmas_and_indexes(dataset_engine):
+    """Testa que o perfil do SQLite e os índices voltam ao normal após a carga"""
+    generate_dataset(dataset_engine, owners=10, assets=100)
+
+    with dataset_engine.connect() as connection:
+        assert connection.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+        assert connection.exec_driver_sql("PRAGMA synchronous").scalar() == 1
+    indexes = {index["name"] for index in inspect(dataset_engine).get_indexes("assets")}
+    assert {index.name for index in Asset.__table__.indexes} <= indexes
+
+
+def test_duplicate_load_fails_atomically(dataset_engine):
+    """Testa que uma segunda carga com os mesmos dados falha sem gravar nada"""
+    generate_dataset(dataset_engine, owners=10, assets=100)
+
+    with pytest.raises(IntegrityError):
+        generate_dataset(dataset_engine, owners=10, assets=100)
+
+    assert len(_rows(dataset_engine, Asset)) == 100
+    indexes = {index["name"] for index in inspect(dataset_engine).get_indexes("assets")}
+    assert "ix_assets_owner_id" in indexes
+    truncate(dataset_engine)
+    assert _rows(dataset_engine, Owner) == []
+
+
+def test_assets_require_owners(dataset_engine):
+    """Testa a validação dos parâmetros"""
+    with pytest.raises(ValueError):
+        generate_dataset(dataset_engine, owners=0, assets=10)
+
+
+def test_load_and_truncate_are_recorded_in_change_log(dataset_engine):
+    """Testa que a carga e a limpeza entram no change_log, em seq contínuos"""
+    generate_dataset(dataset_engine, owners=10, assets=100, heavy_owners=1, heavy_owner_assets=20)
+    truncate(dataset_engine)
+
+    with dataset_engine.connect() as connection:
+        rows = connection.execute(select(ChangeLog.__table__).order_by(ChangeLog.seq)).all()
+        counter = get_table_version(connection, CHANGE_LOG_COUNTER)
+
+    assert [row.seq for row in rows] == list(range(1, 221))
+    assert Counter((row.entity, row.operation) for row in rows) == {
+        ("owner", "create"): 10, ("asset", "create"): 100, ("asset", "delete"): 100, ("owner", "delete"): 10,
+    }
+    assert counter == 220
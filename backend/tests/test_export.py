@@ -0,0 +1,57 @@
+"""
+Testes da exportação em streaming (NDJSON/CSV)
+"""
+import csv
+import io
+import json
+
+
+class TestExportRoutes:
+    """Testes para as rotas de exportação"""
+    
+    def test_export_assets_ndjson(self, client, auth_headers, created_owner):
+        """Testa exportação de todos os ativos em NDJSON, ordenados por ID"""
+        items = [
+            {"name": f"Asset {i}", "category": "Export", "owner": created_owner["id"]}
+            for i in range(25)
+        ]
+        client.post("/integrations/assets/bulk", json={"items": items}, headers=auth_headers)
+        
+        response = client.get("/integrations/assets/export", headers=auth_headers)
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert len(rows) == 25
+        assert [r["id"] for r in rows] == sorted(r["id"] for r in rows)
+        assert set(rows[0]) == {"id", "name", "category", "owner", "source", "external_id"}
+    
+    def test_export_owners_csv(self, client, auth_headers, created_owner):
+        """Testa exportação de responsáveis em CSV com cabeçalho"""
+        response = client.get("/integrations/owners/export?format=csv", headers=auth_headers)
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        assert 'filename="owners.csv"' in response.headers["content-disposition"]
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert len(rows) == 1
+        assert rows[0]["email"] == created_owner["email"]
+    
+    def test_export_empty_table(self, client, auth_headers):
+        """Testa exportação de tabela vazia"""
+        response = client.get("/integrations/assets/export?format=csv", headers=auth_headers)
+        
+        assert response.status_code == 200
+        assert response.text == "id,name,category,owner,source,external_id\n"
+    
+    def test_export_invalid_format(self, client, auth_headers):
+        """Testa erro com formato não suportado"""
+        response = client.get("/integrations/assets/export?format=xml", headers=auth_headers)
+        
+        assert response.status_code == 422
+    
+    def test_export_unauthorized(self, client):
+        """Testa que a exportação exige autenticação"""
+        response = client.get("/integrations/owners/export")
+        
+        assert response.status_code == 403
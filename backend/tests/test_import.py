@@ -0,0 +1,83 @@
+"""
+Testes da importação em streaming (NDJSON/CSV, gzip)
+"""
+import gzip
+import json
+
+
+class TestImportRoutes:
+    """Testes para as rotas de importação"""
+    
+    def test_import_owners_csv(self, client, auth_headers, created_owner):
+        """Testa importação CSV com rejeições por linha"""
+        body = (
+            "name,email,phone\n"
+            "Ana,ana@empresa.com,+55 11 1111-1111\n"
+            '"Silva, Bia",bia@empresa.com,+55 11 2222-2222\n'
+            f"Repetido,{created_owner['email']},1\n"
+            "Sem email,,1\n"
+            '"Nome com\nquebra",quebra@empresa.com,1\n'
+            "Colunas,demais@empresa.com,1,extra\n"
+        )
+        
+        response = client.post(
+            "/integrations/owners/import",
+            content=body.encode(),
+            headers={**auth_headers, "Content-Type": "text/csv"}
+        )
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert (data["received"], data["created"], data["failed"]) == (6, 3, 3)
+        assert {e["line"]: e["error"] for e in data["errors"]}[4] == "Email já cadastrado"
+        assert [e["line"] for e in data["errors"]] == [4, 5, 8]
+        
+        owners = client.get("/integrations/owners", headers=auth_headers).json()
+        names = {owner["name"] for owner in owners}
+        assert {"Silva, Bia", "Nome com\nquebra"} <= names
+    
+    def test_import_assets_ndjson_gzip_in_chunks(self, client, auth_headers, created_owner):
+        """Testa importação NDJSON comprimida com commit a cada bloco"""
+        lines = [
+            json.dumps({"name": f"Asset {i}", "category": "Import", "owner": created_owner["id"]})
+            for i in range(10)
+        ]
+        lines.insert(5, json.dumps({"name": "Órfão", "category": "Import", "owner": "inexistente"}))
+        body = gzip.compress(("\n".join(lines) + "\n").encode())
+        
+        response = client.post(
+            "/integrations/assets/import?chunk_size=4",
+            content=body,
+            headers={
+                **auth_headers,
+                "Content-Type": "application/x-ndjson",
+                "Content-Encoding": "gzip"
+            }
+        )
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert (data["received"], data["created"], data["chunks"]) == (11, 10, 3)
+        assert data["errors"] == [
+            {"line": 6, "error": "Owner com ID inexistente não encontrado"}
+        ]
+    
+    def test_import_invalid_gzip(self, client, auth_headers):
+        """Testa erro com corpo gzip corrompido"""
+        response = client.post(
+            "/integrations/assets/import",
+            content=b"isto nao e gzip",
+            headers={**auth_headers, "Content-Encoding": "gzip"}
+        )
+        
+        assert response.status_code == 400
+    
+    def test_import_unsupported_encoding(self, client, auth_headers):
+        """Testa erro com Content-Encoding não suportado"""
+        response = client.post(
+            "/integrations/assets/import",
+            content=b"{}",
+            headers={**auth_headers, "Content-Encoding": "br"}
+        )
+        
+        assert response.status_code == 415
@@ -0,0 +1,41 @@
+"""
+Testes do endpoint /metrics
+"""
+from tests.helpers import sample
+
+
+def test_request_metrics_use_route_template(client, auth_headers, created_asset):
+    """Testa contagem e latência por template de rota, com estatísticas de banco"""
+    route = "/integrations/asset/{asset_id}"
+    before = sample("http_requests_total", method="GET", route=route, status="200")
+    queries_before = sample("http_request_db_queries_sum", route=route)
+
+    response = client.get(f"/integrations/asset/{created_asset['id']}", headers=auth_headers)
+    assert response.status_code == 200
+
+    assert sample("http_requests_total", method="GET", route=route, status="200") == before + 1
+    assert sample("http_request_duration_seconds_count", method="GET", route=route) >= 1
+    assert sample("http_request_db_queries_sum", route=route) > queries_before
+    assert sample("http_requests_in_progress") == 0
+
+
+def test_unmatched_routes_share_one_label(client):
+    """Testa que paths desconhecidos não criam uma série por path"""
+    before = sample("http_requests_total", method="GET", route="unmatched", status="404")
+
+    client.get("/nao-existe/123")
+
+    assert sample("http_requests_total", method="GET", route="unmatched", status="404") == before + 1
+
+
+def test_metrics_endpoint(client, auth_headers):
+    """Testa o formato de /metrics, incluindo pool e tempo do bcrypt"""
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert "http_request_duration_seconds_bucket" in body
+    assert "db_query_duration_seconds_count" in body
+    assert "db_pool_checkouts_total" in body
+    assert 'password_hash_duration_seconds_count{operation="verify"}' in body
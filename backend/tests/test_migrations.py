@@ -0,0 +1,76 @@
+"""
+Testes das migrações do Alembic e da verificação de revisão no startup
+"""
+import os
+
+import pytest
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.runtime.migration import MigrationContext
+from sqlalchemy import inspect, text
+
+from app.db.base import Base, build_engine
+from app.db.migrations import alembic_config, check_revision, current_revision, head_revision
+
+
+@pytest.fixture
+def migration_engine(tmp_path):
+    """Engine de um banco SQLite vazio em arquivo"""
+    engine = build_engine(f"sqlite:///{os.path.join(tmp_path, 'migracoes.db')}")
+    yield engine
+    engine.dispose()
+
+
+def upgrade(engine, revision="head"):
+    config = alembic_config()
+    config.attributes["configure_logger"] = False
+    with engine.connect() as connection:
+        config.attributes["connection"] = connection
+        command.upgrade(config, revision)
+        connection.commit()
+
+
+def test_migrations_match_models(migration_engine):
+    """Testa que o schema das migrações é idêntico ao dos modelos"""
+    upgrade(migration_engine)
+
+    with migration_engine.connect() as connection:
+        diff = compare_metadata(MigrationContext.configure(connection), Base.metadata)
+
+    assert diff == []
+    indexes = {index["name"] for index in inspect(migration_engine).get_indexes("assets")}
+    assert "ix_assets_owner_name" in indexes
+
+
+def test_check_revision(migration_engine):
+    """Testa que a inicialização recusa banco não migrado ou desatualizado"""
+    with pytest.raises(RuntimeError, match="alembic upgrade head"):
+        check_revision(migration_engine)
+
+    upgrade(migration_engine, "0001")
+    assert current_revision(migration_engine) == "0001"
+    with pytest.raises(RuntimeError):
+        check_revision(migration_engine)
+
+    upgrade(migration_engine)
+    assert current_revision(migration_engine) == head_revision()
+    check_revision(migration_engine)
+
+
+def test_upgrade_from_baseline_keeps_data(migration_engine):
+    """Testa um banco com o schema anterior às migrações (stamp 0001) até head"""
+    upgrade(migration_engine, "0001")
+    with migration_engine.begin() as connection:
+        connection.execute(text("INSERT INTO owners (id, name, email, phone) VALUES ('o1', 'Um', 'um@empresa.com', '1')"))
+        connection.execute(text("INSERT INTO assets (id, name, category, owner) VALUES ('a1', 'Ativo', 'Notebook', 'o1')"))
+
+    upgrade(migration_engine)
+
+    with migration_engine.connect() as connection:
+        assets = connection.execute(text("SELECT id, owner, source, external_id, version FROM assets")).all()
+        rows = connection.execute(text("SELECT seq, entity, entity_id, operation FROM change_log ORDER BY seq")).all()
+        counter = connection.execute(text("SELECT version FROM table_versions WHERE name = 'change_log'")).scalar()
+    assert [tuple(row) for row in assets] == [("a1", "o1", None, None, 1)]
+    # As linhas existentes entram no change_log como criações
+    assert [tuple(row) for row in rows] == [(1, "owner", "o1", "create"), (2, "asset", "a1", "create")]
+    assert counter == 2
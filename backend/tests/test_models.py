@@ -226,3 +226,16 @@ class TestAssetModel:
         assert "Asset" in repr_str
         assert asset.id in repr_str
         assert "Aeronave Boeing 737" in repr_str
+    
+    def test_asset_filter_indexes(self, db_session):
+        """Testa que os filtros de listagem têm índices no banco"""
+        from sqlalchemy import inspect
+        
+        indexes = {
+            index["name"]: index["column_names"]
+            for index in inspect(db_session.bind).get_indexes("assets")
+        }
+        
+        assert indexes["ix_assets_owner_id"] == ["owner", "id"]
+        assert indexes["ix_assets_category_id"] == ["category", "id"]
+        assert indexes["ix_assets_name"] == ["name"]
@@ -0,0 +1,169 @@
+"""
+Testes do orçamento de queries por endpoint e detecção de N+1.
+
+Os limites abaixo são o número atual de queries de cada rota: uma regressão
+(query extra, consulta dentro de um loop) falha aqui como um bug funcional.
+"""
+import logging
+
+import pytest
+
+from app.core.config import settings
+from app.core.request_context import RequestContext, check_query_budget
+
+
+def _create_owners(client, auth_headers, count):
+    items = [
+        {"name": f"Owner {i}", "email": f"owner{i}@empresa.com", "phone": str(i)}
+        for i in range(count)
+    ]
+    response = client.post("/integrations/owners/bulk", json={"items": items}, headers=auth_headers)
+    assert response.status_code == 200
+    return [row["id"] for row in response.json()["results"]]
+
+
+def _asset_items(owner_ids, count):
+    return [
+        {"name": f"Asset {i}", "category": "Equipamento", "owner": owner_ids[i % len(owner_ids)]}
+        for i in range(count)
+    ]
+
+
+class TestEndpointBudgets:
+    """Número máximo de queries de cada rota"""
+
+    @pytest.mark.parametrize("method,path,limit", [
+        ("GET", "/integrations/asset/{asset_id}", 1),
+        ("GET", "/integrations/assets", 2),
+        ("GET", "/integrations/owner/{owner_id}", 1),
+        ("GET", "/integrations/owners", 2),
+        ("GET", "/integrations/owner/{owner_id}/assets", 2),
+        ("GET", "/integrations/owner/{owner_id}/assets?include_count=true", 3),
+        ("DELETE", "/integrations/asset/{asset_id}", 4),
+        ("DELETE", "/integrations/owner/{owner_id}", 5),
+    ])
+    def test_read_and_delete_budgets(
+        self, client, auth_headers, created_asset, assert_max_queries, method, path, limit
+    ):
+        """Testa leituras e remoções"""
+        url = path.format(asset_id=created_asset["id"], owner_id=created_asset["owner"])
+
+        with assert_max_queries(limit):
+            response = client.request(method, url, headers=auth_headers)
+
+        assert response.status_code < 300
+
+    def test_create_asset_budget(
+        self, client, auth_headers, created_owner, sample_asset_data, assert_max_queries
+    ):
+        """Testa que a criação não relê o registro após o commit"""
+        with assert_max_queries(4):
+            response = client.post(
+                "/integrations/asset",
+                json={**sample_asset_data, "owner": created_owner["id"]},
+                headers=auth_headers,
+            )
+
+        assert response.status_code == 201
+        assert response.json()["owner"] == created_owner["id"]
+
+    def test_update_asset_budget(self, client, auth_headers, created_asset, assert_max_queries):
+        """Testa atualização: busca + UPDATE + contadores + change_log, sem refresh"""
+        with assert_max_queries(4):
+            response = client.put(
+                f"/integrations/asset/{created_asset['id']}",
+                json={"name": "Novo nome"},
+                headers=auth_headers,
+            )
+
+        assert response.status_code == 200
+        assert response.json()["name"] == "Novo nome"
+
+    def test_create_owner_budget(self, client, auth_headers, sample_owner_data, assert_max_queries):
+        """Testa criação de responsável: INSERT + contadores + change_log"""
+        with assert_max_queries(3):
+            response = client.post("/integrations/owner", json=sample_owner_data, headers=auth_headers)
+
+        assert response.status_code == 201
+
+    def test_budget_failure_lists_queries(self, client, auth_headers, assert_max_queries):
+        """Testa que o estouro falha o teste com as queries executadas"""
+        with pytest.raises(pytest.fail.Exception, match="2 queries executadas"):
+            with assert_max_queries(1):
+                client.get("/integrations/owners", headers=auth_headers)
+
+
+class TestNPlusOne:
+    """O número de queries não pode crescer com o número de linhas"""
+
+    @pytest.mark.parametrize("path", [
+        "/integrations/assets",
+        "/integrations/assets/export",
+    ])
+    def test_asset_listing_is_constant(self, client, auth_headers, assert_max_queries, path):
+        """Testa listagem e exportação com 5 e com 50 ativos"""
+        owner_ids = _create_owners(client, auth_headers, 5)
+        counts = []
+        for added in (5, 45):
+            items = _asset_items(owner_ids, added)
+            client.post("/integrations/assets/bulk", json={"items": items}, headers=auth_headers)
+            with assert_max_queries(2) as queries:
+                response = client.get(path, headers=auth_headers)
+            assert response.status_code == 200
+            counts.append(queries.count)
+
+        assert counts[0] == counts[1]
+
+    def test_bulk_create_is_constant(self, client, auth_headers, assert_max_queries):
+        """Testa que a criação em lote não consulta o banco por item"""
+        owner_ids = _create_owners(client, auth_headers, 5)
+        counts = []
+        for total in (5, 100):
+            with assert_max_queries(4) as queries:
+                response = client.post(
+                    "/integrations/assets/bulk",
+                    json={"items": _asset_items(owner_ids, total)},
+                    headers=auth_headers,
+                )
+            assert response.json()["created"] == total
+            counts.append(queries.count)
+
+        assert counts[0] == counts[1]
+        assert not queries.repeated()
+
+    def test_batch_get_is_constant(self, client, auth_headers, assert_max_queries):
+        """Testa busca em lote com 1 e com 50 IDs"""
+        owner_ids = _create_owners(client, auth_headers, 50)
+        for ids in (owner_ids[:1], owner_ids):
+            with assert_max_queries(1):
+                response = client.post(
+                    "/integrations/owners/batch-get", json={"ids": ids}, headers=auth_headers
+                )
+            assert response.json()["found"] == ids
+
+
+class TestRuntimeBudget:
+    """Aviso em produção para rotas acima de QUERY_BUDGET"""
+
+    def test_request_over_budget_logs_warning(
+        self, client, auth_headers, created_asset, monkeypatch, caplog
+    ):
+        """Testa o aviso com a rota (template) e o número de queries"""
+        monkeypatch.setattr(settings, "QUERY_BUDGET", 1)
+
+        with caplog.at_level(logging.WARNING, logger="app.core.request_context"):
+            client.get(f"/integrations/asset/{created_asset['id']}", headers=auth_headers)
+            client.get(f"/integrations/owner/{created_asset['owner']}/assets", headers=auth_headers)
+
+        messages = [record.getMessage() for record in caplog.records]
+        assert messages == [
+            "Orçamento de queries excedido: GET /integrations/owner/{owner_id}/assets "
+            "executou 2 queries (limite 1)"
+        ]
+
+    def test_zero_budget_disables_check(self):
+        """Testa que QUERY_BUDGET=0 desliga o aviso"""
+        request = RequestContext(method="GET", path="/", scope={}, db_queries=500)
+
+        assert check_query_budget(request, budget=0) is False
+        assert check_query_budget(request, budget=499) is True
@@ -1,10 +1,13 @@
 """
 Testes unitários para os serviços (camada de negócio)
 """
+import uuid
+
 import pytest
 
 from app.services.owner_service import OwnerService
 from app.services.asset_service import AssetService
+from app.services.batching import new_ids
 from app.schemas.owner import OwnerCreate, OwnerUpdate
 from app.schemas.asset import AssetCreate, AssetUpdate
 
@@ -147,6 +150,27 @@ class TestOwnerService:
         
         assert result is False
 
+    
+    def test_create_owners_bulk(self, db_session):
+        """Testa criação em lote com conflitos de email no banco e no próprio lote"""
+        OwnerService.create_owner(
+            db_session, OwnerCreate(name="Existente", email="existe@empresa.com", phone="1")
+        )
+        items = [
+            OwnerCreate(name="Novo 1", email="novo1@empresa.com", phone="1"),
+            OwnerCreate(name="Existente", email="existe@empresa.com", phone="1"),
+            OwnerCreate(name="Novo 2", email="novo2@empresa.com", phone="1"),
+            OwnerCreate(name="Novo 1 de novo", email="novo1@empresa.com", phone="1"),
+        ]
+        
+        result = OwnerService.create_owners_bulk(db_session, items)
+        
+        assert result.created == 2
+        assert result.failed == 2
+        assert result.results[1].error == "Email já cadastrado"
+        assert result.results[3].error == "Email duplicado no lote"
+        assert OwnerService.get_owner(db_session, result.results[0].id).name == "Novo 1"
+        assert len(OwnerService.get_owners(db_session)) == 3
 
 class TestAssetService:
     """Testes para o AssetService"""
@@ -255,6 +279,58 @@ class TestAssetService:
         assert len(page2) == 5
         assert page1[0].id != page2[0].id
     
+    def test_get_assets_keyset_pagination(self, db_session):
+        """Testa paginação por keyset (after) de assets"""
+        owner = OwnerService.create_owner(
+            db_session,
+            OwnerCreate(name="João da Silva", email="joao@empresa.com", phone="+55 11 98765-4321")
+        )
+        for i in range(10):
+            AssetService.create_asset(
+                db_session, AssetCreate(name=f"Asset {i}", category="Categoria", owner=owner.id)
+            )
+        
+        page1 = AssetService.get_assets(db_session, limit=5)
+        page2 = AssetService.get_assets(db_session, limit=5, after=page1[-1].id)
+        page3 = AssetService.get_assets(db_session, limit=5, after=page2[-1].id)
+        
+        ids = [asset.id for asset in page1 + page2]
+        assert len(set(ids)) == 10
+        assert ids == sorted(ids)
+        assert page3 == []
+    
+    def test_get_assets_filters(self, db_session):
+        """Testa filtros por owner, categoria e prefixo do nome"""
+        owner1 = OwnerCreate(name="Owner 1", email="owner1@empresa.com", phone="1")
+        owner2 = OwnerCreate(name="Owner 2", email="owner2@empresa.com", phone="2")
+        owner1 = OwnerService.create_owner(db_session, owner1)
+        owner2 = OwnerService.create_owner(db_session, owner2)
+        for name, category, owner in [
+            ("Boeing 737", "Aeronave", owner1),
+            ("Boeing 777", "Aeronave", owner2),
+            ("Airbus A320", "Aeronave", owner1),
+            ("Bobcat S70", "Trator", owner1),
+            ("Boeing_test", "Trator", owner2),
+        ]:
+            AssetService.create_asset(
+                db_session, AssetCreate(name=name, category=category, owner=owner.id)
+            )
+        
+        by_owner = AssetService.get_assets(db_session, owner=owner1.id)
+        by_category = AssetService.get_assets(db_session, category="Trator")
+        by_name = AssetService.get_assets(db_session, name="Boeing")
+        combined = AssetService.get_assets(
+            db_session, owner=owner1.id, category="Aeronave", name="Bo"
+        )
+        # "_" e "%" são literais no prefixo, não curingas do LIKE
+        literal = AssetService.get_assets(db_session, name="Boeing_")
+        
+        assert len(by_owner) == 3
+        assert {a.name for a in by_category} == {"Bobcat S70", "Boeing_test"}
+        assert {a.name for a in by_name} == {"Boeing 737", "Boeing 777", "Boeing_test"}
+        assert [a.name for a in combined] == ["Boeing 737"]
+        assert [a.name for a in literal] == ["Boeing_test"]
+    
     def test_update_asset(self, db_session):
         """Testa atualização de asset"""
         # Criar owner
@@ -321,3 +397,58 @@ class TestAssetService:
         result = AssetService.delete_asset(db_session, "00000000-0000-0000-0000-000000000000")
         
         assert result is False
+    
+    def test_create_assets_bulk(self, db_session):
+        """Testa criação em lote com owner inexistente rejeitado por linha"""
+        owner = OwnerService.create_owner(
+            db_session,
+            OwnerCreate(name="João da Silva", email="joao@empresa.com", phone="+55 11 98765-4321")
+        )
+        missing_owner = "00000000-0000-0000-0000-000000000000"
+        items = [
+            AssetCreate(name="Asset 0", category="Categoria", owner=owner.id),
+            AssetCreate(name="Asset 1", category="Categoria", owner=missing_owner),
+            AssetCreate(name="Asset 2", category="Categoria", owner=owner.id),
+        ]
+        
+        result = AssetService.create_assets_bulk(db_session, items)
+        
+        assert result.created == 2
+        assert result.failed == 1
+        assert [r.index for r in result.results] == [0, 1, 2]
+        assert result.results[1].id is None
+        assert missing_owner in result.results[1].error
+        created = AssetService.get_asset(db_session, result.results[2].id)
+        assert created.name == "Asset 2"
+        assert created.owner == owner.id
+    
+    def test_bulk_ids_are_uuid4(self):
+        """Testa que os IDs gerados em lote são UUIDs v4 canônicos e distintos"""
+        ids = new_ids(1000)
+        
+        assert len(set(ids)) == 1000
+        for value in ids:
+            parsed = uuid.UUID(value)
+            assert str(parsed) == value
+            assert parsed.version == 4
+            assert parsed.variant == uuid.RFC_4122
+    
+    def test_get_assets_by_ids_chunked(self, db_session, monkeypatch):
+        """Testa busca por IDs quebrada em várias queries IN (...)"""
+        monkeypatch.setattr("app.services.asset_service.IN_CLAUSE_CHUNK_SIZE", 2)
+        owner = OwnerService.create_owner(
+            db_session,
+            OwnerCreate(name="João da Silva", email="joao@empresa.com", phone="+55 11 98765-4321")
+        )
+        items = [
+            AssetCreate(name=f"Asset {i}", category="Categoria", owner=owner.id)
+            for i in range(5)
+        ]
+        ids = [r.id for r in AssetService.create_assets_bulk(db_session, items).results]
+        missing_id = "00000000-0000-0000-0000-000000000000"
+        
+        assets = AssetService.get_assets_by_ids(db_session, ids + [missing_id])
+        existing = AssetService.get_existing_ids(db_session, ids + [missing_id])
+        
+        assert sorted(a.id for a in assets) == sorted(ids)
+        assert existing == set(ids)
@@ -0,0 +1,77 @@
+"""
+Testes do log de queries lentas
+"""
+import pytest
+
+from app.db.slow_queries import SlowQueryLog, normalize_statement, params_shape, slow_query_log
+
+
+@pytest.fixture
+def record_all_queries(monkeypatch):
+    """Registra toda query como lenta durante o teste"""
+    monkeypatch.setattr(slow_query_log, "threshold_ms", 0)
+    slow_query_log.clear()
+    yield slow_query_log
+    slow_query_log.clear()
+
+
+def test_normalize_statement():
+    """Testa que listas de placeholders de tamanhos diferentes viram a mesma consulta"""
+    two = normalize_statement("SELECT id FROM assets\n WHERE id IN (?, ?)")
+    three = normalize_statement("SELECT id FROM assets WHERE id IN (?, ?, ?)")
+
+    assert two == three == "SELECT id FROM assets WHERE id IN (?...)"
+    assert normalize_statement("INSERT INTO t (a, b) VALUES (?, ?), (?, ?)") == (
+        "INSERT INTO t (a, b) VALUES (?...), ..."
+    )
+
+
+def test_params_shape_hides_values():
+    """Testa que apenas nomes e tipos dos parâmetros são registrados"""
+    assert params_shape({"email": "joao@empresa.com", "limit": 10}) == "{email: str, limit: int}"
+    assert params_shape(("joao@empresa.com", 10)) == "(str, int)"
+    assert params_shape([("a",), ("b",)], executemany=True) == "2 x (str)"
+
+
+def test_slow_query_log_keeps_slowest():
+    """Testa agregação por consulta e descarte da menos lenta acima da capacidade"""
+    log = SlowQueryLog(threshold_ms=0, capacity=2)
+    log.record("SELECT 1", 5.0, "()")
+    log.record("SELECT 1", 15.0, "()", route="GET /x")
+    log.record("SELECT 2", 50.0, "()")
+    log.record("SELECT 3", 1.0, "()")
+
+    top = log.top()
+    assert [q.statement for q in top] == ["SELECT 2", "SELECT 1"]
+    assert top[1].count == 2
+    assert top[1].avg_ms == 10.0
+    assert top[1].route == "GET /x"
+
+
+def test_slow_queries_endpoint(client, auth_headers, created_asset, record_all_queries):
+    """Testa que a rota de origem e o plano da query aparecem no endpoint admin"""
+    client.get(
+        f"/integrations/assets?owner={created_asset['owner']}", headers=auth_headers
+    )
+
+    response = client.get("/integrations/admin/slow-queries?limit=200", headers=auth_headers)
+
+    assert response.status_code == 200
+    listing = [
+        q for q in response.json()
+        if q["route"] == "GET /integrations/assets" and "FROM assets" in q["statement"]
+    ]
+    assert len(listing) == 1
+    assert any("ix_assets_owner" in step for step in listing[0]["plan"])
+    assert created_asset["owner"] not in listing[0]["params_shape"]
+
+    response = client.delete("/integrations/admin/slow-queries", headers=auth_headers)
+    assert response.status_code == 204
+    assert record_all_queries.top() == []
+
+
+def test_slow_queries_requires_auth(client):
+    """Testa que o endpoint admin exige autenticação"""
+    response = client.get("/integrations/admin/slow-queries")
+
+    assert response.status_code == 403
@@ -0,0 +1,79 @@
+"""
+Testes do perfil SQLite e da política de retry de escritas
+"""
+import os
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from app.core.config import settings
+from app.db.sqlite import configure_sqlite, retry_on_locked
+
+
+def locked_error() -> OperationalError:
+    return OperationalError("INSERT ...", {}, Exception("database is locked"))
+
+
+def test_configure_sqlite_applies_profile(tmp_path):
+    """Testa que cada conexão recebe foreign keys, WAL e o restante do perfil"""
+    engine = create_engine(f"sqlite:///{os.path.join(tmp_path, 'perfil.db')}")
+    configure_sqlite(engine)
+
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA foreign_keys")).scalar() == 1
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+        assert conn.execute(text("PRAGMA busy_timeout")).scalar() == settings.SQLITE_BUSY_TIMEOUT_MS
+        assert conn.execute(text("PRAGMA cache_size")).scalar() == -settings.SQLITE_CACHE_SIZE_KB
+        assert conn.execute(text("PRAGMA temp_store")).scalar() == 2  # MEMORY
+    engine.dispose()
+
+
+def test_retry_on_locked_retries_and_rolls_back(db_session, monkeypatch):
+    """Testa que `database is locked` desfaz a transação e repete a operação"""
+    monkeypatch.setattr(settings, "DB_WRITE_RETRY_DELAY", 0)
+    rollbacks = []
+    monkeypatch.setattr(db_session, "rollback", lambda: rollbacks.append(True))
+    calls = []
+
+    @retry_on_locked
+    def write(db):
+        calls.append(db)
+        if len(calls) < 3:
+            raise locked_error()
+        return "ok"
+
+    assert write(db_session) == "ok"
+    assert len(calls) == 3
+    assert len(rollbacks) == 2
+
+
+def test_retry_on_locked_gives_up(db_session, monkeypatch):
+    """Testa que o erro é propagado após DB_WRITE_RETRIES tentativas"""
+    monkeypatch.setattr(settings, "DB_WRITE_RETRY_DELAY", 0)
+    monkeypatch.setattr(settings, "DB_WRITE_RETRIES", 2)
+    calls = []
+
+    @retry_on_locked
+    def write(db):
+        calls.append(db)
+        raise locked_error()
+
+    with pytest.raises(OperationalError):
+        write(db_session)
+    assert len(calls) == 3
+
+
+def test_retry_on_locked_ignores_other_errors(db_session):
+    """Testa que outros OperationalError não são repetidos"""
+    calls = []
+
+    @retry_on_locked
+    def write(db):
+        calls.append(db)
+        raise OperationalError("SELECT ...", {}, Exception("no such table: x"))
+
+    with pytest.raises(OperationalError):
+        write(db_session)
+    assert len(calls) == 1
@@ -0,0 +1,64 @@
+"""
+Testes do header Server-Timing
+"""
+import re
+
+import pytest
+
+from app.core.config import settings
+from app.core import request_context
+from app.core.request_context import RequestContext
+from app.core.timing import span, timed
+
+
+@pytest.fixture
+def server_timing(monkeypatch):
+    monkeypatch.setattr(settings, "SERVER_TIMING_ENABLED", True)
+
+
+def phases(header: str) -> dict:
+    return {
+        name: float(duration)
+        for name, duration in re.findall(r"(\w+);dur=([\d.]+)", header)
+    }
+
+
+def test_server_timing_header(client, auth_headers, created_asset, server_timing):
+    """Testa as fases de uma listagem: auth, db, serviços e serialização"""
+    response = client.get("/integrations/assets", headers=auth_headers)
+
+    assert response.status_code == 200
+    timings = phases(response.headers["Server-Timing"])
+    assert {"auth", "db", "svc", "serialize", "total"} <= set(timings)
+    assert timings["db"] <= timings["svc"] <= timings["total"]
+
+
+def test_server_timing_disabled_by_default(client, auth_headers):
+    """Testa que o header só é enviado quando habilitado"""
+    response = client.get("/integrations/assets", headers=auth_headers)
+
+    assert "Server-Timing" not in response.headers
+
+
+def test_nested_spans_count_once():
+    """Testa que um serviço chamando outro não soma o mesmo tempo duas vezes"""
+    context = RequestContext(method="GET", path="/", scope={})
+    token = request_context._current_request.set(context)
+
+    @timed("svc")
+    def inner():
+        pass
+
+    @timed("svc")
+    def outer():
+        inner()
+
+    try:
+        outer()
+        with span("auth"):
+            pass
+    finally:
+        request_context._current_request.reset(token)
+
+    assert set(context.timings) == {"svc", "auth"}
+    assert context.active_spans == set()
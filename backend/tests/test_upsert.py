@@ -0,0 +1,147 @@
+"""
+Testes da sincronização idempotente por external_id (upsert)
+"""
+import json
+
+from app.schemas.asset import AssetUpsert
+from app.schemas.owner import OwnerUpsert
+from app.services.asset_service import AssetService
+from app.services.owner_service import OwnerService
+
+
+def _ndjson(rows):
+    return "\n".join(json.dumps(row) for row in rows) + "\n"
+
+
+class TestUpsertService:
+    """Testes para os métodos de upsert dos serviços"""
+    
+    def test_upsert_owners_insert_update_unchanged(self, db_session):
+        """Testa contagem de inseridos, alterados e inalterados"""
+        rows = [
+            (1, OwnerUpsert(external_id="o-1", name="Ana", email="ana@empresa.com", phone="1")),
+            (2, OwnerUpsert(external_id="o-2", name="Bia", email="bia@empresa.com", phone="2")),
+        ]
+        first = OwnerService.upsert_owners(db_session, "erp", rows)
+        
+        rows[1] = (2, OwnerUpsert(external_id="o-2", name="Beatriz", email="bia@empresa.com", phone="2"))
+        second = OwnerService.upsert_owners(db_session, "erp", rows)
+        
+        assert (first.inserted, first.updated, first.unchanged) == (2, 0, 0)
+        assert (second.inserted, second.updated, second.unchanged) == (0, 1, 1)
+        assert len(OwnerService.get_owners(db_session)) == 2
+        ids = OwnerService.get_ids_by_external_id(db_session, "erp", ["o-2"])
+        assert OwnerService.get_owner(db_session, ids["o-2"]).name == "Beatriz"
+    
+    def test_upsert_owners_email_conflict(self, db_session):
+        """Testa que email de outro responsável é rejeitado por linha"""
+        OwnerService.upsert_owners(db_session, "erp", [
+            (1, OwnerUpsert(external_id="o-1", name="Ana", email="ana@empresa.com", phone="1")),
+        ])
+        
+        result = OwnerService.upsert_owners(db_session, "erp", [
+            (1, OwnerUpsert(external_id="o-2", name="Outra", email="ana@empresa.com", phone="1")),
+        ])
+        
+        assert result.failed == 1
+        assert result.errors[0].error == "Email já cadastrado"
+    
+    def test_upsert_same_external_id_in_other_source(self, db_session):
+        """Testa que external_id é único por origem, não globalmente"""
+        row = OwnerUpsert(external_id="1", name="Ana", email="ana@empresa.com", phone="1")
+        other = OwnerUpsert(external_id="1", name="Ana", email="ana@crm.com", phone="1")
+        
+        OwnerService.upsert_owners(db_session, "erp", [(1, row)])
+        result = OwnerService.upsert_owners(db_session, "crm", [(1, other)])
+        
+        assert result.inserted == 1
+        assert len(OwnerService.get_owners(db_session)) == 2
+    
+    def test_upsert_assets_resolves_owner_external_id(self, db_session):
+        """Testa upsert de ativos referenciando o responsável pelo external_id"""
+        OwnerService.upsert_owners(db_session, "erp", [
+            (1, OwnerUpsert(external_id="o-1", name="Ana", email="ana@empresa.com", phone="1")),
+        ])
+        owner_id = OwnerService.get_ids_by_external_id(db_session, "erp", ["o-1"])["o-1"]
+        rows = [
+            (1, AssetUpsert(external_id="a-1", name="Trator", category="Agro", owner_external_id="o-1")),
+            (2, AssetUpsert(external_id="a-2", name="Jato", category="Aero", owner=owner_id)),
+            (3, AssetUpsert(external_id="a-3", name="Órfão", category="Aero", owner_external_id="o-9")),
+            (4, AssetUpsert(external_id="a-1", name="Trator 2", category="Agro", owner_external_id="o-1")),
+        ]
+        
+        result = AssetService.upsert_assets(db_session, "erp", rows)
+        repeat = AssetService.upsert_assets(db_session, "erp", rows)
+        
+        assert (result.inserted, result.failed) == (2, 2)
+        assert {e.line for e in result.errors} == {1, 3}
+        assert (repeat.inserted, repeat.updated, repeat.unchanged) == (0, 0, 2)
+        names = {a.name for a in AssetService.get_assets(db_session, owner=owner_id)}
+        assert names == {"Trator 2", "Jato"}
+
+
+class TestUpsertRoutes:
+    """Testes para as rotas de upsert em streaming (NDJSON)"""
+    
+    def test_upsert_owners_and_assets(self, client, auth_headers):
+        """Testa sincronização completa e reenvio idempotente"""
+        owners = [
+            {"external_id": f"o-{i}", "name": f"Owner {i}", "email": f"o{i}@empresa.com", "phone": "1"}
+            for i in range(3)
+        ]
+        assets = [
+            {"external_id": f"a-{i}", "name": f"Asset {i}", "category": "Sync", "owner_external_id": f"o-{i % 3}"}
+            for i in range(10)
+        ]
+        headers = {**auth_headers, "Content-Type": "application/x-ndjson"}
+        
+        response = client.post(
+            "/integrations/owners/upsert?source=erp", content=_ndjson(owners), headers=headers
+        )
+        assert response.status_code == 200
+        assert response.json()["inserted"] == 3
+        
+        response = client.post(
+            "/integrations/assets/upsert?source=erp", content=_ndjson(assets), headers=headers
+        )
+        assert response.status_code == 200
+        assert response.json()["inserted"] == 10
+        
+        assets[0]["name"] = "Renomeado"
+        response = client.post(
+            "/integrations/assets/upsert?source=erp", content=_ndjson(assets), headers=headers
+        )
+        data = response.json()
+        assert (data["received"], data["inserted"], data["updated"], data["unchanged"]) == (10, 0, 1, 9)
+        
+        response = client.get("/integrations/assets?name=Renomeado", headers=auth_headers)
+        assert response.json()[0]["external_id"] == "a-0"
+        assert response.json()[0]["source"] == "erp"
+    
+    def test_upsert_rejects_invalid_lines(self, client, auth_headers):
+        """Testa que JSON inválido e erros de schema são reportados por linha"""
+        body = "\n".join([
+            json.dumps({"external_id": "o-1", "name": "Ana", "email": "ana@empresa.com", "phone": "1"}),
+            "{nao e json",
+            "",
+            json.dumps({"external_id": "o-2", "name": "Bia", "email": "email-invalido", "phone": "1"}),
+        ])
+        
+        response = client.post(
+            "/integrations/owners/upsert?source=erp",
+            content=body,
+            headers={**auth_headers, "Content-Type": "application/x-ndjson"}
+        )
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert (data["received"], data["inserted"], data["failed"]) == (3, 1, 2)
+        assert [e["line"] for e in data["errors"]] == [2, 4]
+        assert data["errors"][0]["error"] == "JSON inválido"
+        assert "email" in data["errors"][1]["error"]
+    
+    def test_upsert_requires_source(self, client, auth_headers):
+        """Testa que a origem é obrigatória"""
+        response = client.post("/integrations/owners/upsert", content="", headers=auth_headers)
+        
+        assert response.status_code == 422
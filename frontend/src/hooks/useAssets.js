@@ -1,7 +1,18 @@
 import { useState, useEffect } from 'react';
 import api from '../services/api';
+import { applyChange, subscribeChanges } from '../services/changeFeed';
 
-export function useAssets() {
+// Mesmo critério dos filtros do servidor (owner e category exatos, prefixo do nome)
+function matchesFilters(asset, filters) {
+  return (
+    (!filters.owner || asset.owner === filters.owner) &&
+    (!filters.category || asset.category === filters.category) &&
+    (!filters.name || asset.name.startsWith(filters.name))
+  );
+}
+
+// filters: filtros aplicados no servidor ({ owner, category, name })
+export function useAssets(filters = {}) {
   const [assets, setAssets] = useState([]);
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState(null);
@@ -11,7 +22,7 @@ export function useAssets() {
     setLoading(true);
     setError(null);
     try {
-      const response = await api.get('/integrations/assets');
+      const response = await api.get('/integrations/assets', { params: filters });
       setAssets(response.data);
     } catch (err) {
       setError(err.response?.data?.detail || 'Erro ao carregar ativos');
@@ -21,9 +32,20 @@ export function useAssets() {
     }
   };
 
+  const filtersKey = JSON.stringify(filters);
+
   useEffect(() => {
     fetchAssets();
-  }, []);
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [filtersKey]);
+
+  // Alterações feitas por outros usuários e integrações, sem refazer a busca
+  useEffect(() => {
+    return subscribeChanges('asset', (change) => {
+      setAssets(prev => applyChange(prev, change, (asset) => matchesFilters(asset, filters)));
+    });
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [filtersKey]);
 
   const addAsset = async (assetData) => {
     try {
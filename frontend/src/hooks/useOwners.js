@@ -1,5 +1,6 @@
 import { useState, useEffect } from 'react';
 import api from '../services/api';
+import { applyChange, subscribeChanges } from '../services/changeFeed';
 
 export function useOwners() {
   const [owners, setOwners] = useState([]);
@@ -25,6 +26,13 @@ export function useOwners() {
     fetchOwners();
   }, []);
 
+  // Alterações feitas por outros usuários e integrações, sem refazer a busca
+  useEffect(() => {
+    return subscribeChanges('owner', (change) => {
+      setOwners(prev => applyChange(prev, change));
+    });
+  }, []);
+
   const addOwner = async (ownerData) => {
     try {
       const response = await api.post('/integrations/owner', ownerData);
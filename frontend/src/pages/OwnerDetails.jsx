@@ -1,7 +1,6 @@
 import { useState, useEffect } from 'react';
 import { useParams, Link, useNavigate } from 'react-router-dom';
 import { useOwners } from '../hooks/useOwners';
-import { useAssets } from '../hooks/useAssets';
 import { useToast } from '../hooks/useToast';
 import Loading from '../components/Loading';
 import ConfirmDialog from '../components/ConfirmDialog';
@@ -12,11 +11,11 @@ const OwnerDetails = () => {
   const { id } = useParams();
   const navigate = useNavigate();
   const { deleteOwner } = useOwners();
-  const { assets } = useAssets();
   const toast = useToast();
 
   const [owner, setOwner] = useState(null);
   const [ownerAssets, setOwnerAssets] = useState([]);
+  const [assetCount, setAssetCount] = useState(0);
   const [confirmDelete, setConfirmDelete] = useState(false);
   const [deleting, setDeleting] = useState(false);
   const [loading, setLoading] = useState(true);
@@ -27,15 +26,16 @@ const OwnerDetails = () => {
       
       setLoading(true);
       try {
-        const response = await api.get(`/integrations/owner/${id}`);
-        const ownerData = response.data;
-        console.log('OwnerDetails - Loaded owner:', ownerData);
-        setOwner(ownerData);
-
-        // Filtrar ativos deste responsável
-        const filtered = assets.filter(asset => asset.owner === id);
-        console.log('Filtered assets:', filtered);
-        setOwnerAssets(filtered);
+        // Owner e seus ativos (apenas os deste responsável, com o total no header)
+        const [response, assetsResponse] = await Promise.all([
+          api.get(`/integrations/owner/${id}`),
+          api.get(`/integrations/owner/${id}/assets`, {
+            params: { limit: 500, include_count: true },
+          }),
+        ]);
+        setOwner(response.data);
+        setOwnerAssets(assetsResponse.data);
+        setAssetCount(Number(assetsResponse.headers['x-total-count'] ?? assetsResponse.data.length));
       } catch (error) {
         console.error('Erro ao carregar owner:', error);
         toast.error('Responsável não encontrado');
@@ -47,7 +47,7 @@ const OwnerDetails = () => {
 
     loadOwnerDetails();
     // eslint-disable-next-line react-hooks/exhaustive-deps
-  }, [id, assets]); // Executar quando ID ou assets mudarem
+  }, [id]); // Executar quando o ID mudar
 
   const handleDelete = async () => {
     setDeleting(true);
@@ -145,7 +145,7 @@ const OwnerDetails = () => {
 
       <div className="card" style={{ marginTop: '2rem' }}>
         <h2 style={{ marginBottom: '1.5rem', fontSize: '1.5rem' }}>
-          Ativos Vinculados ({ownerAssets.length})
+          Ativos Vinculados ({assetCount})
         </h2>
         {ownerAssets.length === 0 ? (
           <div className="empty-state">
@@ -191,8 +191,8 @@ const OwnerDetails = () => {
         isOpen={confirmDelete}
         title="Confirmar Exclusão"
         message={`Tem certeza que deseja excluir "${owner.name}"? ${
-          ownerAssets.length > 0 
-            ? `Este responsável possui ${ownerAssets.length} ativo(s) vinculado(s). ` 
+          assetCount > 0 
+            ? `Este responsável possui ${assetCount} ativo(s) vinculado(s). ` 
             : ''
         }Esta ação não pode ser desfeita.`}
         onConfirm={handleDelete}
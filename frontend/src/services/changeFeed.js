@@ -0,0 +1,84 @@
+// Alterações de ativos e responsáveis em tempo real (Server-Sent Events).
+// Uma única conexão por aba, aberta enquanto houver algum hook inscrito.
+// Ao cair, a conexão é refeita com o token atual (o da URL pode ter vencido),
+// retomando do último evento recebido (since), sem perder eventos.
+const baseURL = import.meta.env.VITE_API_URL || 'http://localhost:8000';
+const RECONNECT_DELAY_MS = 3000;
+
+const listeners = new Set();
+let source = null;
+let reconnectTimer = null;
+let lastSeq = null;
+
+function open() {
+  const token = localStorage.getItem('eyesonasset_token');
+  if (!token || typeof EventSource === 'undefined') {
+    return;
+  }
+  // O EventSource não envia headers: o token vai na query string
+  const params = new URLSearchParams({ access_token: token });
+  if (lastSeq !== null) {
+    params.set('since', lastSeq);
+  }
+  source = new EventSource(`${baseURL}/integrations/changes/stream?${params}`);
+  for (const entity of ['asset', 'owner']) {
+    source.addEventListener(entity, (event) => {
+      lastSeq = event.lastEventId;
+      const change = JSON.parse(event.data);
+      listeners.forEach((listener) => listener(change));
+    });
+  }
+  // A reconexão automática repetiria a URL com o token antigo
+  source.onerror = () => {
+    close();
+    reconnectTimer = setTimeout(() => {
+      reconnectTimer = null;
+      if (listeners.size > 0) {
+        open();
+      }
+    }, RECONNECT_DELAY_MS);
+  };
+}
+
+function close() {
+  if (source) {
+    source.close();
+    source = null;
+  }
+}
+
+// onChange recebe { seq, entity, id, operation, data } de cada alteração da
+// entidade ('asset' ou 'owner'); retorna a função que cancela a inscrição
+export function subscribeChanges(entity, onChange) {
+  const listener = (change) => {
+    if (change.entity === entity) {
+      onChange(change);
+    }
+  };
+  listeners.add(listener);
+  if (!source && !reconnectTimer) {
+    open();
+  }
+
+  return () => {
+    listeners.delete(listener);
+    if (listeners.size === 0) {
+      close();
+      clearTimeout(reconnectTimer);
+      reconnectTimer = null;
+      lastSeq = null;
+    }
+  };
+}
+
+// Aplica uma alteração à lista: remoções (e registros fora do filtro) saem,
+// criações e alterações substituem o item ou entram no fim
+export function applyChange(items, change, matches = () => true) {
+  if (change.operation === 'delete' || !matches(change.data)) {
+    return items.filter((item) => item.id !== change.id);
+  }
+  if (!items.some((item) => item.id === change.id)) {
+    return [...items, change.data];
+  }
+  return items.map((item) => (item.id === change.id ? change.data : item));
+}